@@ -1,18 +1,283 @@
+import glob
+import os
 
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
 import streamlit as st
 
+from definitions import (
+    AlertEngine,
+    AUCAccumulator,
+    CalibrationAccumulator,
+    apply_preprocessing,
+    compute_psi_matrix,
+    generate_kpi_panel,
+    generate_override_matrix,
+    load_alert_rules,
+    load_data,
+    load_grade_mapper,
+    load_model_cached,
+    perform_hosmer_lemeshow_test,
+    perform_sensitivity_grid,
+)
+
 st.set_page_config(page_title="QuCreate Streamlit Lab", layout="wide")
 st.sidebar.image("assets/images/company_logo.jpg")
 st.sidebar.divider()
 st.title("QuCreate Streamlit Lab")
 st.divider()
 
-# Code goes here
+# Every cached function takes the file's mtime as an argument, so an edited
+# artifact or CSV invalidates its entries while reruns reuse them.
+
+def _mtime(path):
+    return os.path.getmtime(path) if path and os.path.exists(path) else None
+
+
+@st.cache_resource(show_spinner=False)
+def get_model(path, mtime):
+    return load_model_cached(path)
+
+
+@st.cache_data(show_spinner=False)
+def get_data(path, mtime):
+    return load_data(path)
+
+
+@st.cache_data(show_spinner=False)
+def get_numeric_columns(path, mtime, target):
+    """Numeric feature names, cached on their own so reruns do not unpickle the whole frame."""
+    data = get_data(path, mtime)
+    return [c for c in data.select_dtypes("number").columns if c != target]
+
+
+@st.cache_data(show_spinner="Scoring portfolio...")
+def get_scores(model_path, model_mtime, pipeline_path, pipeline_mtime, data_path, data_mtime, target):
+    """Scores one dataset once; every page reuses the cached (scores, labels)."""
+    data = get_data(data_path, data_mtime)
+    X = data.drop(columns=[target])
+    if pipeline_path:
+        X = apply_preprocessing(get_model(pipeline_path, pipeline_mtime), X)
+    scores = get_model(model_path, model_mtime).predict_proba(X)[:, 1]
+    return np.ascontiguousarray(scores, dtype=np.float64), data[target].to_numpy()
+
+
+@st.cache_data(show_spinner=False)
+def get_discrimination(score_args, periods):
+    rows = []
+    for period, args in zip(periods, score_args):
+        scores, y = get_scores(*args)
+        acc = AUCAccumulator(exact=True).update(y, scores)
+        rows.append({"period": period, "auc": acc.auc(), "gini": acc.gini()})
+    return pd.DataFrame(rows)
+
+
+@st.cache_resource(show_spinner=False)
+def get_grade_mapper(path, mtime):
+    return load_grade_mapper(path)
+
+
+@st.cache_data(show_spinner=False)
+def get_calibration(args, n_bins, cutoffs=None):
+    """Calibration by rating grade when a cutoff table is given, else by PD quantile groups."""
+    scores, y = get_scores(*args)
+    if cutoffs is None:
+        # Quantile edges keep every group populated when PDs cluster well below the top of [0, 1].
+        edges = np.unique(np.quantile(scores, np.linspace(0, 1, n_bins + 1)))
+        if len(edges) < 2:
+            edges = np.array([edges[0], edges[0] + 1e-9])
+        frame = CalibrationAccumulator(bin_edges=edges).update(y, scores).to_frame()
+        statistic, p_value = perform_hosmer_lemeshow_test(y, scores, n_bins, grouping="quantile")
+        return frame, statistic, p_value
+    mapper = get_grade_mapper(*cutoffs)
+    codes = mapper.codes(scores)
+    mapped = codes >= 0
+    grades = np.asarray(mapper.grades, dtype=object)[codes[mapped]]
+    frame = CalibrationAccumulator(grades=mapper.grades).update(y[mapped], scores[mapped], grades=grades).to_frame()
+    statistic, p_value = perform_hosmer_lemeshow_test(y[mapped], scores[mapped], n_bins, grouping="grade",
+                                                      grades=codes[mapped])
+    return frame, statistic, p_value
+
+
+def _psi_contributions(expected, observed, labels):
+    total = compute_psi_matrix(expected[None, :], observed[None, :], epsilon=1e-4)[0, 0]
+    e_pct = np.maximum(expected / expected.sum(), 1e-4)
+    a_pct = np.maximum(observed / observed.sum(), 1e-4)
+    return pd.Series((a_pct - e_pct) * np.log(a_pct / e_pct), index=labels), float(total)
+
+
+@st.cache_data(show_spinner=False)
+def get_score_psi(baseline_args, actual_args, n_bins, cutoffs=None):
+    """PSI by rating grade (or by baseline score decile); returns per-bucket contributions and the total."""
+    baseline, _ = get_scores(*baseline_args)
+    actual, _ = get_scores(*actual_args)
+    if cutoffs is not None:
+        mapper = get_grade_mapper(*cutoffs)
+        return _psi_contributions(mapper.counts(baseline).to_numpy(), mapper.counts(actual).to_numpy(),
+                                  mapper.grades)
+    edges = np.unique(np.quantile(baseline, np.linspace(0, 1, n_bins + 1)[1:-1]))
+    n = len(edges) + 1
+    expected = np.bincount(np.searchsorted(edges, baseline, side="right"), minlength=n)
+    observed = np.bincount(np.searchsorted(edges, actual, side="right"), minlength=n)
+    return _psi_contributions(expected, observed, [f"bin {i + 1}" for i in range(n)])
+
+
+@st.cache_data(show_spinner=False)
+def get_override_matrix(path, mtime, rows):
+    overrides = get_data(path, mtime)
+    grade_levels = sorted(pd.unique(overrides[["grade_before", "grade_after"]].to_numpy().ravel()))
+    reason_codes = sorted(overrides["reason_code"].dropna().unique())
+    return generate_override_matrix(overrides, grade_levels, reason_codes, rows=rows)
+
+
+class _PipelineModel:
+    """Scores raw features through the pre-processing pipeline, so shocks hit the raw drivers."""
+
+    def __init__(self, pipeline, model):
+        self.pipeline = pipeline
+        self.model = model
+
+    def predict_proba(self, X):
+        return self.model.predict_proba(apply_preprocessing(self.pipeline, X))
+
+
+@st.cache_data(show_spinner="Running shocks...")
+def get_tornado(args, drivers, shock):
+    model_path, model_mtime, pipeline_path, pipeline_mtime, data_path, data_mtime, target = args
+    X = get_data(data_path, data_mtime).drop(columns=[target])
+    model = get_model(model_path, model_mtime)
+    if pipeline_path:
+        model = _PipelineModel(get_model(pipeline_path, pipeline_mtime), model)
+    return perform_sensitivity_grid(model, X, list(drivers), shocks=(-shock, shock))
+
+
+# ---- Inputs ------------------------------------------------------------------
+st.sidebar.header("Artifacts")
+data_dir = st.sidebar.text_input("Data folder", "data")
+model_path = st.sidebar.text_input("Rating model (.pkl)", os.path.join(data_dir, "rating_logreg_v1.pkl"))
+pipeline_path = st.sidebar.text_input("Pre-processing pipeline (.pkl, optional)", "")
+oot_path = st.sidebar.text_input("OOT sample (.csv)", os.path.join(data_dir, "oot_sample.csv"))
+overrides_path = st.sidebar.text_input("Override log (.csv)", os.path.join(data_dir, "overrides.csv"))
+cutoffs_path = st.sidebar.text_input("Grade cutoffs", os.path.join("config", "grade_cutoffs_v1.csv"))
+rules_path = st.sidebar.text_input("Alert rules", os.path.join("config", "alert_rules.yaml"))
+target = st.sidebar.text_input("Default flag column", "default")
+
+snapshot_paths = sorted(glob.glob(os.path.join(data_dir, "snap_*.csv")))
+periods = [os.path.splitext(os.path.basename(p))[0][len("snap_"):] for p in snapshot_paths]
+
+page = st.sidebar.radio("Page", ["Discrimination trend", "Calibration", "Population stability",
+                                 "Override heat-map", "Sensitivity tornado", "KPI panel"])
+
+
+def score_args(data_path):
+    return (model_path, _mtime(model_path), pipeline_path or None, _mtime(pipeline_path),
+            data_path, _mtime(data_path), target)
+
+
+cutoffs = (cutoffs_path, _mtime(cutoffs_path)) if os.path.exists(cutoffs_path) else None
+
+if not os.path.exists(model_path):
+    st.info(f"Upload the frozen artifacts to `{data_dir}/` to start: model not found at `{model_path}`.")
+    st.stop()
+
+# ---- Pages: only the selected page computes ------------------------------------
+if page == "Discrimination trend":
+    gini_limit = st.slider("Approved Gini limit", 0.0, 1.0, 0.55, 0.01)
+    if not snapshot_paths:
+        st.warning(f"No `snap_YYYYQ.csv` snapshots found in `{data_dir}/`.")
+    else:
+        trend = get_discrimination(tuple(score_args(p) for p in snapshot_paths), tuple(periods))
+        fig, ax = plt.subplots(figsize=(8, 3))
+        ax.axhspan(0, gini_limit, color="red", alpha=0.1, label="Below Gini limit")
+        ax.plot(trend["period"], trend["auc"], marker="o", label="AUC")
+        ax.plot(trend["period"], trend["gini"], marker="o", label="Gini")
+        ax.set_ylim(0, 1)
+        ax.legend()
+        st.pyplot(fig)
+        st.dataframe(trend)
+
+elif page == "Calibration":
+    n_bins = st.slider("Number of groups", 2, 20, 10) if cutoffs is None else None
+    frame, statistic, p_value = get_calibration(score_args(oot_path), n_bins, cutoffs)
+    col1, col2 = st.columns(2)
+    col1.metric("Hosmer-Lemeshow χ²", f"{statistic:.2f}")
+    col2.metric("p-value", f"{p_value:.3f}")
+    fig, ax = plt.subplots(figsize=(8, 3))
+    labels = [str(i) for i in frame.index]
+    ax.bar(labels, frame["mean_pd"], label="Predicted PD")
+    ax.plot(labels, frame["default_rate"], color="black", marker="o", label="Realized default rate")
+    ax.tick_params(axis="x", rotation=45)
+    ax.legend()
+    st.pyplot(fig)
+    st.dataframe(frame)
+
+elif page == "Population stability":
+    if not snapshot_paths:
+        st.warning(f"No `snap_YYYYQ.csv` snapshots found in `{data_dir}/`.")
+    else:
+        period = st.selectbox("Snapshot", periods, index=len(periods) - 1)
+        contributions, total = get_score_psi(score_args(oot_path), score_args(snapshot_paths[periods.index(period)]),
+                                             10, cutoffs)
+        st.metric("Overall PSI", f"{total:.3f}", delta="significant shift" if total >= 0.25 else None,
+                  delta_color="inverse")
+        fig, ax = plt.subplots(figsize=(8, 3))
+        ax.bar(contributions.index, contributions.values,
+               color=["red" if v > 0.25 else "steelblue" for v in contributions.values])
+        st.pyplot(fig)
+
+elif page == "Override heat-map":
+    if not os.path.exists(overrides_path):
+        st.warning(f"Override log not found at `{overrides_path}`.")
+    else:
+        rows = st.radio("Rows", ["notch", "grade_before"], horizontal=True)
+        matrix = get_override_matrix(overrides_path, _mtime(overrides_path), rows)
+        fig, ax = plt.subplots(figsize=(8, 4))
+        image = ax.imshow(matrix.to_numpy(), cmap="Reds", aspect="auto")
+        ax.set_xticks(range(len(matrix.columns)), [str(c) for c in matrix.columns], rotation=45)
+        ax.set_yticks(range(len(matrix.index)), [str(i) for i in matrix.index])
+        fig.colorbar(image)
+        st.pyplot(fig)
+
+elif page == "Sensitivity tornado":
+    columns = get_numeric_columns(oot_path, _mtime(oot_path), target)
+    drivers = st.multiselect("Top drivers", columns, default=columns[:5])
+    shock = st.slider("Shock size", 0.01, 0.20, 0.05, 0.01)
+    if drivers:
+        tornado = get_tornado(score_args(oot_path), tuple(drivers), shock)
+        wide = tornado.pivot(index="driver", columns="direction", values="delta_PD")
+        wide = wide.reindex(wide.abs().max(axis=1).sort_values().index)
+        fig, ax = plt.subplots(figsize=(8, 3))
+        ax.barh(wide.index, wide["down"], color="steelblue", label=f"-{shock:.0%}")
+        ax.barh(wide.index, wide["up"], color="indianred", label=f"+{shock:.0%}")
+        ax.axvline(0, color="black", linewidth=0.5)
+        ax.legend()
+        st.pyplot(fig)
+        st.dataframe(tornado)
+
+elif page == "KPI panel":
+    col1, col2 = st.columns(2)
+    num_overrides = col1.number_input("Number of overrides", min_value=0, value=0)
+    open_actions = col2.number_input("Open remediation actions", min_value=0, value=0)
+    last_validation = col1.date_input("Last validation date")
+    next_review = col2.date_input("Next review due")
+    panel = generate_kpi_panel(num_overrides, (pd.Timestamp.today() - pd.Timestamp(last_validation)).days,
+                               next_review, open_actions)
+    st.table(pd.Series(panel, name="value").astype(str))
+    if snapshot_paths and os.path.exists(rules_path):
+        trend = get_discrimination(tuple(score_args(p) for p in snapshot_paths), tuple(periods))
+        kpis = trend.assign(model_id=os.path.basename(model_path))
+        alerts = AlertEngine(load_alert_rules(rules_path)).run(kpis)
+        if alerts:
+            st.error(f"{len(alerts)} breach(es) raised")
+            st.dataframe(pd.DataFrame(alerts)[["model_id", "period", "rule", "value", "threshold", "severity"]])
+        else:
+            st.success("No breaches raised.")
 
 st.divider()
 st.write("© 2025 QuantUniversity. All Rights Reserved.")
 st.caption("The purpose of this demonstration is solely for educational use and illustration. "
            "To access the full legal documentation, please visit this link. Any reproduction of this demonstration "
            "requires prior written consent from QuantUniversity.")
-st.caption(This lab was generated using the QuCreate platform. QuCreate relies on AI models for generating code, "
+st.caption("This lab was generated using the QuCreate platform. QuCreate relies on AI models for generating code, "
            "which may contain inaccuracies or errors.")
@@ -0,0 +1,698 @@
+"""Times and memory-profiles every public function of the ``definitions`` package at scale.
+
+Usage::
+
+    python -m benchmarks.run_benchmarks --sizes 30k,1M
+    python -m benchmarks.run_benchmarks --sizes 10M --only calculate_auc_gini,compute_csi_table
+    python -m benchmarks.run_benchmarks --compare outputs/benchmarks/<previous>.json
+
+Each case builds its inputs outside the timed region from the seeded
+synthetic portfolio (``benchmarks.synthetic``), makes one untimed warm-up
+call, then ``--repeat`` timed calls and one call under ``tracemalloc`` for
+the peak Python/NumPy allocation. Import time of the package entry points
+is measured in fresh interpreters, together with the heavy dependencies each
+one pulls in.
+Results are written as JSON (one record per function and size) so runs from
+different commits can be compared with ``--compare``. Work done inside
+worker processes is timed but not included in ``peak_bytes``.
+"""
+import argparse
+import json
+import os
+import pickle
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime, timezone
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from benchmarks import synthetic
+import definitions as d
+
+SCHEMA_VERSION = 1
+SIZE_SUFFIXES = {"k": 1_000, "m": 1_000_000}
+CASES = {}
+# Public names that only toggle other cases' behaviour and need no case of their own.
+NOT_BENCHMARKED = {"enable_instrumentation", "disable_instrumentation", "get_instrumentation", "get_result_cache"}
+
+def case(name, max_rows=None):
+    """Registers a benchmark for the public function or class ``name``.
+
+    The decorated function receives a ``Workload`` and returns
+    ``(callable, rows)``; only the callable is timed. Sizes above ``max_rows``
+    are skipped for cases whose cost is not meant to scale with the portfolio.
+    """
+    def register(setup):
+        CASES[name] = {"setup": setup, "max_rows": max_rows}
+        return setup
+    return register
+
+def parse_size(text):
+    """Parses ``'30k'``, ``'1M'`` or ``'10000000'`` into a row count."""
+    text = text.strip().lower().replace("_", "")
+    if text and text[-1] in SIZE_SUFFIXES:
+        return int(float(text[:-1]) * SIZE_SUFFIXES[text[-1]])
+    return int(text)
+
+def public_names(module=d):
+    """Returns the public names exported by the ``definitions`` package."""
+    return sorted(module.__all__)
+
+class Workload:
+    """Lazily built inputs for one portfolio size, shared by every case."""
+
+    def __init__(self, n_rows, seed=42, workdir=None):
+        self.n_rows = n_rows
+        self.seed = seed
+        self.workdir = workdir or tempfile.mkdtemp(prefix="definitions-bench-")
+
+    def path(self, name):
+        return os.path.join(self.workdir, name)
+
+    @cached_property
+    def portfolio(self):
+        return synthetic.make_portfolio(self.n_rows, self.seed)
+
+    @cached_property
+    def X(self):
+        return self.portfolio[synthetic.FEATURES]
+
+    @cached_property
+    def y(self):
+        return self.portfolio[synthetic.TARGET].to_numpy()
+
+    @cached_property
+    def scores(self):
+        return self.portfolio["pd"].to_numpy()
+
+    @cached_property
+    def challenger_scores(self):
+        rng = np.random.default_rng(self.seed)
+        return np.clip(self.scores * rng.lognormal(0, 0.3, self.n_rows), 1e-4, 1 - 1e-4)
+
+    @cached_property
+    def grades(self):
+        return self.portfolio["grade"]
+
+    @cached_property
+    def snapshots(self):
+        """Four quarterly slices of the portfolio (the last one drifted)."""
+        periods = synthetic.quarters(4)
+        bounds = np.linspace(0, self.n_rows, len(periods) + 1, dtype=int)
+        return {period: self.portfolio.iloc[start:end]
+                for period, start, end in zip(periods, bounds[:-1], bounds[1:])}
+
+    @cached_property
+    def preprocessor(self):
+        sample = self.X.iloc[:30_000]
+        return StandardScaler().fit(sample)
+
+    @cached_property
+    def classifier(self):
+        sample = self.preprocessor.transform(self.X.iloc[:30_000])
+        return LogisticRegression(max_iter=500).fit(sample, self.y[:30_000])
+
+    @cached_property
+    def model(self):
+        """Pre-processing and classifier as one estimator that scores raw features."""
+        return Pipeline([("preprocess", self.preprocessor), ("classifier", self.classifier)])
+
+    @cached_property
+    def model_path(self):
+        path = self.path("rating_logreg_v1.pkl")
+        with open(path, "wb") as f:
+            pickle.dump(self.model, f, protocol=pickle.HIGHEST_PROTOCOL)
+        return path
+
+    @cached_property
+    def csv_path(self):
+        return synthetic.write_portfolio_csv(self.path("oot_sample.csv"), self.n_rows, self.seed)
+
+    @cached_property
+    def overrides(self):
+        return synthetic.make_override_log(self.n_rows, self.seed)
+
+    @cached_property
+    def grade_distributions(self):
+        """Baseline vs. latest-quarter grade shares, as ``compute_psi`` expects."""
+        first, *_, last = self.snapshots.values()
+        expected = first["grade"].value_counts(normalize=True, sort=False)
+        actual = last["grade"].value_counts(normalize=True, sort=False)
+        return expected, actual
+
+    @cached_property
+    def kpis(self):
+        """Wide KPI table with one row per (model, quarter)."""
+        n_models = max(1, min(self.n_rows // 1_000, 10_000))
+        periods = synthetic.quarters(8)
+        rng = np.random.default_rng(self.seed)
+        model_ids = np.repeat([f"model_{i:05d}" for i in range(n_models)], len(periods))
+        auc = np.clip(0.8 - np.cumsum(rng.normal(0.005, 0.02, (n_models, len(periods))), axis=1), 0.5, 1)
+        return pd.DataFrame({
+            "model_id": model_ids,
+            "period": np.tile(periods, n_models),
+            "auc": auc.ravel(),
+            "gini": 2 * auc.ravel() - 1,
+            "psi": rng.gamma(1.0, 0.05, n_models * len(periods)),
+            "override_rate": rng.uniform(0, 0.25, n_models * len(periods)),
+        })
+
+    def close(self):
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+def _consume(iterable):
+    count = 0
+    for _ in iterable:
+        count += 1
+    return count
+
+def _elapsed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+# ---- I/O and artifacts ----------------------------------------------------------
+
+@case("load_model")
+def _bench_load_model(w):
+    path = w.model_path
+    return lambda: d.load_model(path), 1
+
+@case("save_model_mmap")
+def _bench_save_model_mmap(w):
+    return lambda: d.save_model_mmap(w.model, w.path("model_mmap")), 1
+
+@case("load_model_mmap")
+def _bench_load_model_mmap(w):
+    model_dir = d.save_model_mmap(w.model, w.path("model_mmap_load"))
+    return lambda: d.load_model_mmap(model_dir), 1
+
+@case("ArtifactCache")
+def _bench_artifact_cache(w):
+    path = w.model_path
+    def run():
+        cache = d.ArtifactCache()
+        cache.get(path)
+        return cache.get(path)
+    return run, 1
+
+@case("get_artifact_cache")
+def _bench_get_artifact_cache(w):
+    return d.get_artifact_cache, 1
+
+@case("load_model_cached")
+def _bench_load_model_cached(w):
+    path = w.model_path
+    cache = d.ArtifactCache()
+    return lambda: d.load_model_cached(path, cache=cache), 1
+
+@case("load_data")
+def _bench_load_data(w):
+    path = w.csv_path
+    return lambda: d.load_data(path), w.n_rows
+
+@case("load_data_chunks")
+def _bench_load_data_chunks(w):
+    path = w.csv_path
+    return lambda: _consume(d.load_data_chunks(path, chunksize=250_000)), w.n_rows
+
+@case("apply_preprocessing")
+def _bench_apply_preprocessing(w):
+    return lambda: d.apply_preprocessing(w.preprocessor, w.X), w.n_rows
+
+@case("iter_scores")
+def _bench_iter_scores(w):
+    chunks = [w.X.iloc[i:i + 250_000] for i in range(0, w.n_rows, 250_000)]
+    return lambda: _consume(d.iter_scores(w.preprocessor, w.classifier, chunks)), w.n_rows
+
+@case("score_to_disk")
+def _bench_score_to_disk(w):
+    chunks = [w.X.iloc[i:i + 250_000] for i in range(0, w.n_rows, 250_000)]
+    return lambda: d.score_to_disk(w.preprocessor, w.classifier, chunks, w.path("scores.npy")), w.n_rows
+
+@case("model_fingerprint")
+def _bench_model_fingerprint(w):
+    return lambda: d.model_fingerprint(w.model), 1
+
+@case("dataset_fingerprint")
+def _bench_dataset_fingerprint(w):
+    return lambda: d.dataset_fingerprint(w.X), w.n_rows
+
+@case("PredictionStore")
+def _bench_prediction_store(w):
+    # Times a hit on registered objects, which must beat scoring again.
+    store = d.PredictionStore()
+    store.register(w.model)
+    store.register(w.X)
+    store.score(w.model, w.X)
+    hit = min(_elapsed(lambda: store.score(w.model, w.X)) for _ in range(3))
+    scoring = min(_elapsed(lambda: w.model.predict_proba(w.X)) for _ in range(3))
+    assert hit < scoring, f"store hit took {hit:.4f}s, scoring {scoring:.4f}s"
+    return lambda: store.score(w.model, w.X), w.n_rows
+
+# ---- Discrimination ---------------------------------------------------------------
+
+@case("calculate_auc_gini")
+def _bench_calculate_auc_gini(w):
+    return lambda: d.calculate_auc_gini(w.model, w.X, w.y), w.n_rows
+
+@case("AUCAccumulator")
+def _bench_auc_accumulator(w):
+    return lambda: d.AUCAccumulator().update(w.y, w.scores).auc(), w.n_rows
+
+@case("accumulate_auc_gini")
+def _bench_accumulate_auc_gini(w):
+    frame = w.portfolio
+    chunks = [frame.iloc[i:i + 250_000] for i in range(0, w.n_rows, 250_000)]
+    return (lambda: d.accumulate_auc_gini(w.model, chunks, synthetic.TARGET, feature_cols=synthetic.FEATURES),
+            w.n_rows)
+
+@case("bootstrap_auc_gini")
+def _bench_bootstrap_auc_gini(w):
+    return lambda: d.bootstrap_auc_gini(w.y, w.scores, n_boot=200), w.n_rows
+
+@case("delong_auc_covariance")
+def _bench_delong_auc_covariance(w):
+    scores = np.vstack([w.scores, w.challenger_scores])
+    return lambda: d.delong_auc_covariance(w.y, scores), w.n_rows
+
+@case("compare_auc_delong")
+def _bench_compare_auc_delong(w):
+    scores = {"champion": w.scores, "challenger": w.challenger_scores}
+    return lambda: d.compare_auc_delong(w.y, scores, reference="champion"), w.n_rows
+
+@case("track_auc_gini_drift")
+def _bench_track_auc_gini_drift(w):
+    periods = list(w.snapshots)
+    X_snapshots = [frame[synthetic.FEATURES] for frame in w.snapshots.values()]
+    y_snapshots = [frame[synthetic.TARGET] for frame in w.snapshots.values()]
+    return lambda: d.track_auc_gini_drift(w.model, X_snapshots, y_snapshots, periods), w.n_rows
+
+# ---- Calibration ------------------------------------------------------------------
+
+@case("perform_hosmer_lemeshow_test")
+def _bench_hosmer_lemeshow(w):
+    return lambda: d.perform_hosmer_lemeshow_test(w.y, w.scores, 10, grouping="quantile"), w.n_rows
+
+@case("hosmer_lemeshow_batch")
+def _bench_hosmer_lemeshow_batch(w):
+    probs = {"champion": w.scores, "challenger": w.challenger_scores}
+    return lambda: d.hosmer_lemeshow_batch(w.y, probs), w.n_rows
+
+@case("generate_calibration_curve")
+def _bench_calibration_curve(w):
+    return lambda: d.generate_calibration_curve(w.y, w.scores, 10), w.n_rows
+
+@case("CalibrationAccumulator")
+def _bench_calibration_accumulator(w):
+    grades = w.grades.to_numpy()
+    run = lambda: d.CalibrationAccumulator(grades=synthetic.GRADES).update(w.y, w.scores, grades=grades).to_frame()
+    return run, w.n_rows
+
+# ---- Stability ----------------------------------------------------------------------
+
+@case("compute_psi")
+def _bench_compute_psi(w):
+    expected, actual = w.grade_distributions
+    return lambda: d.compute_psi(expected, actual, synthetic.GRADES), len(synthetic.GRADES)
+
+@case("compute_overall_psi")
+def _bench_compute_overall_psi(w):
+    expected, actual = w.grade_distributions
+    return lambda: d.compute_overall_psi(expected.to_numpy(), actual.to_numpy()), len(synthetic.GRADES)
+
+@case("compute_psi_matrix")
+def _bench_compute_psi_matrix(w):
+    edges = d.characteristic_bin_edges(w.X)
+    counts = np.stack([d.characteristic_bin_counts(frame, edges) for frame in w.snapshots.values()], axis=2)
+    expected = counts[:, :, 0]
+    return lambda: d.compute_psi_matrix(expected, counts, epsilon=1e-4), counts.size
+
+@case("characteristic_bin_edges")
+def _bench_characteristic_bin_edges(w):
+    return lambda: d.characteristic_bin_edges(w.X), w.n_rows
+
+@case("characteristic_bin_counts")
+def _bench_characteristic_bin_counts(w):
+    edges = d.characteristic_bin_edges(w.X)
+    return lambda: d.characteristic_bin_counts(w.X, edges), w.n_rows
+
+@case("compute_csi_table")
+def _bench_compute_csi_table(w):
+    first, *rest = [frame[synthetic.FEATURES] for frame in w.snapshots.values()]
+    periods = list(w.snapshots)[1:]
+    return lambda: d.compute_csi_table(first, rest, periods), w.n_rows
+
+@case("PopulationProfile")
+def _bench_population_profile(w):
+    first, *rest = [frame[synthetic.FEATURES] for frame in w.snapshots.values()]
+    periods = list(w.snapshots)[1:]
+    def run():
+        profile = d.PopulationProfile.from_baseline(first)
+        for period, frame in zip(periods, rest):
+            profile.add_period(period, frame)
+        return profile.psi_table()
+    return run, w.n_rows
+
+@case("GradeMapper")
+def _bench_grade_mapper(w):
+    mapper = d.GradeMapper(synthetic.GRADES, synthetic.GRADE_PD_UPPER)
+    return lambda: mapper.distribution(w.scores), w.n_rows
+
+@case("load_grade_mapper")
+def _bench_load_grade_mapper(w):
+    path = w.path("grade_cutoffs_v1.csv")
+    synthetic.make_grade_cutoffs().to_csv(path, index=False)
+    return lambda: d.load_grade_mapper(path), len(synthetic.GRADES)
+
+# ---- Overrides and sensitivity --------------------------------------------------------
+
+@case("calculate_override_rate")
+def _bench_calculate_override_rate(w):
+    return lambda: d.calculate_override_rate(len(w.overrides), w.n_rows * 10), 1
+
+@case("generate_override_matrix")
+def _bench_generate_override_matrix(w):
+    return (lambda: d.generate_override_matrix(w.overrides, synthetic.GRADES, synthetic.REASON_CODES,
+                                               rows="notch", by="period"),
+            w.n_rows)
+
+@case("perform_sensitivity_analysis")
+def _bench_perform_sensitivity_analysis(w):
+    drivers = ["PAY_0", "LIMIT_BAL", "BILL_AMT1", "PAY_AMT1", "AGE"]
+    return lambda: d.perform_sensitivity_analysis(w.model, w.X, drivers, 0.05), w.n_rows
+
+@case("perform_sensitivity_grid")
+def _bench_perform_sensitivity_grid(w):
+    drivers = ["PAY_0", "LIMIT_BAL", "BILL_AMT1", "PAY_AMT1", "AGE"]
+    return lambda: d.perform_sensitivity_grid(w.model, w.X, drivers), w.n_rows
+
+# ---- Portfolio runner -------------------------------------------------------------------
+
+@case("SharedFrame")
+def _bench_shared_frame(w):
+    def run():
+        with d.SharedFrame.from_frame(w.portfolio) as shared:
+            return shared.to_frame().shape
+    return run, w.n_rows
+
+@case("run_portfolio_validation")
+def _bench_run_portfolio_validation(w):
+    models = {"logreg": w.model, "logreg_copy": w.model_path}
+    datasets = {period: frame for period, frame in w.snapshots.items()}
+    run = lambda: d.run_portfolio_validation(models, datasets, synthetic.TARGET, feature_cols=synthetic.FEATURES,
+                                             n_jobs=2, top_drivers=["PAY_0", "LIMIT_BAL"])
+    return run, w.n_rows * len(models)
+
+# ---- Result cache -------------------------------------------------------------------------
+
+@case("ResultCache")
+def _bench_result_cache(w):
+    """Warm hits: AUC/Gini on unchanged files, HL and calibration on in-memory arrays (hashed per call)."""
+    cache = d.ResultCache(w.path("results"))
+    auc_gini = cache.wrap(d.calculate_auc_gini)
+    hosmer_lemeshow = cache.wrap(d.perform_hosmer_lemeshow_test)
+    calibration = cache.wrap(d.generate_calibration_curve)
+    model, X, y = (cache.model(w.model_path), cache.data(w.csv_path, synthetic.FEATURES),
+                   cache.data(w.csv_path, synthetic.TARGET))
+    def run():
+        return (auc_gini(model, X, y), hosmer_lemeshow(w.y, w.scores, 10, grouping="quantile"),
+                calibration(w.y, w.scores, 10))
+    return run, w.n_rows
+
+# ---- Governance, reporting and alerting ----------------------------------------------
+
+@case("generate_kpi_panel")
+def _bench_generate_kpi_panel(w):
+    return lambda: d.generate_kpi_panel(len(w.overrides), 90, date(2025, 6, 30), 3), 1
+
+@case("KPIStore")
+def _bench_kpi_store(w):
+    kpis = w.kpis
+    def run():
+        store = d.KPIStore(w.path(f"rmm_data_{time.perf_counter_ns()}"))
+        for (model_id, period), frame in kpis.iloc[:200].groupby(["model_id", "period"]):
+            store.append("discrimination", frame, model_id, period)
+        return store.query("discrimination")
+    return run, min(len(kpis), 200)
+
+@case("write_model_inventory_record")
+def _bench_write_model_inventory_record(w):
+    record = synthetic.make_inventory_records(1, w.seed)[0]
+    return lambda: d.write_model_inventory_record(record, w.path("inventory_record.yaml")), 1
+
+@case("ModelInventoryRegistry")
+def _bench_model_inventory_registry(w):
+    records = synthetic.make_inventory_records(min(w.n_rows, 100_000), w.seed)
+    def run():
+        registry = d.ModelInventoryRegistry()
+        registry.upsert_many(records)
+        registry.find(tier=1, owner="owner_03")
+        return registry.due_between(date(2025, 7, 1), date(2025, 9, 30))
+    return run, len(records)
+
+@case("generate_validation_report")
+def _bench_generate_validation_report(w):
+    table = w.portfolio.iloc[:2_000][["LIMIT_BAL", "AGE", "PAY_0", "pd", "grade", "default"]]
+    data = {"title": "Validation report", "model": "rating_logreg_v1", "AUC": 0.78,
+            "tables": {"Sample obligors": table},
+            "charts": {"Gini by quarter": pd.Series([0.6, 0.58, 0.57, 0.55], index=synthetic.quarters(4))}}
+    return lambda: d.generate_validation_report(data, w.path("report.pdf")), len(table)
+
+@case("generate_validation_reports")
+def _bench_generate_validation_reports(w):
+    data = {"title": "Validation report", "model": "rating_logreg_v1", "AUC": 0.78}
+    jobs = [(data, w.path(f"report_{i}.pdf")) for i in range(8)]
+    return lambda: d.generate_validation_reports(jobs), len(jobs)
+
+@case("raise_alerts")
+def _bench_raise_alerts(w):
+    return lambda: d.raise_alerts(0.01, 0.02, 0.05), 1
+
+@case("load_alert_rules")
+def _bench_load_alert_rules(w):
+    config = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config", "alert_rules.yaml")
+    return lambda: d.load_alert_rules(config), 1
+
+@case("evaluate_alert_rules")
+def _bench_evaluate_alert_rules(w):
+    rules = _bench_rules()
+    return lambda: d.evaluate_alert_rules(w.kpis, rules), len(w.kpis)
+
+@case("AlertEngine")
+def _bench_alert_engine(w):
+    rules = _bench_rules()
+    return lambda: d.AlertEngine(rules, logger=_SILENT_LOGGER).run(w.kpis), len(w.kpis)
+
+# ---- Instrumentation ------------------------------------------------------------------
+
+@case("instrumented")
+def _bench_instrumented(w):
+    """Overhead of 100k calls to an instrumented no-op while instrumentation is disabled."""
+    noop = d.instrumented(lambda x: x, name="noop")
+    def run():
+        for i in range(100_000):
+            noop(i)
+    return run, 100_000
+
+@case("InstrumentationRegistry")
+def _bench_instrumentation_registry(w):
+    """``calculate_auc_gini`` with timing enabled, plus both exports."""
+    def run():
+        registry = d.enable_instrumentation()
+        try:
+            d.calculate_auc_gini(w.model, w.X, w.y)
+            registry.to_json()
+            return registry.to_prometheus()
+        finally:
+            d.disable_instrumentation()
+            registry.reset()
+    return run, w.n_rows
+
+def _bench_rules():
+    config = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config", "alert_rules.yaml")
+    return d.load_alert_rules(config)
+
+class _SilentLogger:
+    def log(self, level, message):
+        pass
+
+_SILENT_LOGGER = _SilentLogger()
+
+# ---- Runner ---------------------------------------------------------------------------
+
+def _measure(fn, repeat):
+    fn()  # warm-up: builds lazy workload inputs and first-call caches outside the timings
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return timings, peak
+
+def run_case(name, workload, repeat=3):
+    """Runs one registered case and returns its JSON-serialisable result record."""
+    spec = CASES[name]
+    record = {"name": name, "size": workload.n_rows}
+    if spec["max_rows"] is not None and workload.n_rows > spec["max_rows"]:
+        return {**record, "status": "skipped", "reason": f"size above max_rows={spec['max_rows']}"}
+    try:
+        fn, rows = spec["setup"](workload)
+        timings, peak = _measure(fn, repeat)
+    except Exception as e:
+        return {**record, "status": "error", "error": f"{type(e).__name__}: {e}"}
+    return {**record, "status": "ok", "rows": int(rows), "repeat": repeat,
+            "seconds_min": min(timings), "seconds_median": statistics.median(timings),
+            "seconds_mean": statistics.fmean(timings), "rows_per_second": rows / min(timings) if min(timings) else None,
+            "peak_bytes": int(peak)}
+
+IMPORT_STATEMENTS = [
+    "import definitions",
+    "from definitions import compute_psi",
+    "from definitions import load_alert_rules, evaluate_alert_rules",
+    "from definitions import calculate_auc_gini",
+    "from definitions import generate_validation_report",
+    "import definitions.definitions",
+]
+HEAVY_MODULES = ("pandas", "scipy", "sklearn", "reportlab", "yaml", "pyarrow")
+_IMPORT_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+def measure_import(statement, repeat=3):
+    """Times ``statement`` in fresh interpreters; returns the fastest run and the heavy modules it loaded."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    code = _IMPORT_PROBE.format(statement=statement, heavy=HEAVY_MODULES)
+    runs = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, cwd=root)
+        runs.append(json.loads(output.stdout.strip().splitlines()[-1]))
+    seconds = [run["seconds"] for run in runs]
+    return {"statement": statement, "repeat": repeat, "seconds_min": min(seconds),
+            "seconds_median": statistics.median(seconds), "loaded": runs[0]["loaded"]}
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def environment():
+    """Returns the metadata recorded with every run."""
+    import scipy
+    import sklearn
+    return {"commit": _git_commit(), "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(), "platform": platform.platform(),
+            "cpu_count": os.cpu_count(), "numpy": np.__version__, "pandas": pd.__version__,
+            "scipy": scipy.__version__, "sklearn": sklearn.__version__}
+
+def run_benchmarks(sizes, names=None, repeat=3, seed=42, log=print, imports=True):
+    """Runs the selected cases for every size (and the import-time probes) and returns the results document."""
+    names = list(CASES) if names is None else list(names)
+    unknown = sorted(set(names) - set(CASES))
+    if unknown:
+        raise ValueError(f"Unknown benchmark cases: {unknown}")
+    results = []
+    for size in sizes:
+        workload = Workload(size, seed)
+        try:
+            for name in names:
+                record = run_case(name, workload, repeat)
+                results.append(record)
+                if log:
+                    detail = (f"{record['seconds_min']:.4f}s  peak {record['peak_bytes'] / 2**20:.1f} MiB"
+                              if record["status"] == "ok" else record.get("error") or record.get("reason"))
+                    log(f"{size:>10,}  {name:<32} {detail}")
+        finally:
+            workload.close()
+    import_results = []
+    for statement in IMPORT_STATEMENTS if imports else []:
+        record = measure_import(statement, repeat)
+        import_results.append(record)
+        if log:
+            log(f"{'import':>10}  {statement:<64} {record['seconds_min']:.3f}s  loads {', '.join(record['loaded'])}")
+    return {"schema": SCHEMA_VERSION, "meta": {**environment(), "seed": seed, "sizes": list(sizes)},
+            "uncovered": sorted(set(public_names()) - set(CASES) - NOT_BENCHMARKED), "results": results,
+            "imports": import_results}
+
+def compare_results(baseline, current, threshold=1.2):
+    """Joins two result documents on (name, size) and flags slowdowns above ``threshold``.
+
+    Returns:
+        pandas.DataFrame: One row per case present in both runs with time and
+        peak-memory ratios (current / baseline) and a ``regression`` flag.
+    """
+    columns = ["name", "size", "seconds_min", "peak_bytes"]
+    def frame(doc):
+        ok = [r for r in doc["results"] if r.get("status") == "ok"]
+        return pd.DataFrame(ok, columns=columns) if ok else pd.DataFrame(columns=columns)
+    joined = frame(baseline).merge(frame(current), on=["name", "size"], suffixes=("_baseline", "_current"))
+    joined["time_ratio"] = joined["seconds_min_current"] / joined["seconds_min_baseline"]
+    joined["memory_ratio"] = joined["peak_bytes_current"] / joined["peak_bytes_baseline"].replace(0, np.nan)
+    joined["regression"] = joined["time_ratio"] > threshold
+    return joined.sort_values(["regression", "time_ratio"], ascending=False).reset_index(drop=True)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="30k,1M", help="comma-separated portfolio sizes, e.g. 30k,1M,10M")
+    parser.add_argument("--only", help="comma-separated case names (default: all)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="JSON output path (default: outputs/benchmarks/<timestamp>-<commit>.json)")
+    parser.add_argument("--compare", help="previous results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=1.2, help="time ratio that counts as a regression")
+    parser.add_argument("--skip-imports", action="store_true", help="skip the import-time probes")
+    parser.add_argument("--list", action="store_true", help="list cases and uncovered public names, then exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print("\n".join(CASES))
+        uncovered = sorted(set(public_names()) - set(CASES) - NOT_BENCHMARKED)
+        if uncovered:
+            print(f"uncovered: {', '.join(uncovered)}")
+        return 0
+
+    sizes = [parse_size(s) for s in args.sizes.split(",")]
+    names = args.only.split(",") if args.only else None
+    document = run_benchmarks(sizes, names, args.repeat, args.seed, imports=not args.skip_imports)
+    output = args.output or os.path.join(
+        "outputs", "benchmarks",
+        f"{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}-{document['meta']['commit'] or 'nogit'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(document, f, indent=2)
+    print(f"wrote {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            comparison = compare_results(json.load(f), document, args.threshold)
+        with pd.option_context("display.width", 160, "display.max_rows", None):
+            print(comparison[["name", "size", "seconds_min_baseline", "seconds_min_current",
+                              "time_ratio", "memory_ratio", "regression"]].to_string(index=False))
+        return 1 if comparison["regression"].any() else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
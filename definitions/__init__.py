@@ -0,0 +1,61 @@
+"""Model-risk monitoring toolkit for credit rating models.
+
+Public names are resolved lazily: ``from definitions import compute_psi``
+imports only :mod:`definitions.stability` (NumPy and pandas), while SciPy,
+scikit-learn and ReportLab load only when a function that needs them is first
+used. ``definitions.definitions`` remains as the eager, flat legacy namespace.
+"""
+import importlib
+
+_SUBMODULE_EXPORTS = {
+    "instrumentation": (
+        "InstrumentationRegistry", "get_instrumentation", "enable_instrumentation", "disable_instrumentation",
+        "instrumented",
+    ),
+    "io": (
+        "load_model", "save_model_mmap", "load_model_mmap", "ArtifactCache", "get_artifact_cache",
+        "load_model_cached", "load_data", "load_data_chunks", "apply_preprocessing", "iter_scores",
+        "score_to_disk", "model_fingerprint", "dataset_fingerprint", "PredictionStore",
+    ),
+    "metrics": (
+        "calculate_auc_gini", "AUCAccumulator", "accumulate_auc_gini", "bootstrap_auc_gini",
+        "delong_auc_covariance", "compare_auc_delong", "perform_hosmer_lemeshow_test",
+        "hosmer_lemeshow_batch", "generate_calibration_curve", "CalibrationAccumulator",
+        "track_auc_gini_drift", "perform_sensitivity_analysis", "perform_sensitivity_grid",
+    ),
+    "stability": (
+        "compute_psi", "compute_overall_psi", "compute_psi_matrix", "characteristic_bin_edges",
+        "characteristic_bin_counts", "compute_csi_table", "PopulationProfile", "GradeMapper",
+        "load_grade_mapper",
+    ),
+    "governance": (
+        "calculate_override_rate", "generate_override_matrix", "generate_kpi_panel", "KPIStore",
+        "write_model_inventory_record", "ModelInventoryRegistry", "raise_alerts", "load_alert_rules",
+        "evaluate_alert_rules", "AlertEngine",
+    ),
+    "reporting": (
+        "generate_validation_report", "generate_validation_reports",
+    ),
+    "portfolio": (
+        "SharedFrame", "run_portfolio_validation",
+    ),
+    "cache": (
+        "ResultCache", "get_result_cache",
+    ),
+}
+_EXPORTS = {name: module for module, names in _SUBMODULE_EXPORTS.items() for name in names}
+
+__all__ = sorted(_EXPORTS)
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        if name in _SUBMODULE_EXPORTS or name == "definitions":
+            return importlib.import_module(f".{name}", __name__)
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
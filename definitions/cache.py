@@ -0,0 +1,407 @@
+"""Persistent memoization of validation results keyed by data, model and parameter fingerprints."""
+
+__all__ = [
+    "ResultCache",
+    "get_result_cache",
+]
+
+from .instrumentation import instrumented
+
+import functools
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import tempfile
+import threading
+import time
+import weakref
+import numpy as np
+import pandas as pd
+
+from .io import dataset_fingerprint, load_data, load_model_cached, model_fingerprint
+
+_CACHE_FORMAT = 1
+
+class _NoFingerprint(Exception):
+    """Raised for arguments without a content fingerprint; such calls are not cached."""
+
+def _read_frame(path):
+    if path.endswith((".parquet", ".pq")):
+        return pd.read_parquet(path)
+    return load_data(path)
+
+class _FileArgument:
+    """Data or model file passed to a cached call and loaded only on a cache miss."""
+
+    def __init__(self, path, kind, columns=None):
+        self.path = os.path.realpath(path)
+        self.kind = kind
+        self.columns = list(columns) if isinstance(columns, (list, tuple, pd.Index)) else columns
+
+    def label(self, digest):
+        return f"file:{digest}" if self.columns is None else f"file:{digest}[{self.columns!r}]"
+
+    def load(self, frames):
+        """Returns the loaded object; ``frames`` shares one parse of a file between arguments."""
+        if self.kind == "model":
+            return load_model_cached(self.path)
+        df = frames.get(self.path)
+        if df is None:
+            df = frames[self.path] = _read_frame(self.path)
+        return df if self.columns is None else df[self.columns]
+
+    def __repr__(self):
+        return f"ResultCache.{self.kind}({self.path!r}" + (f", {self.columns!r})" if self.columns is not None else ")")
+
+class ResultCache:
+    """On-disk cache of function results keyed by content fingerprints of their inputs.
+
+    Each argument is reduced to a fingerprint: file paths (CSV, parquet,
+    ``.pkl``) by the SHA-256 of their bytes, DataFrames, Series and arrays by
+    ``dataset_fingerprint``, models by ``model_fingerprint`` and plain values
+    by their ``repr``; other objects are fingerprinted afresh on every call,
+    so a model refit in place gets a new key. Calls with an argument that
+    has no content fingerprint (an object that cannot be pickled) are
+    computed without being cached.
+
+    Pass ``cache.data(path, columns)`` and ``cache.model(path)`` instead of
+    loaded objects to be served from disk in milliseconds: they are keyed by
+    the hash of their file and only read and parsed on a cache miss.
+    Frames and models read eagerly with ``load_data``/``load_model`` reuse
+    the hash of their source file too (and are treated as read-only), but
+    the file has already been parsed by then. Either way
+    ``invalidate(source=path)`` finds the results computed from a file, and
+    file hashes are recomputed only when a file's mtime or size changes.
+
+    Results are pickled one file per entry. Entries are evicted
+    least-recently-used first once their total size exceeds ``max_bytes``.
+    Parameters that do not change a result (``store``, ``n_jobs``,
+    ``executor``, ``chunk_size`` ...) are left out of the key.
+    """
+
+    IGNORED_PARAMS = frozenset({"store", "n_jobs", "executor", "chunk_size", "max_block_elements"})
+
+    def __init__(self, directory, max_bytes=512 * 1024 ** 2):
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be positive.")
+        self.directory = os.fspath(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._file_digests = {}  # realpath -> (mtime_ns, size, digest)
+        self._objects = {}  # id(obj) -> (weakref, fingerprint, source realpath or None)
+        self._lock = threading.RLock()
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _entry_path(self, key, suffix=".pkl"):
+        return os.path.join(self.directory, key + suffix)
+
+    def _entries(self):
+        """Returns (key, size, mtime) for every stored result."""
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".pkl"):
+                try:
+                    st = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((entry.name[:-4], st.st_size, st.st_mtime_ns))
+        return entries
+
+    def __len__(self):
+        return len(self._entries())
+
+    def __contains__(self, key):
+        return os.path.isfile(self._entry_path(key))
+
+    def file_digest(self, path):
+        """Returns the SHA-256 of a file's bytes, rehashing only when its mtime or size changed."""
+        real = os.path.realpath(path)
+        st = os.stat(real)
+        with self._lock:
+            known = self._file_digests.get(real)
+            if known is not None and known[:2] == (st.st_mtime_ns, st.st_size):
+                return known[2]
+        h = hashlib.sha256()
+        with open(real, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+        digest = h.hexdigest()
+        with self._lock:
+            self._file_digests[real] = (st.st_mtime_ns, st.st_size, digest)
+        return digest
+
+    def _remember(self, obj, fingerprint, source=None):
+        try:
+            ref = weakref.ref(obj, lambda _, key=id(obj): self._objects.pop(key, None))
+        except TypeError:
+            return
+        with self._lock:
+            self._objects[id(obj)] = (ref, fingerprint, source)
+
+    def _recall(self, obj):
+        known = self._objects.get(id(obj))
+        if known is not None and known[0]() is obj:
+            return known[1], known[2]
+        return None
+
+    def load_data(self, data_path, target_col=None, feature_cols=None):
+        """Loads a CSV (or parquet) file whose fingerprints reuse the file's content hash.
+
+        Args:
+            data_path (str): Path to the .csv or .parquet file.
+            target_col (str): If given, returns ``(X, y)`` instead of the frame,
+                both fingerprinted by the file hash and the selected columns.
+            feature_cols (list): Columns of ``X``; defaults to all but the target.
+        Returns:
+            pandas.DataFrame or tuple: The frame, or ``(X, y)``.
+        """
+        real = os.path.realpath(data_path)
+        digest = self.file_digest(real)
+        df = _read_frame(real)
+        if target_col is None:
+            self._remember(df, f"file:{digest}", real)
+            return df
+        if feature_cols is None:
+            feature_cols = [c for c in df.columns if c != target_col]
+        X, y = df[list(feature_cols)], df[target_col]
+        self._remember(X, f"file:{digest}[{list(feature_cols)!r}]", real)
+        self._remember(y, f"file:{digest}[{target_col!r}]", real)
+        return X, y
+
+    def load_model(self, model_path):
+        """Loads a model through the artifact cache, fingerprinted by its pickle's content hash."""
+        real = os.path.realpath(model_path)
+        model = load_model_cached(real)
+        self._remember(model, f"file:{self.file_digest(real)}", real)
+        return model
+
+    def data(self, data_path, columns=None):
+        """Returns a lazy argument for a cached call: a CSV/parquet file, or its ``columns``.
+
+        ``columns`` is a column name (a Series is passed) or a list of names
+        (a DataFrame). All data arguments on the same file share one parse.
+
+        >>> auc_gini = cache.wrap(calculate_auc_gini)
+        >>> auc_gini(cache.model("model.pkl"), cache.data("snap_2024Q1.csv", FEATURES),
+        ...          cache.data("snap_2024Q1.csv", "default"))
+        """
+        return _FileArgument(data_path, "data", columns)
+
+    def model(self, model_path):
+        """Returns a lazy argument for a cached call: a model pickle loaded through the artifact cache."""
+        return _FileArgument(model_path, "model")
+
+    def fingerprint(self, value, sources=None):
+        """Returns a stable fingerprint of ``value``, adding any source file paths to ``sources``.
+
+        Raises:
+            _NoFingerprint: If ``value`` (or an object inside it) cannot be fingerprinted by content.
+        """
+        if value is None or isinstance(value, (bool, int, float, complex, bytes)):
+            return repr(value)
+        if isinstance(value, _FileArgument):
+            if sources is not None:
+                sources.add(value.path)
+            return value.label(self.file_digest(value.path))
+        if isinstance(value, (str, os.PathLike)):
+            path = os.fspath(value)
+            if os.path.isfile(path):
+                if sources is not None:
+                    sources.add(os.path.realpath(path))
+                return f"file:{self.file_digest(path)}"
+            return repr(path)
+        known = self._recall(value)
+        if known is not None:
+            if sources is not None and known[1] is not None:
+                sources.add(known[1])
+            return known[0]
+        if isinstance(value, (pd.DataFrame, pd.Series, pd.Index, np.ndarray)):
+            return f"data:{dataset_fingerprint(value)}"
+        if isinstance(value, (np.generic, range, slice)):
+            return repr(value)
+        if isinstance(value, (list, tuple)):
+            inner = ",".join(self.fingerprint(v, sources) for v in value)
+            return f"{type(value).__name__}({inner})"
+        if isinstance(value, (set, frozenset)):
+            return f"set({','.join(sorted(self.fingerprint(v, sources) for v in value))})"
+        if isinstance(value, dict):
+            items = sorted((self.fingerprint(k, sources), self.fingerprint(v, sources)) for k, v in value.items())
+            return "dict(" + ",".join(f"{k}:{v}" for k, v in items) + ")"
+        fingerprint = model_fingerprint(value)
+        if fingerprint.startswith("id:"):
+            raise _NoFingerprint(type(value).__name__)
+        return f"object:{fingerprint}"
+
+    def key(self, func, args=(), kwargs=None, ignore=None, sources=None):
+        """Returns the cache key of calling ``func(*args, **kwargs)``, or None if it cannot be cached."""
+        ignore = self.IGNORED_PARAMS if ignore is None else frozenset(ignore)
+        bound = inspect.signature(func).bind(*args, **(kwargs or {}))
+        bound.apply_defaults()
+        params = {name: value for name, value in bound.arguments.items() if name not in ignore}
+        return self.digest(f"{func.__module__}.{func.__qualname__}", params, sources=sources)
+
+    def digest(self, name, params, sources=None, fingerprints=None):
+        """Returns the cache key of result ``name`` computed from ``params``, or None if it cannot be cached.
+
+        ``fingerprints`` maps further parameters to fingerprints (or digests)
+        already computed, which are used as they are.
+        """
+        parts = [f"format={_CACHE_FORMAT}", name]
+        try:
+            parts += [f"{param}={self.fingerprint(value, sources)}" for param, value in params.items()]
+        except _NoFingerprint:
+            return None
+        parts += [f"{param}={fingerprint}" for param, fingerprint in (fingerprints or {}).items()]
+        return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+    def get(self, key, default=None):
+        """Returns the stored result for ``key`` (marking it recently used), else ``default``."""
+        path = self._entry_path(key)
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+        except FileNotFoundError:
+            return default
+        except Exception:
+            self._remove(key)  # truncated or unreadable entry
+            return default
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return value
+
+    def put(self, key, value, function=None, sources=()):
+        """Stores ``value`` under ``key`` and evicts old entries beyond ``max_bytes``."""
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(payload) > self.max_bytes:
+            return
+        meta = {"function": function, "sources": sorted(sources), "bytes": len(payload), "created": time.time()}
+        for suffix, data in ((".json", json.dumps(meta).encode()), (".pkl", payload)):
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.replace(tmp, self._entry_path(key, suffix))
+            except BaseException:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+                raise
+        self._evict()
+
+    def _remove(self, key):
+        for suffix in (".pkl", ".json"):
+            try:
+                os.remove(self._entry_path(key, suffix))
+            except FileNotFoundError:
+                pass
+
+    def _evict(self):
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        for key, size, _ in entries[:-1]:
+            if total <= self.max_bytes:
+                break
+            self._remove(key)
+            total -= size
+
+    @instrumented
+    def call(self, func, *args, **kwargs):
+        """Returns ``func(*args, **kwargs)``, computing and storing it only on a cache miss.
+
+        ``data``/``model`` arguments are loaded just before ``func`` runs on a miss.
+        """
+        sources = set()
+        key = self.key(func, args, kwargs, sources=sources)
+        missing = object()
+        value = missing if key is None else self.get(key, missing)
+        if value is not missing:
+            with self._lock:
+                self.hits += 1
+            return value
+        with self._lock:
+            self.misses += 1
+        frames = {}
+        args = [a.load(frames) if isinstance(a, _FileArgument) else a for a in args]
+        kwargs = {k: v.load(frames) if isinstance(v, _FileArgument) else v for k, v in kwargs.items()}
+        value = func(*args, **kwargs)
+        if key is not None:
+            self.put(key, value, f"{func.__module__}.{func.__qualname__}", sources)
+        return value
+
+    def wrap(self, func):
+        """Returns a version of ``func`` whose results are memoized in this cache.
+
+        Hits skip parsing only for ``cache.data``/``cache.model`` arguments;
+        in-memory frames and arrays are hashed on every call.
+
+        >>> cached_auc = cache.wrap(calculate_auc_gini)
+        >>> auc, gini = cached_auc(cache.model("model.pkl"), cache.data("oot.csv", FEATURES),
+        ...                        cache.data("oot.csv", "default"))
+        """
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return self.call(func, *args, **kwargs)
+        wrapper.cache = self
+        return wrapper
+
+    def invalidate(self, source=None, function=None):
+        """Drops stored results and returns how many were removed.
+
+        Args:
+            source (str): Only drop results computed from this data or model file.
+            function (callable or str): Only drop results of this function.
+            With neither argument every entry is dropped.
+        """
+        source = os.path.realpath(source) if source is not None else None
+        if function is not None and not isinstance(function, str):
+            function = f"{function.__module__}.{function.__qualname__}"
+        removed = 0
+        for key, _, _ in self._entries():
+            if source is not None or function is not None:
+                try:
+                    with open(self._entry_path(key, ".json")) as f:
+                        meta = json.load(f)
+                except (FileNotFoundError, ValueError):
+                    meta = {"function": None, "sources": []}
+                if source is not None and source not in meta["sources"]:
+                    continue
+                name = meta["function"] or ""
+                if function is not None and name != function and not name.endswith("." + function):
+                    continue
+            self._remove(key)
+            removed += 1
+        return removed
+
+    def clear(self):
+        self.invalidate()
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def info(self):
+        """Returns cache statistics as a dict."""
+        entries = self._entries()
+        return {"directory": self.directory, "entries": len(entries), "bytes": sum(size for _, size, _ in entries),
+                "max_bytes": self.max_bytes, "hits": self.hits, "misses": self.misses}
+
+_RESULT_CACHE = None
+_RESULT_CACHE_LOCK = threading.Lock()
+
+@instrumented
+def get_result_cache():
+    """Returns the process-wide result cache.
+
+    It lives in ``$DEFINITIONS_RESULT_CACHE``, defaulting to
+    ``~/.cache/definitions/results``.
+    """
+    global _RESULT_CACHE
+    with _RESULT_CACHE_LOCK:
+        if _RESULT_CACHE is None:
+            directory = os.environ.get("DEFINITIONS_RESULT_CACHE") or os.path.join(
+                os.path.expanduser("~"), ".cache", "definitions", "results")
+            _RESULT_CACHE = ResultCache(directory)
+        return _RESULT_CACHE
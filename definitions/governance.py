@@ -0,0 +1,562 @@
+"""Overrides, KPI storage, model inventory and alerting."""
+
+__all__ = [
+    "calculate_override_rate",
+    "generate_override_matrix",
+    "generate_kpi_panel",
+    "KPIStore",
+    "write_model_inventory_record",
+    "ModelInventoryRegistry",
+    "raise_alerts",
+    "load_alert_rules",
+    "evaluate_alert_rules",
+    "AlertEngine",
+]
+
+from .instrumentation import instrumented
+
+@instrumented
+def calculate_override_rate(num_overrides, total_applications):
+                """Calculates the override rate."""
+                if total_applications == 0:
+                    raise ZeroDivisionError("Cannot divide by zero")
+                return (num_overrides / total_applications) * 100
+
+import numpy as np
+import pandas as pd
+
+@instrumented
+def generate_override_matrix(overrides, grade_levels, reason_codes, rows="grade_before", by=None):
+    """Generates the override matrix (heatmap data).
+
+    Args:
+        overrides (pandas.DataFrame): Override log with ``grade_before``,
+            ``grade_after`` and ``reason_code`` columns.
+        grade_levels (list): Rating grades, ordered from best to worst.
+        reason_codes (list): Override reason codes (matrix columns).
+        rows (str): ``"grade_before"`` for one row per original grade, or
+            ``"notch"`` for one row per grade change (grade_after minus
+            grade_before in ``grade_levels`` positions, positive = downgrade).
+        by (str or list): Optional columns (e.g. approver, period) to break the
+            matrix down by; they are prepended as MultiIndex row levels.
+    Returns:
+        pandas.DataFrame: Override counts. Overrides with grades or reason
+        codes outside ``grade_levels``/``reason_codes`` are ignored.
+    """
+
+    if not grade_levels or not reason_codes:
+        return pd.DataFrame()
+
+    by_cols = None if by is None else ([by] if isinstance(by, str) else list(by))
+    if len(overrides) == 0:
+        overrides = pd.DataFrame(columns=["grade_before", "grade_after", "reason_code"] + (by_cols or []))
+
+    # Counts are taken over unique labels; repeated grade levels or reason codes
+    # then each get the full count, as rows/columns of the matrix always have.
+    grade_index = pd.Index(grade_levels).unique()
+    reason_index = pd.Index(reason_codes).unique()
+    before = grade_index.get_indexer(overrides['grade_before'])
+    reason_ids = reason_index.get_indexer(overrides['reason_code'])
+
+    if rows == "grade_before":
+        row_ids = before
+        row_labels = pd.Index(grade_levels)
+        row_take = grade_index.get_indexer(row_labels)
+    elif rows == "notch":
+        after = grade_index.get_indexer(overrides['grade_after'])
+        n_grades = len(grade_index)
+        row_ids = np.where((before >= 0) & (after >= 0), after - before + n_grades - 1, -1)
+        row_labels = pd.Index(np.arange(-(n_grades - 1), n_grades), name='notch')
+        row_take = np.arange(len(row_labels))
+    else:
+        raise ValueError(f"Unknown rows dimension: {rows}")
+
+    valid = (row_ids >= 0) & (reason_ids >= 0)
+    n_rows, n_cols = len(row_take), len(reason_index)
+    col_take = reason_index.get_indexer(pd.Index(reason_codes))
+
+    if by is None:
+        flat = row_ids[valid] * n_cols + reason_ids[valid]
+        counts = np.bincount(flat, minlength=n_rows * n_cols).reshape(n_rows, n_cols)
+        return pd.DataFrame(counts[np.ix_(row_take, col_take)], index=row_labels, columns=reason_codes)
+
+    keys = overrides[by_cols]
+    has_key = ~keys.isna().any(axis=1).to_numpy()
+    group_ids = np.full(len(overrides), -1, dtype=np.intp)
+    codes, groups = pd.MultiIndex.from_frame(keys[has_key]).factorize(sort=True)
+    group_ids[has_key] = codes
+    valid &= group_ids >= 0
+
+    n_groups = len(groups)
+    flat = (group_ids[valid] * n_rows + row_ids[valid]) * n_cols + reason_ids[valid]
+    counts = np.bincount(flat, minlength=n_groups * n_rows * n_cols).reshape(n_groups, n_rows, n_cols)
+    counts = counts[:, row_take][:, :, col_take].reshape(n_groups * len(row_labels), len(col_take))
+    index = pd.MultiIndex.from_tuples([(*group, row) for group in groups for row in row_labels],
+                                      names=by_cols + [row_labels.name or 'grade_before'])
+    return pd.DataFrame(counts, index=index, columns=reason_codes)
+
+@instrumented
+def generate_kpi_panel(num_overrides, time_since_last_validation, next_review_due, open_remediation_actions):
+    """Generates the tabular KPI panel data."""
+
+    kpi_panel_data = {
+        "num_overrides": num_overrides,
+        "time_since_last_validation": time_since_last_validation,
+        "next_review_due": next_review_due,
+        "open_remediation_actions": open_remediation_actions,
+    }
+
+    return kpi_panel_data
+
+import json
+import os
+import threading
+import uuid
+from datetime import datetime, timezone
+import pandas as pd
+
+class KPIStore:
+    """Append-only KPI store with Parquet partitions by KPI, model and quarter.
+
+    Layout under ``root`` (``outputs/rmm_data/`` by default)::
+
+        <kpi>/model_id=<id>/quarter=<YYYYQn>/part-<UTC timestamp>-<random>.parquet
+        _index.jsonl
+
+    Every append writes a new timestamped part file and adds one JSON line to
+    the index with a single ``O_APPEND`` write, and existing files are never
+    rewritten, so several stores (or processes) can append to one directory.
+    Queries pick up lines appended by others, filter partitions through the
+    index (KPI, model and quarter range) and read only the requested columns,
+    so history is never rescanned. Requires ``pyarrow``.
+    """
+
+    INDEX_NAME = "_index.jsonl"
+
+    def __init__(self, root=os.path.join("outputs", "rmm_data")):
+        self.root = root
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+        self._index = []
+        self._offset = 0
+        self._refresh()
+
+    @staticmethod
+    def _check_name(label, value):
+        value = str(value)
+        if not value or os.sep in value or "/" in value or value.startswith("."):
+            raise ValueError(f"Invalid {label}: {value!r}")
+        return value
+
+    def _refresh(self):
+        """Reads index lines appended since the last refresh, by this or any other store."""
+        with self._lock:
+            try:
+                with open(os.path.join(self.root, self.INDEX_NAME), "rb") as f:
+                    f.seek(self._offset)
+                    tail = f.read()
+            except FileNotFoundError:
+                return
+            complete = tail[:tail.rfind(b"\n") + 1]  # a line still being written is read next time
+            self._index.extend(json.loads(line) for line in complete.splitlines() if line.strip())
+            self._offset += len(complete)
+
+    def _append_index(self, entry):
+        line = (json.dumps(entry) + "\n").encode()
+        fd = os.open(os.path.join(self.root, self.INDEX_NAME), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line)
+        finally:
+            os.close(fd)
+
+    @instrumented
+    def append(self, kpi, data, model_id, quarter):
+        """Appends a KPI table (DataFrame or dict of scalars) for one model and quarter.
+
+        Returns:
+            str: Path of the written Parquet part file.
+        """
+        kpi = self._check_name("kpi", kpi)
+        model_id = self._check_name("model_id", model_id)
+        quarter = self._check_name("quarter", quarter)
+        frame = data if isinstance(data, pd.DataFrame) else pd.DataFrame([data])
+        written_at = datetime.now(timezone.utc)
+        relative = os.path.join(kpi, f"model_id={model_id}", f"quarter={quarter}",
+                                f"part-{written_at.strftime('%Y%m%dT%H%M%S%fZ')}-{uuid.uuid4().hex[:8]}.parquet")
+        path = os.path.join(self.root, relative)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        frame.to_parquet(path, index=False)
+        self._append_index({"kpi": kpi, "model_id": model_id, "quarter": quarter, "path": relative,
+                            "rows": len(frame), "columns": [str(c) for c in frame.columns],
+                            "written_at": written_at.isoformat()})
+        self._refresh()
+        return path
+
+    def partitions(self, kpi=None, model_id=None, start=None, end=None):
+        """Returns index entries matching the KPI, model(s) and inclusive quarter range."""
+        model_ids = None if model_id is None else {str(m) for m in ([model_id] if isinstance(model_id, str) else model_id)}
+        self._refresh()
+        return [entry for entry in self._index
+                if (kpi is None or entry["kpi"] == kpi)
+                and (model_ids is None or entry["model_id"] in model_ids)
+                and (start is None or entry["quarter"] >= str(start))
+                and (end is None or entry["quarter"] <= str(end))]
+
+    @instrumented
+    def query(self, kpi, model_id=None, start=None, end=None, columns=None):
+        """Reads a KPI's matching partitions, projecting to ``columns`` when given.
+
+        ``model_id`` and ``quarter`` columns are added from the partition keys.
+        """
+        frames = []
+        for entry in self.partitions(kpi, model_id, start, end):
+            wanted = None if columns is None else [c for c in columns if c in entry["columns"]]
+            frame = pd.read_parquet(os.path.join(self.root, entry["path"]), columns=wanted)
+            for key in ("quarter", "model_id"):
+                if key not in frame.columns:
+                    frame.insert(0, key, entry[key])
+            frames.append(frame)
+        if not frames:
+            return pd.DataFrame(columns=["model_id", "quarter"] + list(columns or []))
+        return pd.concat(frames, ignore_index=True)
+
+import bisect
+import glob
+import itertools
+import os
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+import yaml
+
+# libyaml-backed C implementations when PyYAML was built with them.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+def _yaml_safe(value):
+    """Converts NumPy/pandas scalars, arrays and tuples to the plain types the safe dumper writes."""
+    if isinstance(value, dict):
+        return {_yaml_safe(k): _yaml_safe(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple, set, np.ndarray)):
+        return [_yaml_safe(v) for v in value]
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, pd.Timestamp):
+        return value.to_pydatetime()
+    return value
+
+@instrumented
+def write_model_inventory_record(data, output_path):
+    """Writes model inventory record to a .yaml file."""
+    try:
+        with open(output_path, "w") as f:
+            yaml.dump(_yaml_safe(data), f, Dumper=_YAML_DUMPER)
+    except Exception as e:
+        raise Exception(f"Error writing to YAML file: {e}")
+
+def _as_date(value):
+    if value is None or isinstance(value, date) and not isinstance(value, datetime):
+        return value
+    if isinstance(value, datetime):
+        return value.date()
+    return date.fromisoformat(str(value))
+
+class ModelInventoryRegistry:
+    """In-memory model inventory with indexed governance lookups.
+
+    Records are dicts keyed by ``model_id``. Exact-match indexes on ``tier``
+    and ``owner``, plus a sorted index on ``next_validation_date``, answer
+    queries without scanning records or parsing files. Bulk YAML load/save
+    use the libyaml C safe loader/dumper when available (NumPy scalars and
+    tuples are written as plain numbers and lists), and single-record files
+    written by ``write_model_inventory_record`` can still be loaded and
+    exported.
+    """
+
+    ID_FIELD = "model_id"
+    INDEXED_FIELDS = ("tier", "owner")
+    DATE_FIELD = "next_validation_date"
+
+    def __init__(self, records=None):
+        self._records = {}
+        self._positions = {}  # model_id -> insertion sequence, to return matches in record order
+        self._sequence = itertools.count()
+        self._indexes = {field: defaultdict(set) for field in self.INDEXED_FIELDS}
+        self._by_date = []  # sorted (date, model_id)
+        if records:
+            self.upsert_many(records)
+
+    def __len__(self):
+        return len(self._records)
+
+    def __contains__(self, model_id):
+        return model_id in self._records
+
+    def __iter__(self):
+        return iter(self._records.values())
+
+    def _unindex(self, record):
+        model_id = record[self.ID_FIELD]
+        for field in self.INDEXED_FIELDS:
+            if record.get(field) is not None:
+                self._indexes[field][record[field]].discard(model_id)
+        due = _as_date(record.get(self.DATE_FIELD))
+        if due is not None:
+            i = bisect.bisect_left(self._by_date, (due, model_id))
+            if i < len(self._by_date) and self._by_date[i] == (due, model_id):
+                del self._by_date[i]
+
+    def upsert(self, record):
+        """Inserts or replaces a record, keyed by its ``model_id``."""
+        if self.ID_FIELD not in record:
+            raise ValueError(f"Inventory record is missing '{self.ID_FIELD}'.")
+        record = dict(record)
+        model_id = record[self.ID_FIELD]
+        due = _as_date(record.get(self.DATE_FIELD))
+        if model_id in self._records:
+            self._unindex(self._records[model_id])
+        else:
+            self._positions[model_id] = next(self._sequence)
+        self._records[model_id] = record
+        for field in self.INDEXED_FIELDS:
+            if record.get(field) is not None:
+                self._indexes[field][record[field]].add(model_id)
+        if due is not None:
+            bisect.insort(self._by_date, (due, model_id))
+        return record
+
+    @instrumented
+    def upsert_many(self, records):
+        """Inserts or replaces many records; returns the number processed."""
+        count = 0
+        for record in records:
+            self.upsert(record)
+            count += 1
+        return count
+
+    def remove(self, model_id):
+        record = self._records.pop(model_id)
+        del self._positions[model_id]
+        self._unindex(record)
+        return record
+
+    def get(self, model_id, default=None):
+        return self._records.get(model_id, default)
+
+    def find(self, **criteria):
+        """Returns records matching every indexed field given, e.g. ``find(tier=1, owner="CRA")``."""
+        unknown = set(criteria) - set(self.INDEXED_FIELDS)
+        if unknown:
+            raise ValueError(f"Cannot query on non-indexed fields: {sorted(unknown)}")
+        if not criteria:
+            return list(self._records.values())
+        matches = sorted((self._indexes[field].get(value, set()) for field, value in criteria.items()), key=len)
+        ids = matches[0].intersection(*matches[1:])
+        return [self._records[model_id] for model_id in sorted(ids, key=self._positions.__getitem__)]
+
+    def due_between(self, start=None, end=None):
+        """Returns records whose next validation date falls in [start, end], earliest first."""
+        # (d,) sorts before every (d, model_id), so these bisect on the date alone.
+        lo = 0 if start is None else bisect.bisect_left(self._by_date, (_as_date(start),))
+        hi = len(self._by_date) if end is None else bisect.bisect_left(self._by_date, (_as_date(end) + timedelta(days=1),))
+        return [self._records[model_id] for _, model_id in self._by_date[lo:hi]]
+
+    def due_before(self, end):
+        """Returns records due for validation on or before ``end``."""
+        return self.due_between(None, end)
+
+    @instrumented
+    def save(self, output_path):
+        """Writes every record to one YAML file as a list."""
+        try:
+            with open(output_path, "w") as f:
+                yaml.dump(_yaml_safe(list(self._records.values())), f, Dumper=_YAML_DUMPER, sort_keys=False)
+        except Exception as e:
+            raise Exception(f"Error writing to YAML file: {e}")
+
+    @classmethod
+    @instrumented
+    def load(cls, path):
+        """Loads a bulk YAML list, a single-record YAML file, or a directory of record files."""
+        paths = sorted(glob.glob(os.path.join(path, "*.y*ml"))) if os.path.isdir(path) else [path]
+        registry = cls()
+        for file_path in paths:
+            with open(file_path) as f:
+                payload = yaml.load(f, Loader=_YAML_LOADER)
+            if payload is None:
+                continue
+            registry.upsert_many(payload if isinstance(payload, list) else [payload])
+        return registry
+
+    def export_records(self, output_dir):
+        """Writes one ``<model_id>.yaml`` file per record with write_model_inventory_record."""
+        os.makedirs(output_dir, exist_ok=True)
+        paths = []
+        for model_id, record in self._records.items():
+            output_path = os.path.join(output_dir, f"{model_id}.yaml")
+            write_model_inventory_record(record, output_path)
+            paths.append(output_path)
+        return paths
+
+import logging
+
+@instrumented
+def raise_alerts(auc_drop, psi, override_rate):
+    """Raises Python logging warnings based on defined thresholds."""
+
+    if auc_drop > 0.1:
+        logging.warning(f"AUC drop is high: {auc_drop}")
+    if psi > 0.1:
+        logging.warning(f"PSI is high: {psi}")
+    if override_rate > 0.1:
+        logging.warning(f"Override rate is high: {override_rate}")
+
+import logging
+from datetime import datetime, timedelta, timezone
+import numpy as np
+import pandas as pd
+import yaml
+
+_SEVERITY_LEVELS = {"info": logging.INFO, "warning": logging.WARNING, "error": logging.ERROR,
+                    "critical": logging.CRITICAL}
+_RULE_OPS = (">", ">=", "<", "<=")
+
+@instrumented
+def load_alert_rules(config_path):
+    """Loads alert rules from a YAML or JSON config file.
+
+    The file holds a list of rules, or a mapping with a ``rules`` list. Each
+    rule has ``name``, ``metric``, ``op`` (one of >, >=, <, <=) and either a
+    ``threshold`` with an optional ``severity``, or ``bands``: a list of
+    {threshold, severity} pairs, e.g. an amber and a red Gini limit. Rules
+    with ``type: drop`` compare the fall in ``metric`` against the model's
+    first period (``reference: baseline``, default) or the previous period
+    (``reference: previous``), e.g. the 10pp AUC drop.
+    """
+    with open(config_path) as f:
+        payload = yaml.safe_load(f) or []
+    return payload.get("rules", []) if isinstance(payload, dict) else payload
+
+def _expand_rules(rules):
+    """Flattens rule definitions (including bands) into a validated DataFrame."""
+    rows = []
+    for rule in rules:
+        for key in ("name", "metric", "op"):
+            if key not in rule:
+                raise ValueError(f"Alert rule is missing '{key}': {rule}")
+        if rule["op"] not in _RULE_OPS:
+            raise ValueError(f"Unsupported operator {rule['op']!r} in rule {rule['name']!r}")
+        kind = rule.get("type", "level")
+        if kind not in ("level", "drop"):
+            raise ValueError(f"Unsupported rule type {kind!r} in rule {rule['name']!r}")
+        bands = rule.get("bands") or [{"threshold": rule["threshold"], "severity": rule.get("severity", "warning")}]
+        for band in bands:
+            severity = band.get("severity", "warning")
+            if severity not in _SEVERITY_LEVELS:
+                raise ValueError(f"Unknown severity {severity!r} in rule {rule['name']!r}")
+            rows.append({"rule": rule["name"], "source_metric": rule["metric"], "op": rule["op"],
+                         "threshold": float(band["threshold"]), "severity": severity,
+                         "metric": f"{rule['metric']}_drop" if kind == "drop" else rule["metric"],
+                         "kind": kind, "reference": rule.get("reference", "baseline")})
+    return pd.DataFrame(rows, columns=["rule", "source_metric", "op", "threshold", "severity",
+                                       "metric", "kind", "reference"])
+
+def _long_kpis(kpis):
+    if "metric" in kpis.columns and "value" in kpis.columns:
+        return kpis[["model_id", "period", "metric", "value"]]
+    return kpis.melt(id_vars=["model_id", "period"], var_name="metric", value_name="value")
+
+@instrumented
+def evaluate_alert_rules(kpis, rules):
+    """Evaluates threshold rules over a whole KPI table in one vectorized pass.
+
+    Args:
+        kpis (pandas.DataFrame): Long table with ``model_id``, ``period``,
+            ``metric`` and ``value`` columns, or a wide table with one column
+            per metric. Periods must sort chronologically (e.g. ``2024Q1``).
+        rules (list): Rule dicts as returned by ``load_alert_rules``.
+    Returns:
+        pandas.DataFrame: One row per breach (model, period, rule), keeping
+        only the most severe band.
+    """
+    rule_table = _expand_rules(rules)
+    columns = ["model_id", "period", "rule", "metric", "value", "op", "threshold", "severity"]
+    long = _long_kpis(kpis).sort_values(["model_id", "metric", "period"], kind="mergesort")
+    if rule_table.empty or long.empty:
+        return pd.DataFrame(columns=columns)
+
+    derived = [long]
+    for reference, group in rule_table[rule_table["kind"] == "drop"].groupby("reference"):
+        base = long[long["metric"].isin(group["source_metric"].unique())]
+        by_series = base.groupby(["model_id", "metric"], sort=False)["value"]
+        ref = by_series.transform("first") if reference == "baseline" else by_series.shift(1)
+        derived.append(base.assign(metric=base["metric"] + f"_drop_{reference}", value=ref - base["value"]))
+    long = pd.concat(derived, ignore_index=True)
+
+    rule_table = rule_table.assign(metric=np.where(rule_table["kind"] == "drop",
+                                                   rule_table["metric"] + "_" + rule_table["reference"],
+                                                   rule_table["metric"]))
+    merged = long.merge(rule_table, on="metric", how="inner")
+    value = merged["value"].to_numpy(dtype=float)
+    threshold = merged["threshold"].to_numpy(dtype=float)
+    op = merged["op"].to_numpy()
+    breached = (((op == ">") & (value > threshold)) | ((op == ">=") & (value >= threshold))
+                | ((op == "<") & (value < threshold)) | ((op == "<=") & (value <= threshold)))
+    hits = merged[breached].assign(metric=lambda df: df["source_metric"],
+                                   _rank=lambda df: df["severity"].map(_SEVERITY_LEVELS))
+    hits = hits.sort_values("_rank", ascending=False, kind="mergesort")
+    hits = hits.drop_duplicates(["model_id", "period", "rule"])
+    return hits.sort_values(["model_id", "period", "rule"], kind="mergesort")[columns].reset_index(drop=True)
+
+class AlertEngine:
+    """Config-driven alerting with de-duplication and rate limiting.
+
+    Only the newest breaching period of each (rule, model) is considered;
+    older breaches it supersedes are not alerted separately. A breach (rule,
+    model, period) is emitted at most once over the engine's lifetime.
+    Repeated breaches of the same rule for the same model are held back until
+    ``min_interval`` (a timedelta or seconds) has passed since the last
+    emitted alert, and a held-back breach is emitted by the first run after
+    that. Emitted alerts are logged at their severity's level and returned as
+    structured records.
+    """
+
+    def __init__(self, rules, min_interval=None, logger=None):
+        _expand_rules(rules)
+        self.rules = list(rules)
+        if min_interval is not None and not isinstance(min_interval, timedelta):
+            min_interval = timedelta(seconds=min_interval)
+        self.min_interval = min_interval
+        self.logger = logger or logging.getLogger(__name__)
+        self._seen = set()
+        self._last_emitted = {}
+
+    @classmethod
+    def from_config(cls, config_path, **kwargs):
+        """Builds an engine from a rules file (see ``load_alert_rules``)."""
+        return cls(load_alert_rules(config_path), **kwargs)
+
+    @instrumented
+    def run(self, kpis, now=None):
+        """Evaluates ``kpis`` and returns the list of newly emitted alert records."""
+        now = now or datetime.now(timezone.utc)
+        alerts = []
+        breaches = evaluate_alert_rules(kpis, self.rules)
+        # Breaches are sorted by period within each model, so the last one per (rule, model) is the newest.
+        latest = breaches.drop_duplicates(["rule", "model_id"], keep="last").sort_index()
+        for row in latest.itertuples(index=False):
+            key = (row.rule, row.model_id, row.period)
+            if key in self._seen:
+                continue
+            last = self._last_emitted.get((row.rule, row.model_id))
+            if self.min_interval is not None and last is not None and now - last < self.min_interval:
+                continue
+            self._seen.add(key)
+            self._last_emitted[(row.rule, row.model_id)] = now
+            message = (f"{row.rule}: {row.metric} for {row.model_id} in {row.period} is {row.value:.4f} "
+                       f"({row.op} {row.threshold})")
+            self.logger.log(_SEVERITY_LEVELS[row.severity], message)
+            alerts.append({"rule": row.rule, "model_id": row.model_id, "period": row.period,
+                           "metric": row.metric, "value": float(row.value), "op": row.op,
+                           "threshold": float(row.threshold), "severity": row.severity,
+                           "message": message, "raised_at": now.isoformat()})
+        return alerts
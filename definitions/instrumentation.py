@@ -0,0 +1,241 @@
+"""Opt-in call metrics (time, rows, peak memory) for the public functions of the package."""
+
+__all__ = [
+    "InstrumentationRegistry",
+    "get_instrumentation",
+    "enable_instrumentation",
+    "disable_instrumentation",
+    "instrumented",
+]
+
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+class InstrumentationRegistry:
+    """Per-function call metrics collected by ``instrumented`` functions.
+
+    Disabled by default: an instrumented call then costs one flag check.
+    Enable with ``enable_instrumentation()`` or by setting the environment
+    variable ``DEFINITIONS_INSTRUMENT=1`` (``=memory`` also tracks peak
+    memory with ``tracemalloc``, which slows NumPy-heavy code noticeably).
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.track_memory = False
+        self.started_at = None
+        self._stats = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def enable(self, memory=False):
+        self.track_memory = memory
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self.started_at = self.started_at or datetime.now(timezone.utc)
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+        if self.track_memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self.track_memory = False
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+        self.started_at = datetime.now(timezone.utc) if self.enabled else None
+
+    def _memory_stack(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _enter(self):
+        if not (self.track_memory and tracemalloc.is_tracing()):
+            return None
+        # tracemalloc has a single peak counter: fold the caller's peak so far
+        # into its stack frame before resetting it for this call.
+        stack = self._memory_stack()
+        current, peak = tracemalloc.get_traced_memory()
+        if stack:
+            stack[-1][1] = max(stack[-1][1], peak)
+        tracemalloc.reset_peak()
+        stack.append([current, current])
+        return current
+
+    def _exit(self, start):
+        if start is None:
+            return None
+        stack = self._memory_stack()
+        _, frame_peak = stack.pop()
+        peak = max(frame_peak, tracemalloc.get_traced_memory()[1])
+        if stack:
+            stack[-1][1] = max(stack[-1][1], peak)
+        return peak - start
+
+    def record(self, name, seconds, rows=None, peak_bytes=None, error=False):
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = self._stats[name] = {"calls": 0, "errors": 0, "seconds_total": 0.0, "seconds_max": 0.0,
+                                             "rows_total": 0, "peak_bytes_max": None}
+            stats["calls"] += 1
+            stats["errors"] += int(error)
+            stats["seconds_total"] += seconds
+            stats["seconds_max"] = max(stats["seconds_max"], seconds)
+            if rows is not None:
+                stats["rows_total"] += int(rows)
+            if peak_bytes is not None:
+                stats["peak_bytes_max"] = max(stats["peak_bytes_max"] or 0, int(peak_bytes))
+
+    def snapshot(self):
+        """Returns a copy of the per-function metrics, keyed by function name."""
+        with self._lock:
+            return {name: dict(stats) for name, stats in sorted(self._stats.items())}
+
+    def to_dict(self):
+        return {"started_at": self.started_at.isoformat() if self.started_at else None,
+                "exported_at": datetime.now(timezone.utc).isoformat(),
+                "memory_tracked": self.track_memory, "functions": self.snapshot()}
+
+    def to_json(self, path=None):
+        """Returns the run's metrics as JSON, also writing them to ``path`` when given."""
+        text = json.dumps(self.to_dict(), indent=2)
+        if path is not None:
+            with open(path, "w") as f:
+                f.write(text)
+        return text
+
+    def to_prometheus(self, prefix="definitions"):
+        """Returns the metrics in the Prometheus text exposition format."""
+        metrics = [("calls_total", "counter", "calls", "Number of calls."),
+                   ("errors_total", "counter", "errors", "Number of calls that raised."),
+                   ("seconds_total", "counter", "seconds_total", "Total wall time in seconds."),
+                   ("seconds_max", "gauge", "seconds_max", "Slowest call in seconds."),
+                   ("rows_total", "counter", "rows_total", "Rows processed."),
+                   ("peak_memory_bytes", "gauge", "peak_bytes_max", "Largest traced allocation peak of a call.")]
+        stats = self.snapshot()
+        lines = []
+        for suffix, kind, key, help_text in metrics:
+            samples = [(name, values[key]) for name, values in stats.items() if values[key] is not None]
+            if not samples:
+                continue
+            lines += [f"# HELP {prefix}_{suffix} {help_text}", f"# TYPE {prefix}_{suffix} {kind}"]
+            lines += [f'{prefix}_{suffix}{{function="{name}"}} {value}' for name, value in samples]
+        return "\n".join(lines) + "\n"
+
+_INSTRUMENTATION = InstrumentationRegistry()
+
+def get_instrumentation():
+    """Returns the process-wide instrumentation registry."""
+    return _INSTRUMENTATION
+
+def enable_instrumentation(memory=False):
+    """Starts recording metrics for instrumented functions (and peak memory if ``memory``)."""
+    _INSTRUMENTATION.enable(memory)
+    return _INSTRUMENTATION
+
+def disable_instrumentation():
+    _INSTRUMENTATION.disable()
+
+def _count_rows(value):
+    if hasattr(value, "shape") and len(getattr(value, "shape", ())) > 0:
+        return value.shape[0]
+    return None
+
+def _call_rows(signature, rows, args, kwargs):
+    if callable(rows):
+        return rows(*args, **kwargs)
+    if rows is not None:
+        bound = signature.bind_partial(*args, **kwargs).arguments
+        return _count_rows(bound.get(rows))
+    for value in list(args) + list(kwargs.values()):
+        count = _count_rows(value)
+        if count is not None:
+            return count
+    return None
+
+def instrumented(func=None, *, name=None, rows=None):
+    """Records wall time, rows, peak memory and calls of ``func`` while instrumentation is enabled.
+
+    Args:
+        name (str): Metric name; defaults to the function's qualified name.
+        rows (str or callable): Argument whose length is the row count,
+            ``"return"`` to count the rows of the result, or a callable
+            taking the call's arguments. By default the first
+            argument with a ``shape`` (DataFrame, Series, ndarray) is used.
+            Generator functions are timed over their own ``next()`` calls
+            only (not the consumer's work between chunks) and count the rows
+            of every yielded chunk.
+    """
+    if func is None:
+        return functools.partial(instrumented, name=name, rows=rows)
+    metric = name or func.__qualname__
+    signature = inspect.signature(func)
+    registry = _INSTRUMENTATION
+
+    if inspect.isgeneratorfunction(func):
+        @functools.wraps(func)
+        def generator_wrapper(*args, **kwargs):
+            if not registry.enabled:
+                return (yield from func(*args, **kwargs))
+            start_memory = registry._enter()
+            seconds, count, error = 0.0, 0, False
+            # Only the generator's own next() calls are timed: the clock is
+            # paused at each yield so the consumer's work is not charged here.
+            start = time.perf_counter()
+            generator = func(*args, **kwargs)
+            try:
+                while True:
+                    try:
+                        chunk = next(generator)
+                    except StopIteration as stop:
+                        return stop.value
+                    finally:
+                        seconds += time.perf_counter() - start
+                    count += _count_rows(chunk) or 0
+                    yield chunk
+                    start = time.perf_counter()
+            except GeneratorExit:
+                raise
+            except BaseException:
+                error = True
+                raise
+            finally:
+                generator.close()
+                registry.record(metric, seconds, count, registry._exit(start_memory), error)
+        return generator_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not registry.enabled:
+            return func(*args, **kwargs)
+        start_memory = registry._enter()
+        start = time.perf_counter()
+        result, error = None, False
+        try:
+            result = func(*args, **kwargs)
+            return result
+        except BaseException:
+            error = True
+            raise
+        finally:
+            seconds = time.perf_counter() - start
+            peak = registry._exit(start_memory)
+            try:
+                n_rows = _count_rows(result) if rows == "return" else _call_rows(signature, rows, args, kwargs)
+            except Exception:
+                n_rows = None
+            registry.record(metric, seconds, n_rows, peak, error)
+    return wrapper
+
+if os.environ.get("DEFINITIONS_INSTRUMENT", "").strip().lower() not in ("", "0", "false", "no", "off"):
+    enable_instrumentation(memory=os.environ["DEFINITIONS_INSTRUMENT"].strip().lower() == "memory")
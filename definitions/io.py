@@ -0,0 +1,677 @@
+"""Model and data I/O: pickles, memory-mapped artifacts, chunked CSV reads, scoring and prediction caching."""
+
+__all__ = [
+    "load_model",
+    "save_model_mmap",
+    "load_model_mmap",
+    "ArtifactCache",
+    "get_artifact_cache",
+    "load_model_cached",
+    "load_data",
+    "load_data_chunks",
+    "apply_preprocessing",
+    "iter_scores",
+    "score_to_disk",
+    "model_fingerprint",
+    "dataset_fingerprint",
+    "PredictionStore",
+]
+
+from .instrumentation import instrumented
+
+import pickle
+import os
+
+@instrumented
+def load_model(model_path):
+    """Loads a pre-trained model from a .pkl file."""
+    if model_path is None:
+        raise TypeError("Model path cannot be None")
+    try:
+        with open(model_path, "rb") as f:
+            model = pickle.load(f)
+        return model
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Model file not found at {model_path}")
+    except PermissionError:
+        raise PermissionError(f"Insufficient permissions to read model file at {model_path}")
+    except Exception as e:
+        raise Exception(f"Error loading model from {model_path}: {e}")
+
+import hashlib
+import threading
+import warnings
+from collections import OrderedDict
+import numpy as np
+
+_MMAP_PICKLE_NAME = "model.pkl"
+
+def _copies_arrays_on_load(obj):
+    """True for objects whose ``__setstate__`` copies their arrays (scikit-learn's Cython ``Tree``)."""
+    cls = type(obj)
+    return cls.__name__ == "Tree" and cls.__module__.startswith("sklearn.tree")
+
+class _ArrayExternalizingPickler(pickle.Pickler):
+    """Pickler that writes large NumPy arrays to standalone .npy files."""
+
+    def __init__(self, file, array_dir, min_array_bytes):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.array_dir = array_dir
+        self.min_array_bytes = min_array_bytes
+        self._saved = {}
+        self.inline_objects = 0
+
+    def reducer_override(self, obj):
+        if _copies_arrays_on_load(obj):
+            # Mapping these arrays would gain nothing, so keep the object in the pickle.
+            self.inline_objects += 1
+            return pickle.loads, (pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL),)
+        return NotImplemented
+
+    def persistent_id(self, obj):
+        if not isinstance(obj, np.ndarray) or obj.dtype.hasobject or obj.nbytes < self.min_array_bytes:
+            return None
+        key = id(obj)
+        if key not in self._saved:
+            name = f"arr_{len(self._saved):05d}.npy"
+            np.save(os.path.join(self.array_dir, name), obj, allow_pickle=False)
+            # Keep a reference so the id cannot be reused while pickling.
+            self._saved[key] = (name, obj)
+        return ("ndarray", self._saved[key][0])
+
+class _ArrayMappingUnpickler(pickle.Unpickler):
+    """Unpickler that memory-maps arrays written by _ArrayExternalizingPickler."""
+
+    def __init__(self, file, array_dir, mmap_mode):
+        super().__init__(file)
+        self.array_dir = array_dir
+        self.mmap_mode = mmap_mode
+
+    def persistent_load(self, pid):
+        kind, name = pid
+        if kind != "ndarray":
+            raise pickle.UnpicklingError(f"Unsupported persistent id: {pid}")
+        return np.load(os.path.join(self.array_dir, name), mmap_mode=self.mmap_mode, allow_pickle=False)
+
+@instrumented
+def save_model_mmap(model, output_dir, min_array_bytes=1 << 16):
+    """Saves a model as a directory of a pickle plus memory-mappable .npy arrays.
+
+    NumPy arrays of at least ``min_array_bytes`` are stored as separate .npy
+    files so that :func:`load_model_mmap` can map them read-only; every worker
+    process loading the same directory then shares the same physical pages.
+
+    The format is meant for linear and array-backed models: only arrays the
+    loaded model keeps as plain ndarray attributes are shared (e.g. the
+    coefficients of linear models, scorecard tables, calibration grids).
+    Sharing scikit-learn tree ensembles (GradientBoosting, RandomForest,
+    such as ``rating_gbt_v1``) is out of scope: each tree copies its node
+    arrays into private memory on unpickling, so trees are kept inside the
+    pickle and a ``UserWarning`` says they will not be shared. Load such
+    models once per process with ``load_model_cached`` instead.
+    """
+    if output_dir is None:
+        raise TypeError("Output directory cannot be None")
+    os.makedirs(output_dir, exist_ok=True)
+    with open(os.path.join(output_dir, _MMAP_PICKLE_NAME), "wb") as f:
+        pickler = _ArrayExternalizingPickler(f, output_dir, min_array_bytes)
+        pickler.dump(model)
+    if pickler.inline_objects:
+        warnings.warn(f"{pickler.inline_objects} scikit-learn trees copy their node arrays when loaded; "
+                      "they are stored in the pickle and will not be shared between processes.",
+                      UserWarning, stacklevel=2)
+    return output_dir
+
+@instrumented
+def load_model_mmap(model_dir, mmap_mode="r"):
+    """Loads a model saved with save_model_mmap, memory-mapping its large arrays."""
+    if model_dir is None:
+        raise TypeError("Model path cannot be None")
+    pickle_path = os.path.join(model_dir, _MMAP_PICKLE_NAME)
+    if not os.path.isfile(pickle_path):
+        raise FileNotFoundError(f"Memory-mapped model not found at {model_dir}")
+    with open(pickle_path, "rb") as f:
+        return _ArrayMappingUnpickler(f, model_dir, mmap_mode).load()
+
+class ArtifactCache:
+    """Thread-safe LRU cache of loaded artifacts keyed by path, mtime and content hash.
+
+    The content hash is only recomputed when a file's mtime or size changes,
+    so repeated loads of an unchanged artifact cost a single ``os.stat``.
+    Identical files under different paths share one cache entry. Entries are
+    evicted least-recently-used first once their total on-disk size exceeds
+    ``max_bytes``.
+    """
+
+    def __init__(self, max_bytes=2 * 1024 ** 3):
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be positive.")
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # digest -> (artifact, size)
+        self._digests = {}  # realpath -> (mtime_ns, size, digest)
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, model_path):
+        real = os.path.realpath(model_path)
+        with self._lock:
+            known = self._digests.get(real)
+            return known is not None and known[2] in self._entries
+
+    @staticmethod
+    def _signature(real):
+        """Returns (mtime_ns, size) for a pickle file or a memory-mapped model directory."""
+        if os.path.isdir(real):
+            stats = [os.stat(os.path.join(real, name)) for name in sorted(os.listdir(real))]
+            return max(st.st_mtime_ns for st in stats), sum(st.st_size for st in stats)
+        st = os.stat(real)
+        return st.st_mtime_ns, st.st_size
+
+    @staticmethod
+    def _digest(real):
+        h = hashlib.sha256()
+        if os.path.isdir(real):
+            for name in sorted(os.listdir(real)):
+                h.update(name.encode())
+                with open(os.path.join(real, name), "rb") as f:
+                    for block in iter(lambda: f.read(1 << 20), b""):
+                        h.update(block)
+            return h.hexdigest(), None
+        with open(real, "rb") as f:
+            payload = f.read()
+        h.update(payload)
+        return h.hexdigest(), payload
+
+    @instrumented
+    def get(self, model_path):
+        """Returns the artifact at ``model_path``, loading it on a cache miss."""
+        real = os.path.realpath(model_path)
+        mtime_ns, size = self._signature(real)
+        with self._lock:
+            known = self._digests.get(real)
+            if known is not None and known[:2] == (mtime_ns, size) and known[2] in self._entries:
+                self._entries.move_to_end(known[2])
+                self.hits += 1
+                return self._entries[known[2]][0]
+
+        digest, payload = self._digest(real)
+        with self._lock:
+            self._digests[real] = (mtime_ns, size, digest)
+            if digest in self._entries:
+                self._entries.move_to_end(digest)
+                self.hits += 1
+                return self._entries[digest][0]
+            self.misses += 1
+
+        if payload is None:
+            artifact = load_model_mmap(real)
+            # Mapped arrays live in the page cache, so only the pickle counts.
+            size = os.path.getsize(os.path.join(real, _MMAP_PICKLE_NAME))
+        else:
+            artifact = pickle.loads(payload)
+        self._put(digest, artifact, size)
+        return artifact
+
+    def _put(self, digest, artifact, size):
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if digest in self._entries:
+                return
+            self._entries[digest] = (artifact, size)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes and len(self._entries) > 1:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+
+    def invalidate(self, model_path):
+        """Drops the entry for ``model_path`` if present."""
+        real = os.path.realpath(model_path)
+        with self._lock:
+            known = self._digests.pop(real, None)
+            if known is not None and known[2] in self._entries:
+                _, size = self._entries.pop(known[2])
+                self.current_bytes -= size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._digests.clear()
+            self.current_bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def info(self):
+        """Returns cache statistics as a dict."""
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self.current_bytes,
+                    "max_bytes": self.max_bytes, "hits": self.hits, "misses": self.misses}
+
+_ARTIFACT_CACHE = ArtifactCache()
+
+@instrumented
+def get_artifact_cache():
+    """Returns the process-wide artifact cache used by load_model_cached."""
+    return _ARTIFACT_CACHE
+
+@instrumented
+def load_model_cached(model_path, cache=None):
+    """Loads a .pkl model (or a save_model_mmap directory) through an LRU artifact cache.
+
+    Args:
+        model_path (str): Path to the .pkl file or memory-mapped model directory.
+        cache (ArtifactCache): Cache to use; defaults to the process-wide cache.
+    Returns:
+        object: The loaded artifact, shared between callers.
+    """
+    if model_path is None:
+        raise TypeError("Model path cannot be None")
+    cache = _ARTIFACT_CACHE if cache is None else cache
+    try:
+        return cache.get(model_path)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Model file not found at {model_path}")
+    except PermissionError:
+        raise PermissionError(f"Insufficient permissions to read model file at {model_path}")
+    except Exception as e:
+        raise Exception(f"Error loading model from {model_path}: {e}")
+
+import pandas as pd
+
+@instrumented(rows="return")
+def load_data(data_path):
+    """Loads data from a .csv file using pandas."""
+    try:
+        df = pd.read_csv(data_path)
+        return df
+    except FileNotFoundError:
+        raise FileNotFoundError
+    except pd.errors.ParserError:
+        raise pd.errors.ParserError
+    except Exception as e:
+        raise e
+
+import numpy as np
+import pandas as pd
+
+def _open_category(dtype):
+    return isinstance(dtype, str) and dtype == "category" or (
+        isinstance(dtype, pd.CategoricalDtype) and dtype.categories is None)
+
+def _category_dtypes(data_path, categorical, dtype, usecols, chunksize):
+    """Returns one fixed ``CategoricalDtype`` per categorical column, shared by every chunk.
+
+    Levels not given in ``categorical`` (a dict) are collected in one pass
+    over just those columns, so every chunk gets the same categories.
+    """
+    categorical = dict(categorical) if isinstance(categorical, dict) else dict.fromkeys(categorical or [])
+    categorical.update({col: None for col, value in (dtype or {}).items()
+                        if _open_category(value) and col not in categorical})
+    if usecols is not None:
+        categorical = {col: levels for col, levels in categorical.items() if col in usecols}
+    scan = [col for col, levels in categorical.items() if levels is None]
+    if scan:
+        declared = {col: value for col, value in (dtype or {}).items() if col in scan and not _open_category(value)}
+        seen = {col: set() for col in scan}
+        with pd.read_csv(data_path, usecols=scan, dtype=declared or None, chunksize=chunksize) as reader:
+            for chunk in reader:
+                for col in scan:
+                    seen[col].update(chunk[col].dropna().unique())
+        for col in scan:
+            try:
+                categorical[col] = sorted(seen[col])
+            except TypeError:
+                categorical[col] = sorted(seen[col], key=str)
+    return {col: pd.CategoricalDtype(levels) for col, levels in categorical.items()}
+
+def _chunk_schema(first, declared, categories, downcast):
+    """Returns the dtype of every converted column, derived once from the first chunk.
+
+    Columns declared in ``dtype`` are never downcast. float64 columns become
+    float32 and int64 columns int32 when the first chunk fits.
+    """
+    schema = dict(categories)
+    if not downcast:
+        return schema
+    int32 = np.iinfo(np.int32)
+    for col in first.columns:
+        if col in schema or col in declared:
+            continue
+        dtype = first[col].dtype
+        if dtype == np.float64:
+            schema[col] = np.dtype(np.float32)
+        elif dtype == np.int64 and first[col].between(int32.min, int32.max).all():
+            schema[col] = np.dtype(np.int32)
+    return schema
+
+def _apply_schema(df, schema):
+    for col, dtype in schema.items():
+        if col not in df.columns or df[col].dtype == dtype:
+            continue
+        values = df[col]
+        if dtype.kind == "i":
+            info = np.iinfo(dtype)
+            integral = pd.api.types.is_integer_dtype(values.dtype) or (
+                pd.api.types.is_numeric_dtype(values.dtype) and values.notna().all() and (values % 1 == 0).all())
+            if not integral or values.min() < info.min or values.max() > info.max:
+                raise ValueError(f"Column '{col}' no longer fits {dtype} (derived from the first chunk); "
+                                 f"declare its dtype to read it.")
+        df[col] = values.astype(dtype)
+    return df
+
+@instrumented
+def load_data_chunks(data_path, chunksize=250_000, dtype=None, usecols=None,
+                     downcast=True, categorical=None, engine=None):
+    """Streams a large .csv file as typed pandas DataFrame chunks.
+
+    Args:
+        data_path (str): Path to the .csv file.
+        chunksize (int): Number of rows per chunk (approximate for the pyarrow engine).
+        dtype (dict): Declared column dtypes, passed to the CSV reader.
+        usecols (list): Columns to read; all other columns are skipped at parse time.
+        downcast (bool): Downcast undeclared float64 columns to float32 and
+            int64 columns to int32 when the first chunk fits. Columns named
+            in ``dtype`` keep their declared type.
+        categorical (list or dict): Columns to convert to the pandas ``category``
+            dtype, or ``{column: categories}``. Levels not given are collected
+            in one extra pass over those columns so every chunk shares them.
+        engine (str): ``None``/``"c"`` for the pandas C parser or ``"pyarrow"`` for
+            the streaming pyarrow CSV reader.
+    Yields:
+        pandas.DataFrame: The next chunk of rows. Every chunk has the same
+        dtypes, so ``pd.concat`` of the chunks keeps them.
+    """
+    if chunksize is None or chunksize <= 0:
+        raise ValueError("chunksize must be a positive integer.")
+    if not os.path.exists(data_path):
+        raise FileNotFoundError(f"Data file not found at {data_path}")
+    if engine not in (None, "c", "pyarrow"):
+        raise ValueError(f"Unsupported engine: {engine}")
+    declared = dict(dtype or {})
+    categories = _category_dtypes(data_path, categorical, declared, usecols, chunksize)
+    schema = None
+
+    if engine == "pyarrow":
+        try:
+            from pyarrow import csv as pa_csv
+        except ImportError:
+            raise ImportError("The pyarrow engine requires the 'pyarrow' package.")
+        convert_options = pa_csv.ConvertOptions(include_columns=list(usecols) if usecols else None)
+        # block_size is in bytes; assume ~64 bytes per row to honour chunksize approximately.
+        read_options = pa_csv.ReadOptions(block_size=max(int(chunksize) * 64, 1 << 20))
+        reader = pa_csv.open_csv(data_path, read_options=read_options, convert_options=convert_options)
+        for batch in reader:
+            chunk = batch.to_pandas()
+            if declared:
+                chunk = chunk.astype({k: v for k, v in declared.items() if k in chunk.columns})
+            if schema is None:
+                schema = _chunk_schema(chunk, declared, categories, downcast)
+            yield _apply_schema(chunk, schema)
+        return
+
+    reader = pd.read_csv(data_path, chunksize=chunksize, dtype=dtype, usecols=usecols)
+    with reader:
+        for chunk in reader:
+            if schema is None:
+                schema = _chunk_schema(chunk, declared, categories, downcast)
+            yield _apply_schema(chunk, schema)
+
+import pandas as pd
+
+@instrumented
+def apply_preprocessing(pipeline, data):
+    """Applies a pre-processing pipeline to the input data.
+    Args:
+        pipeline: The pre-processing pipeline object.
+        data (pandas.DataFrame): The data to be pre-processed.
+    Returns:
+        pandas.DataFrame: The pre-processed data.
+    """
+    if not isinstance(data, pd.DataFrame):
+        raise TypeError("Input data must be a pandas DataFrame.")
+    try:
+        transformed_data = pipeline.transform(data)
+        return transformed_data
+    except Exception as e:
+        raise e
+
+import logging
+import struct
+import time
+import numpy as np
+
+@instrumented
+def iter_scores(pipeline, model, chunks, feature_cols=None, dtype=np.float32):
+    """Generator stage: transforms and scores DataFrame chunks one at a time.
+
+    Args:
+        pipeline: Pre-processing pipeline exposing ``transform``, or ``None``.
+        model: Model exposing ``predict_proba``.
+        chunks (iterable): DataFrame chunks, e.g. from ``load_data_chunks``.
+        feature_cols (list): Columns passed to the pipeline; defaults to all.
+        dtype: dtype of the yielded score arrays.
+    Yields:
+        numpy.ndarray: Positive-class scores for the next chunk.
+    """
+    for chunk in chunks:
+        X = chunk[feature_cols] if feature_cols is not None else chunk
+        if pipeline is not None:
+            X = pipeline.transform(X)
+        yield np.asarray(model.predict_proba(X)[:, 1], dtype=dtype)
+
+class _NpyStreamWriter:
+    """Appends 1-D arrays to a .npy file whose length is only known at close."""
+
+    def __init__(self, path, dtype):
+        self.dtype = np.dtype(dtype)
+        self.rows = 0
+        self._file = open(path, "wb")
+        self._file.write(self._header(0))
+
+    def _header(self, rows):
+        # Fixed-width shape field so the final header overwrites the placeholder in place.
+        text = "{'descr': %r, 'fortran_order': False, 'shape': (%-20d,), }" % (
+            np.lib.format.dtype_to_descr(self.dtype), rows)
+        padding = -(10 + len(text) + 1) % 64
+        text = text + " " * padding + "\n"
+        return b"\x93NUMPY\x01\x00" + struct.pack("<H", len(text)) + text.encode("latin1")
+
+    def write(self, values):
+        values = np.ascontiguousarray(values, dtype=self.dtype)
+        values.tofile(self._file)
+        self.rows += len(values)
+
+    def close(self):
+        self._file.seek(0)
+        self._file.write(self._header(self.rows))
+        self._file.close()
+
+class _ParquetStreamWriter:
+    """Appends 1-D arrays to a single-column Parquet file, one row group per chunk."""
+
+    def __init__(self, path, dtype, column="score"):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Writing Parquet scores requires the 'pyarrow' package.")
+        self._pa = pa
+        self.dtype = np.dtype(dtype)
+        self.column = column
+        self.rows = 0
+        self._writer = pq.ParquetWriter(path, pa.schema([(column, pa.from_numpy_dtype(self.dtype))]))
+
+    def write(self, values):
+        values = np.asarray(values, dtype=self.dtype)
+        self._writer.write_table(self._pa.table({self.column: values}))
+        self.rows += len(values)
+
+    def close(self):
+        self._writer.close()
+
+@instrumented
+def score_to_disk(pipeline, model, chunks, output_path, feature_cols=None, dtype=np.float32):
+    """Runs read -> transform -> predict_proba -> write over chunks in bounded memory.
+
+    Only one chunk (raw, transformed and scored) is alive at a time. Scores
+    are appended to a compact on-disk array: a ``.npy`` file (readable with
+    ``np.load(path, mmap_mode="r")``) or a single-column ``.parquet`` file.
+
+    Returns:
+        dict: ``path``, ``rows``, ``seconds`` and ``rows_per_second``.
+    """
+    extension = os.path.splitext(output_path)[1].lower()
+    if extension == ".npy":
+        writer = _NpyStreamWriter(output_path, dtype)
+    elif extension == ".parquet":
+        writer = _ParquetStreamWriter(output_path, dtype)
+    else:
+        raise ValueError("output_path must end with .npy or .parquet")
+
+    start = time.perf_counter()
+    try:
+        for scores in iter_scores(pipeline, model, chunks, feature_cols, dtype):
+            writer.write(scores)
+    finally:
+        writer.close()
+    seconds = time.perf_counter() - start
+
+    stats = {"path": output_path, "rows": writer.rows, "seconds": seconds,
+             "rows_per_second": writer.rows / seconds if seconds > 0 else float("inf")}
+    logging.info(f"Scored {stats['rows']} rows in {seconds:.2f}s ({stats['rows_per_second']:.0f} rows/s)")
+    return stats
+
+import hashlib
+import pickle
+import threading
+import weakref
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+@instrumented
+def model_fingerprint(model):
+    """Returns a SHA-256 fingerprint of a model's pickled state.
+
+    Falls back to an identity-based key for objects that cannot be pickled.
+    """
+    try:
+        payload = pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        return f"id:{id(model)}"
+    return hashlib.sha256(payload).hexdigest()
+
+@instrumented
+def dataset_fingerprint(X):
+    """Returns a SHA-256 fingerprint of a DataFrame, Series or array's contents and layout."""
+    h = hashlib.sha256()
+    if isinstance(X, (pd.DataFrame, pd.Series)):
+        columns = list(X.columns) if isinstance(X, pd.DataFrame) else [X.name]
+        dtypes = list(X.dtypes) if isinstance(X, pd.DataFrame) else [X.dtype]
+        h.update(repr((X.shape, columns, [str(d) for d in dtypes])).encode())
+        h.update(pd.util.hash_pandas_object(X, index=True).to_numpy().tobytes())
+    else:
+        arr = np.ascontiguousarray(X)
+        h.update(repr((arr.shape, str(arr.dtype))).encode())
+        h.update(arr.tobytes() if not arr.dtype.hasobject else pickle.dumps(arr))
+    return h.hexdigest()
+
+class PredictionStore:
+    """Score-once cache of model outputs keyed by model and dataset fingerprints.
+
+    Scores are held as read-only, contiguous float64 arrays so a single
+    scoring pass can feed AUC/Gini, drift, Hosmer-Lemeshow, calibration and
+    sensitivity without calling ``predict_proba`` again. For ``predict_proba``
+    the positive-class column is stored. Least-recently-used entries are
+    evicted once the stored arrays exceed ``max_bytes``.
+
+    Models and datasets are fingerprinted afresh on every call, so a model
+    refit in place gets a new key. ``register`` fingerprints an object once
+    for as long as it is alive, which makes a hit cheaper than scoring.
+    """
+
+    def __init__(self, max_bytes=1024 ** 3):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._scores = OrderedDict()
+        self._objects = {}  # id(obj) -> (weakref, fingerprint)
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._scores)
+
+    def register(self, obj, key=None):
+        """Fingerprints a model or dataset once (or uses ``key``) for as long as it is alive.
+
+        A registered object must not be changed in place afterwards: refit
+        or edit a copy, or register it again. Returns ``obj``.
+        """
+        if key is None:
+            key = dataset_fingerprint(obj) if isinstance(obj, (pd.DataFrame, pd.Series, np.ndarray)) \
+                else model_fingerprint(obj)
+        ref = weakref.ref(obj, lambda _, object_id=id(obj): self._objects.pop(object_id, None))
+        with self._lock:
+            self._objects[id(obj)] = (ref, key)
+        return obj
+
+    def _recall(self, obj):
+        known = self._objects.get(id(obj))
+        if known is not None and known[0]() is obj:
+            return known[1]
+        return None
+
+    def fingerprint_model(self, model):
+        """Returns the model fingerprint, recomputed per call unless the model was registered."""
+        known = self._recall(model)
+        return model_fingerprint(model) if known is None else known
+
+    def _key(self, model, X, method):
+        known = self._recall(X)
+        return (self.fingerprint_model(model), dataset_fingerprint(X) if known is None else known, method)
+
+    def put(self, model, X, scores, method="predict_proba"):
+        """Stores externally computed scores for ``model`` on ``X`` and returns them."""
+        return self._put(self._key(model, X, method), scores, method)
+
+    def _put(self, key, scores, method):
+        arr = np.asarray(scores)
+        if method == "predict_proba" and arr.ndim == 2:
+            arr = arr[:, 1]
+        arr = np.ascontiguousarray(arr, dtype=np.float64)
+        arr.flags.writeable = False
+        with self._lock:
+            if key in self._scores:
+                self.current_bytes -= self._scores.pop(key).nbytes
+            self._scores[key] = arr
+            self.current_bytes += arr.nbytes
+            while self.current_bytes > self.max_bytes and len(self._scores) > 1:
+                _, evicted = self._scores.popitem(last=False)
+                self.current_bytes -= evicted.nbytes
+        return arr
+
+    @instrumented
+    def score(self, model, X, method="predict_proba"):
+        """Returns cached scores for ``model`` on ``X``, scoring on the first request only."""
+        key = self._key(model, X, method)
+        with self._lock:
+            cached = self._scores.get(key)
+            if cached is not None:
+                self._scores.move_to_end(key)
+                self.hits += 1
+                return cached
+            self.misses += 1
+        return self._put(key, getattr(model, method)(X), method)
+
+    def clear(self):
+        with self._lock:
+            self._scores.clear()
+            self.current_bytes = 0
+            self.hits = 0
+            self.misses = 0
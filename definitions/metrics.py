@@ -0,0 +1,775 @@
+"""Discrimination, calibration and sensitivity metrics for rating models.
+
+SciPy and scikit-learn are imported inside the functions that need them.
+"""
+
+__all__ = [
+    "calculate_auc_gini",
+    "AUCAccumulator",
+    "accumulate_auc_gini",
+    "bootstrap_auc_gini",
+    "delong_auc_covariance",
+    "compare_auc_delong",
+    "perform_hosmer_lemeshow_test",
+    "hosmer_lemeshow_batch",
+    "generate_calibration_curve",
+    "CalibrationAccumulator",
+    "track_auc_gini_drift",
+    "perform_sensitivity_analysis",
+    "perform_sensitivity_grid",
+]
+
+from .instrumentation import instrumented
+
+import pandas as pd
+import numpy as np
+
+@instrumented
+def calculate_auc_gini(model, X, y, store=None):
+    """Calculates the AUC and Gini coefficient for a given model and data.
+
+    If a PredictionStore is passed as ``store``, scores are taken from (and
+    added to) it instead of calling ``model.predict_proba`` directly.
+    """
+    from sklearn.metrics import roc_auc_score
+
+    try:
+        y_pred_proba = model.predict_proba(X)[:, 1] if store is None else store.score(model, X)
+        auc = roc_auc_score(y, y_pred_proba)
+        gini = 2 * auc - 1
+        return auc, gini
+    except ValueError:
+        return np.nan, np.nan
+    except AttributeError:
+        return np.nan, np.nan
+
+import numpy as np
+
+class AUCAccumulator:
+    """Mergeable AUC/Gini accumulator for scores streamed in chunks.
+
+    Binned mode (default) counts positives and negatives per equal-width
+    score bucket over ``score_range`` in a single ``np.bincount`` pass; scores
+    outside the range are clipped into the edge buckets. Pairs that fall in
+    the same bucket are scored as ties (0.5), so the binned AUC differs from
+    the exact value by at most ``0.5 * sum_b(pos_b * neg_b) / (P * N)``,
+    which :meth:`error_bound` returns for the accumulated data.
+
+    Exact mode keeps positive/negative counts per distinct score value and
+    combines partial states with a sort-merge, matching
+    ``sklearn.metrics.roc_auc_score`` at the cost of memory proportional to
+    the number of distinct scores.
+
+    Accumulators with the same configuration merge with ``merge`` or ``+``
+    across chunks, workers and quarters.
+    """
+
+    def __init__(self, n_bins=10_000, exact=False, score_range=(0.0, 1.0)):
+        if not exact and n_bins <= 0:
+            raise ValueError("n_bins must be positive.")
+        if score_range[1] <= score_range[0]:
+            raise ValueError("score_range must be increasing.")
+        self.n_bins = int(n_bins)
+        self.exact = bool(exact)
+        self.score_range = (float(score_range[0]), float(score_range[1]))
+        if self.exact:
+            self.values = np.empty(0, dtype=np.float64)
+            self.pos = np.empty(0, dtype=np.int64)
+            self.neg = np.empty(0, dtype=np.int64)
+        else:
+            self.values = None
+            self.pos = np.zeros(self.n_bins, dtype=np.int64)
+            self.neg = np.zeros(self.n_bins, dtype=np.int64)
+
+    @property
+    def n_pos(self):
+        return int(self.pos.sum())
+
+    @property
+    def n_neg(self):
+        return int(self.neg.sum())
+
+    @instrumented
+    def update(self, y_true, y_score):
+        """Adds a chunk of binary labels and scores to the accumulator."""
+        y_true = np.asarray(y_true)
+        y_score = np.asarray(y_score, dtype=np.float64)
+        if y_true.shape != y_score.shape or y_true.ndim != 1:
+            raise ValueError("y_true and y_score must be 1-D arrays of the same length.")
+        is_pos = y_true == 1
+        if not np.all(is_pos | (y_true == 0)):
+            raise ValueError("Target variable must be binary (0 and 1).")
+        if self.exact:
+            values, inverse = np.unique(y_score, return_inverse=True)
+            pos = np.bincount(inverse[is_pos], minlength=len(values))
+            neg = np.bincount(inverse[~is_pos], minlength=len(values))
+            self._merge_exact(values, pos, neg)
+        else:
+            lower, upper = self.score_range
+            idx = ((y_score - lower) * (self.n_bins / (upper - lower))).astype(np.intp)
+            np.clip(idx, 0, self.n_bins - 1, out=idx)
+            self.pos += np.bincount(idx[is_pos], minlength=self.n_bins)
+            self.neg += np.bincount(idx[~is_pos], minlength=self.n_bins)
+        return self
+
+    def _merge_exact(self, values, pos, neg):
+        merged, inverse = np.unique(np.concatenate([self.values, values]), return_inverse=True)
+        self.pos = np.bincount(inverse, weights=np.concatenate([self.pos, pos]), minlength=len(merged)).astype(np.int64)
+        self.neg = np.bincount(inverse, weights=np.concatenate([self.neg, neg]), minlength=len(merged)).astype(np.int64)
+        self.values = merged
+
+    def merge(self, other):
+        """Merges another accumulator's partial state into this one in place."""
+        if (self.exact, self.n_bins, self.score_range) != (other.exact, other.n_bins, other.score_range):
+            raise ValueError("Cannot merge accumulators with different configurations.")
+        if self.exact:
+            self._merge_exact(other.values, other.pos, other.neg)
+        else:
+            self.pos += other.pos
+            self.neg += other.neg
+        return self
+
+    def __add__(self, other):
+        result = AUCAccumulator(self.n_bins, self.exact, self.score_range)
+        return result.merge(self).merge(other)
+
+    def auc(self):
+        """Returns the AUC, or NaN if either class is absent."""
+        n_pos, n_neg = self.n_pos, self.n_neg
+        if n_pos == 0 or n_neg == 0:
+            return np.nan
+        pos = self.pos.astype(np.float64)
+        neg = self.neg.astype(np.float64)
+        neg_below = np.cumsum(neg) - neg
+        return float(np.dot(pos, neg_below + 0.5 * neg) / (float(n_pos) * n_neg))
+
+    def gini(self):
+        return 2 * self.auc() - 1
+
+    def error_bound(self):
+        """Returns the maximum absolute AUC error of the binned estimate (0 in exact mode)."""
+        n_pos, n_neg = self.n_pos, self.n_neg
+        if self.exact or n_pos == 0 or n_neg == 0:
+            return 0.0 if self.exact else np.nan
+        return float(0.5 * np.dot(self.pos.astype(np.float64), self.neg) / (float(n_pos) * n_neg))
+
+@instrumented
+def accumulate_auc_gini(model, chunks, target_col, feature_cols=None, accumulator=None, **kwargs):
+    """Scores streamed DataFrame chunks and accumulates AUC/Gini counts.
+
+    Args:
+        model: Model exposing ``predict_proba``.
+        chunks (iterable): DataFrame chunks, e.g. from ``load_data_chunks``.
+        target_col (str): Name of the binary default flag column.
+        feature_cols (list): Model input columns; defaults to every other column.
+        accumulator (AUCAccumulator): Existing state to continue; a new one is
+            created from ``kwargs`` otherwise.
+    Returns:
+        AUCAccumulator: The updated accumulator.
+    """
+    accumulator = AUCAccumulator(**kwargs) if accumulator is None else accumulator
+    for chunk in chunks:
+        X = chunk[feature_cols] if feature_cols is not None else chunk.drop(columns=[target_col])
+        accumulator.update(chunk[target_col].to_numpy(), model.predict_proba(X)[:, 1])
+    return accumulator
+
+@instrumented
+def bootstrap_auc_gini(y_true, y_score, n_boot=1000, alpha=0.05, seed=42, max_block_elements=4_000_000):
+    """Computes AUC and Gini with percentile bootstrap confidence intervals.
+
+    Scores are sorted once to obtain a rank group per observation. Each
+    resample's AUC then comes from per-group positive/negative counts
+    (``np.bincount`` over offset group ids) and a cumulative sum, which is the
+    midrank (Mann-Whitney) formula, with no re-sort. Resamples are processed in
+    blocks of at most ``max_block_elements`` drawn indices to bound memory.
+
+    Args:
+        y_true (array-like): Binary labels.
+        y_score (array-like): Predicted PDs or scores.
+        n_boot (int): Number of bootstrap resamples.
+        alpha (float): Two-sided significance level; 0.05 gives 95% intervals.
+        seed (int): Seed for ``numpy.random.default_rng``.
+        max_block_elements (int): Upper bound on resamples x rows held at once.
+    Returns:
+        dict: ``auc``, ``gini``, ``auc_ci`` and ``gini_ci`` (lower, upper),
+        ``auc_std``, ``n_boot`` and ``alpha``.
+    """
+    y_true = np.asarray(y_true)
+    y_score = np.asarray(y_score, dtype=np.float64)
+    if y_true.shape != y_score.shape or y_true.ndim != 1 or len(y_true) == 0:
+        raise ValueError("y_true and y_score must be non-empty 1-D arrays of the same length.")
+    is_pos = y_true == 1
+    if not np.all(is_pos | (y_true == 0)):
+        raise ValueError("Target variable must be binary (0 and 1).")
+    if n_boot <= 0:
+        raise ValueError("n_boot must be positive.")
+    if not 0 < alpha < 1:
+        raise ValueError("alpha must be between 0 and 1.")
+
+    _, groups = np.unique(y_score, return_inverse=True)
+    n_groups = groups.max() + 1
+    labels = is_pos.astype(np.float64)
+    n = len(y_true)
+
+    def _auc_from_counts(pos, total):
+        neg = total - pos
+        neg_below = np.cumsum(neg, axis=-1) - neg
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.sum(pos * (neg_below + 0.5 * neg), axis=-1) / (pos.sum(axis=-1) * neg.sum(axis=-1))
+
+    auc = float(_auc_from_counts(np.bincount(groups, weights=labels, minlength=n_groups),
+                                 np.bincount(groups, minlength=n_groups).astype(np.float64)))
+
+    rng = np.random.default_rng(seed)
+    block = max(1, min(n_boot, max_block_elements // max(n, n_groups)))
+    aucs = np.empty(n_boot)
+    for start in range(0, n_boot, block):
+        b = min(block, n_boot - start)
+        idx = rng.integers(0, n, size=(b, n))
+        flat = (groups[idx] + (np.arange(b) * n_groups)[:, None]).ravel()
+        size = b * n_groups
+        pos = np.bincount(flat, weights=labels[idx].ravel(), minlength=size).reshape(b, n_groups)
+        total = np.bincount(flat, minlength=size).reshape(b, n_groups).astype(np.float64)
+        aucs[start:start + b] = _auc_from_counts(pos, total)
+
+    lower, upper = np.nanpercentile(aucs, [100 * alpha / 2, 100 * (1 - alpha / 2)])
+    return {
+        "auc": auc,
+        "gini": 2 * auc - 1,
+        "auc_ci": (float(lower), float(upper)),
+        "gini_ci": (float(2 * lower - 1), float(2 * upper - 1)),
+        "auc_std": float(np.nanstd(aucs, ddof=1)) if n_boot > 1 else np.nan,
+        "n_boot": n_boot,
+        "alpha": alpha,
+    }
+
+import numpy as np
+import pandas as pd
+
+def _midranks_sorted(values):
+    """Returns 1-based midranks for an already sorted 1-D array."""
+    n = len(values)
+    if n == 0:
+        return np.empty(0)
+    starts = np.flatnonzero(np.r_[True, values[1:] != values[:-1]])
+    ends = np.r_[starts[1:], n]
+    return np.repeat((starts + ends + 1) / 2.0, ends - starts)
+
+@instrumented
+def delong_auc_covariance(y_true, scores):
+    """Computes AUCs and their DeLong covariance matrix for several models on one sample.
+
+    Uses the Sun & Xu (2014) formulation: each model's scores are sorted
+    once, and midranks over all, positive-only and negative-only scores are
+    read off that single ordering.
+
+    Args:
+        y_true (array-like): Binary labels of length n.
+        scores (array-like): Scores of shape (k, n), one row per model.
+    Returns:
+        tuple: AUCs of shape (k,) and covariance matrix of shape (k, k).
+    """
+    y_true = np.asarray(y_true)
+    scores = np.atleast_2d(np.asarray(scores, dtype=np.float64))
+    if scores.shape[1] != len(y_true):
+        raise ValueError("scores must have one column per observation in y_true.")
+    is_pos = y_true == 1
+    if not np.all(is_pos | (y_true == 0)):
+        raise ValueError("Target variable must be binary (0 and 1).")
+    m, n = int(is_pos.sum()), int((~is_pos).sum())
+    if m < 2 or n < 2:
+        raise ValueError("DeLong's test needs at least two positives and two negatives.")
+
+    k = scores.shape[0]
+    v01 = np.empty((k, m))
+    v10 = np.empty((k, n))
+    aucs = np.empty(k)
+    for r in range(k):
+        order = np.argsort(scores[r], kind="mergesort")
+        z = scores[r][order]
+        pos_sorted = is_pos[order]
+        # Scatter the sorted-order midranks back so rows stay aligned across models.
+        tz = np.empty(len(z))
+        tz[order] = _midranks_sorted(z)
+        t_class = np.empty(len(z))
+        t_class[order[pos_sorted]] = _midranks_sorted(z[pos_sorted])
+        t_class[order[~pos_sorted]] = _midranks_sorted(z[~pos_sorted])
+        tz_pos, tz_neg = tz[is_pos], tz[~is_pos]
+        aucs[r] = (tz_pos.sum() - m * (m + 1) / 2.0) / (m * n)
+        v01[r] = (tz_pos - t_class[is_pos]) / n
+        v10[r] = 1.0 - (tz_neg - t_class[~is_pos]) / m
+
+    cov = np.atleast_2d(np.cov(v01)) / m + np.atleast_2d(np.cov(v10)) / n
+    return aucs, cov
+
+@instrumented
+def compare_auc_delong(y_true, scores, reference=None, periods=None):
+    """Compares model AUCs with DeLong's test, optionally per period.
+
+    Args:
+        y_true (array-like): Binary labels.
+        scores (dict): Mapping of model name to scores on the same rows, e.g.
+            ``PredictionStore.score`` outputs for champion and challenger.
+        reference (str): Compare every model against this one (e.g. the
+            champion); all pairs are compared when ``None``.
+        periods (array-like): Optional period label per row; the test is run
+            separately for each period. A period with fewer than two
+            positives or negatives gets NaN rows.
+    Returns:
+        pandas.DataFrame: One row per (period, model pair) with ``auc_a``,
+        ``auc_b``, ``auc_diff`` (a - b), ``variance``, ``z`` and two-sided ``p_value``.
+    """
+    from scipy import stats
+
+    names = list(scores)
+    if reference is not None and reference not in scores:
+        raise KeyError(f"Unknown reference model: {reference}")
+    if reference is None:
+        pairs = [(names[i], names[j]) for i in range(len(names)) for j in range(i + 1, len(names))]
+    else:
+        pairs = [(name, reference) for name in names if name != reference]
+    position = {name: i for i, name in enumerate(names)}
+
+    y_true = np.asarray(y_true)
+    matrix = np.vstack([np.asarray(scores[name], dtype=np.float64) for name in names])
+    if periods is None:
+        groups = [(None, slice(None))]
+    else:
+        periods = np.asarray(periods)
+        groups = [(p, periods == p) for p in pd.unique(periods)]
+
+    rows = []
+    for period, mask in groups:
+        y_period = y_true[mask]
+        if periods is not None and np.all((y_period == 0) | (y_period == 1)) and \
+                min(int((y_period == 1).sum()), int((y_period == 0).sum())) < 2:
+            # Too few defaults or non-defaults in this period: NaN rows instead of aborting the batch.
+            rows += [{"period": period, "model_a": a, "model_b": b, "auc_a": np.nan, "auc_b": np.nan,
+                      "auc_diff": np.nan, "variance": np.nan, "z": np.nan, "p_value": np.nan} for a, b in pairs]
+            continue
+        aucs, cov = delong_auc_covariance(y_period, matrix[:, mask])
+        for a, b in pairs:
+            i, j = position[a], position[b]
+            diff = aucs[i] - aucs[j]
+            variance = cov[i, i] + cov[j, j] - 2 * cov[i, j]
+            z = diff / np.sqrt(variance) if variance > 0 else np.nan
+            rows.append({"period": period, "model_a": a, "model_b": b, "auc_a": aucs[i], "auc_b": aucs[j],
+                         "auc_diff": diff, "variance": variance, "z": z,
+                         "p_value": 2 * stats.norm.sf(abs(z)) if variance > 0 else np.nan})
+
+    result = pd.DataFrame(rows, columns=["period", "model_a", "model_b", "auc_a", "auc_b",
+                                         "auc_diff", "variance", "z", "p_value"])
+    return result.drop(columns="period") if periods is None else result
+
+import numpy as np
+import pandas as pd
+
+def _hl_group_ids(y_prob, n_groups, grouping, grades=None):
+    """Assigns each observation to a Hosmer-Lemeshow group.
+
+    Returns the group ids (``-1`` for observations outside every group) and
+    the number of groups, which for quantile grouping counts only non-empty groups.
+    """
+    if grouping == "equal_width":
+        # Same bins as np.digitize over np.linspace(0, 1, n_groups + 1): p == 1 falls outside.
+        ids = np.searchsorted(np.linspace(0, 1, n_groups + 1), y_prob, side="right") - 1
+        ids[(ids >= n_groups) | np.isnan(y_prob)] = -1
+        return ids, n_groups
+    if grouping == "quantile":
+        edges = np.unique(np.quantile(y_prob, np.linspace(0, 1, n_groups + 1)[1:-1]))
+        ids = np.searchsorted(edges, y_prob, side="right")
+        # Tied PDs collapse quantile groups; renumber the non-empty ones so the
+        # degrees of freedom count only groups that hold observations.
+        occupied = np.bincount(ids, minlength=len(edges) + 1) > 0
+        return (np.cumsum(occupied) - 1)[ids], int(occupied.sum())
+    if grouping == "grade":
+        if grades is None:
+            raise ValueError("grades must be provided for grade grouping.")
+        grades = np.asarray(grades)
+        if len(grades) != len(y_prob):
+            raise ValueError("grades must have the same length as y_prob.")
+        ids, labels = pd.factorize(grades, sort=True)
+        return ids, len(labels)
+    raise ValueError(f"Unknown grouping: {grouping}")
+
+def _hl_statistic(observed, expected, n_groups):
+    """Computes HL statistics and p-values from (..., G) observed/expected count arrays."""
+    from scipy import stats
+
+    statistic = np.sum((observed - expected) ** 2 / (expected + 1e-8), axis=-1)
+    degrees_of_freedom = n_groups - 2
+    p_value = 1 - stats.chi2.cdf(statistic, degrees_of_freedom)
+    return statistic, p_value
+
+@instrumented
+def perform_hosmer_lemeshow_test(y_true, y_prob, n_groups, grouping="equal_width", grades=None):
+    """Performs the Hosmer-Lemeshow test for model calibration.
+
+    Args:
+        y_true (array-like): The true labels.
+        y_prob (array-like): The predicted probabilities.
+        n_groups (int): The number of groups to use (ignored for grade grouping).
+        grouping (str): ``"equal_width"`` probability bins, ``"quantile"`` groups
+            (deciles for ``n_groups=10``) or ``"grade"`` to group by ``grades``.
+        grades (array-like): Rating grade per observation for grade grouping.
+
+    Returns:
+        tuple: The Hosmer-Lemeshow test statistic and p-value.
+    """
+    y_true = np.array(y_true)
+    y_prob = np.array(y_prob)
+
+    if not np.issubdtype(y_prob.dtype, np.number):
+        raise TypeError("y_prob must be numeric")
+
+    if grouping != "grade" and n_groups > len(y_true):
+        raise ValueError("n_groups cannot be greater than the number of samples")
+
+    y_prob = y_prob.astype(np.float64)
+    ids, n_groups = _hl_group_ids(y_prob, n_groups, grouping, grades)
+    valid = ids >= 0
+    observed = np.bincount(ids[valid], weights=y_true[valid].astype(np.float64), minlength=n_groups)
+    expected = np.bincount(ids[valid], weights=y_prob[valid], minlength=n_groups)
+
+    return _hl_statistic(observed, expected, n_groups)
+
+@instrumented
+def hosmer_lemeshow_batch(y_true, y_probs, n_groups=10, grouping="quantile", grades=None):
+    """Runs the Hosmer-Lemeshow test for many models or periods in one batched call.
+
+    All observations are assigned to offset group ids and reduced with a
+    single ``np.bincount`` for observed and expected defaults.
+
+    Args:
+        y_true (array-like or dict): Labels shared by every entry, or a dict
+            mapping each key of ``y_probs`` to its own labels (e.g. per period).
+        y_probs (dict): Mapping of key (model name, period, ...) to predicted PDs.
+        n_groups (int): Number of groups per entry (ignored for grade grouping).
+        grouping (str): ``"equal_width"``, ``"quantile"`` or ``"grade"``.
+        grades (array-like or dict): Grades shared by every entry, or per key.
+
+    Returns:
+        pandas.DataFrame: ``statistic``, ``p_value`` and ``n_groups`` per key.
+    """
+    keys = list(y_probs)
+    if not keys:
+        return pd.DataFrame(columns=["statistic", "p_value", "n_groups"])
+
+    all_ids, all_true, all_prob, group_counts = [], [], [], []
+    for key in keys:
+        prob = np.asarray(y_probs[key], dtype=np.float64)
+        true = np.asarray(y_true[key] if isinstance(y_true, dict) else y_true, dtype=np.float64)
+        key_grades = grades[key] if isinstance(grades, dict) else grades
+        if len(true) != len(prob):
+            raise ValueError(f"y_true and y_prob lengths differ for {key!r}.")
+        ids, g = _hl_group_ids(prob, n_groups, grouping, key_grades)
+        all_ids.append(ids)
+        all_true.append(true)
+        all_prob.append(prob)
+        group_counts.append(g)
+
+    width = max(group_counts)
+    offsets = np.arange(len(keys)) * width
+    ids = np.concatenate([np.where(i >= 0, i + off, -1) for i, off in zip(all_ids, offsets)])
+    y_true_all = np.concatenate(all_true)
+    y_prob_all = np.concatenate(all_prob)
+    valid = ids >= 0
+    size = len(keys) * width
+    observed = np.bincount(ids[valid], weights=y_true_all[valid], minlength=size).reshape(len(keys), width)
+    expected = np.bincount(ids[valid], weights=y_prob_all[valid], minlength=size).reshape(len(keys), width)
+
+    group_counts = np.asarray(group_counts)
+    statistic, p_value = _hl_statistic(observed, expected, group_counts)
+    return pd.DataFrame({"statistic": statistic, "p_value": p_value, "n_groups": group_counts},
+                        index=pd.Index(keys, name="key"))
+
+import numpy as np
+
+@instrumented
+def generate_calibration_curve(y_true, y_prob, n_bins):
+    """Generates calibration curves."""
+
+    if n_bins <= 0:
+        raise ValueError("Number of bins must be greater than zero.")
+
+    y_true = np.array(y_true)
+    y_prob = np.array(y_prob)
+
+    indices = np.argsort(y_prob)
+    y_prob_sorted = y_prob[indices]
+    y_true_sorted = y_true[indices]
+
+    bin_boundaries = np.linspace(0, len(y_true), n_bins + 1, dtype=int)
+    bin_means = np.zeros(n_bins)
+    bin_proportions = np.zeros(n_bins)
+
+    for i in range(n_bins):
+        start = bin_boundaries[i]
+        end = bin_boundaries[i+1]
+        bin_true = y_true_sorted[start:end]
+        bin_prob = y_prob_sorted[start:end]
+
+        if len(bin_true) > 0:
+            bin_means[i] = np.mean(bin_prob)
+            bin_proportions[i] = np.mean(bin_true)
+        else:
+            bin_means[i] = np.nan
+            bin_proportions[i] = np.nan
+
+    return bin_means, bin_proportions
+
+import numpy as np
+import pandas as pd
+
+class CalibrationAccumulator:
+    """Mergeable calibration-curve state binned by predicted PD or by rating grade.
+
+    Each bin tracks its observation count, sum of predicted PDs and sum of
+    defaults, filled with ``np.bincount`` and no sorting. Because these are
+    plain sums, states from chunks, workers or quarters combine exactly with
+    ``merge`` or ``+``.
+
+    Args:
+        n_bins (int): Number of equal-width probability bins on [0, 1].
+        bin_edges (array-like): Explicit increasing PD bin edges; overrides ``n_bins``.
+        grades (list): Ordered grade labels; when given, ``update`` bins by the
+            ``grades`` argument instead of by probability.
+    """
+
+    def __init__(self, n_bins=10, bin_edges=None, grades=None):
+        if grades is not None:
+            self.grades = list(grades)
+            self.bin_edges = None
+            size = len(self.grades)
+        else:
+            self.grades = None
+            if bin_edges is None:
+                if n_bins <= 0:
+                    raise ValueError("Number of bins must be greater than zero.")
+                bin_edges = np.linspace(0, 1, n_bins + 1)
+            self.bin_edges = np.asarray(bin_edges, dtype=np.float64)
+            if self.bin_edges.ndim != 1 or len(self.bin_edges) < 2 or np.any(np.diff(self.bin_edges) <= 0):
+                raise ValueError("bin_edges must be a strictly increasing sequence of at least two values.")
+            size = len(self.bin_edges) - 1
+        if size == 0:
+            raise ValueError("Number of bins must be greater than zero.")
+        self.count = np.zeros(size, dtype=np.int64)
+        self.sum_prob = np.zeros(size, dtype=np.float64)
+        self.sum_default = np.zeros(size, dtype=np.float64)
+
+    def _bin_ids(self, y_prob, grades):
+        if self.grades is not None:
+            if grades is None:
+                raise ValueError("grades must be provided for grade-based calibration.")
+            ids = pd.Index(self.grades).get_indexer(np.asarray(grades))
+            if np.any(ids < 0):
+                raise ValueError("grades contains labels that are not in the accumulator's grade list.")
+            return ids
+        ids = np.searchsorted(self.bin_edges, y_prob, side="right") - 1
+        return np.clip(ids, 0, len(self.count) - 1)
+
+    @instrumented
+    def update(self, y_true, y_prob, grades=None):
+        """Adds a chunk of outcomes and predicted PDs to the per-bin sums."""
+        y_true = np.asarray(y_true, dtype=np.float64)
+        y_prob = np.asarray(y_prob, dtype=np.float64)
+        if y_true.shape != y_prob.shape:
+            raise ValueError("y_true and y_prob must have the same length.")
+        ids = self._bin_ids(y_prob, grades)
+        size = len(self.count)
+        self.count += np.bincount(ids, minlength=size)
+        self.sum_prob += np.bincount(ids, weights=y_prob, minlength=size)
+        self.sum_default += np.bincount(ids, weights=y_true, minlength=size)
+        return self
+
+    def merge(self, other):
+        """Adds another accumulator's per-bin sums to this one in place."""
+        same_bins = (self.grades == other.grades if self.grades is not None or other.grades is not None
+                     else np.array_equal(self.bin_edges, other.bin_edges))
+        if not same_bins:
+            raise ValueError("Cannot merge accumulators with different bins.")
+        self.count += other.count
+        self.sum_prob += other.sum_prob
+        self.sum_default += other.sum_default
+        return self
+
+    def __add__(self, other):
+        result = CalibrationAccumulator(bin_edges=self.bin_edges, grades=self.grades)
+        return result.merge(self).merge(other)
+
+    def curve(self):
+        """Returns (mean predicted PD, realized default rate) per bin; NaN for empty bins."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            bin_means = np.where(self.count > 0, self.sum_prob / self.count, np.nan)
+            bin_proportions = np.where(self.count > 0, self.sum_default / self.count, np.nan)
+        return bin_means, bin_proportions
+
+    def to_frame(self):
+        """Returns the per-bin counts, mean PD and default rate as a DataFrame."""
+        bin_means, bin_proportions = self.curve()
+        if self.grades is not None:
+            index = pd.Index(self.grades, name="grade")
+        else:
+            index = pd.IntervalIndex.from_breaks(self.bin_edges, closed="left", name="pd_bin")
+        return pd.DataFrame({"count": self.count, "mean_pd": bin_means, "default_rate": bin_proportions,
+                             "expected_defaults": self.sum_prob, "observed_defaults": self.sum_default},
+                            index=index)
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+import pandas as pd
+import numpy as np
+
+def _drift_period(model, X, y, time_period, store=None):
+    """Computes the AUC/Gini drift row for a single snapshot."""
+    from sklearn.metrics import roc_auc_score
+
+    labels = pd.unique(np.asarray(y))
+    if set(labels) != {0, 1}:
+        if len(labels) > 2:
+            raise ValueError("Target variable must be binary (0 and 1).")
+        return {'time_period': time_period, 'auc': np.nan, 'gini': np.nan}
+
+    try:
+        y_pred_proba = model.predict_proba(X)[:, 1] if store is None else store.score(model, X)
+        auc = roc_auc_score(y, y_pred_proba)
+        gini = 2 * auc - 1
+    except ValueError:
+        auc = np.nan
+        gini = np.nan
+
+    return {'time_period': time_period, 'auc': auc, 'gini': gini}
+
+_DRIFT_WORKER_MODEL = None
+
+def _init_drift_worker(model):
+    global _DRIFT_WORKER_MODEL
+    _DRIFT_WORKER_MODEL = model
+
+def _drift_period_worker(X, y, time_period):
+    return _drift_period(_DRIFT_WORKER_MODEL, X, y, time_period)
+
+@instrumented
+def track_auc_gini_drift(model, X_snapshots, y_snapshots, time_periods, store=None, n_jobs=None, executor=None):
+    """Tracks AUC/Gini drift over time.
+
+    Snapshot scores are read from ``store`` (a PredictionStore) when given.
+    With ``n_jobs`` > 1 (or -1 for all CPUs) periods are scored and evaluated
+    concurrently on a process pool that receives the model once per worker;
+    an existing ``executor`` can be passed instead. Parallel runs do not
+    consult ``store``. Rows are always returned in ``time_periods`` order.
+    """
+
+    if not (len(X_snapshots) == len(y_snapshots) == len(time_periods)):
+        raise ValueError("X_snapshots, y_snapshots, and time_periods must have the same length.")
+
+    if n_jobs is not None and n_jobs < 0:
+        n_jobs = os.cpu_count() or 1
+
+    if executor is not None:
+        results = list(executor.map(_drift_period, repeat(model), X_snapshots, y_snapshots, time_periods))
+    elif n_jobs is not None and n_jobs > 1 and len(X_snapshots) > 1:
+        with ProcessPoolExecutor(max_workers=min(n_jobs, len(X_snapshots)),
+                                 initializer=_init_drift_worker, initargs=(model,)) as pool:
+            results = list(pool.map(_drift_period_worker, X_snapshots, y_snapshots, time_periods))
+    else:
+        results = [_drift_period(model, X, y, time_period, store)
+                   for X, y, time_period in zip(X_snapshots, y_snapshots, time_periods)]
+
+    return pd.DataFrame(results, columns=['time_period', 'auc', 'gini'])
+
+import pandas as pd
+import numpy as np
+
+@instrumented
+def perform_sensitivity_analysis(model, X, top_drivers, perturbation, store=None):
+    """Performs sensitivity analysis by perturbing top model drivers.
+
+    Baseline predictions are read from ``store`` (a PredictionStore) when given.
+    """
+    results = []
+    X_original = X.copy()
+    if store is None:
+        original_predictions = model.predict(X_original)
+    else:
+        original_predictions = store.score(model, X_original, method="predict")
+
+    for driver in top_drivers:
+        X_perturbed = X.copy()
+        X_perturbed[driver] = X_perturbed[driver] * (1 + perturbation)
+        perturbed_predictions = model.predict(X_perturbed)
+        delta_pd = perturbed_predictions - original_predictions
+        results.append(np.mean(delta_pd))  # Use mean change as the sensitivity metric
+
+    df = pd.DataFrame(results, index=top_drivers, columns=['delta_PD'])
+    return df
+
+def _score_positive(model, X, method):
+    scores = np.asarray(getattr(model, method)(X))
+    return scores[:, 1] if method == "predict_proba" and scores.ndim == 2 else scores
+
+@instrumented
+def perform_sensitivity_grid(model, X, top_drivers, shocks=(-0.05, 0.05), chunk_size=200_000,
+                             method="predict_proba", store=None):
+    """Performs batched sensitivity analysis over a drivers x shocks grid.
+
+    All shocked variants of a block of rows are written into one preallocated
+    array (scenarios stacked row-wise) and scored with a single call, so no
+    DataFrame copy is made per scenario and the number of scoring calls is
+    ``ceil(len(X) * n_scenarios / chunk_size)``.
+
+    Args:
+        model: Model exposing ``method`` (``predict_proba`` or ``predict``).
+        X (pandas.DataFrame): Portfolio to perturb.
+        top_drivers (list): Columns of ``X`` to shock.
+        shocks (sequence): Relative shocks, e.g. ``(-0.05, 0.05)`` for the ±5% tornado.
+        chunk_size (int): Maximum number of rows per scoring call.
+        method (str): Scoring method; the positive-class column is used for ``predict_proba``.
+        store (PredictionStore): Optional cache for the baseline scores.
+    Returns:
+        pandas.DataFrame: Tidy tornado table with ``driver``, ``shock``,
+        ``direction`` and mean ``delta_PD`` columns, one row per scenario.
+    """
+    columns = ['driver', 'shock', 'direction', 'delta_PD']
+    shocks = np.asarray(shocks, dtype=np.float64)
+    if len(top_drivers) == 0 or len(shocks) == 0 or len(X) == 0:
+        return pd.DataFrame(columns=columns)
+    driver_idx = X.columns.get_indexer(top_drivers)
+    if np.any(driver_idx < 0):
+        missing = [d for d, i in zip(top_drivers, driver_idx) if i < 0]
+        raise KeyError(f"Drivers not found in X: {missing}")
+
+    values = X.to_numpy()
+    n_rows, n_features = values.shape
+    scenario_driver = np.repeat(driver_idx, len(shocks))
+    scenario_factor = np.tile(1 + shocks, len(top_drivers))
+    n_scenarios = len(scenario_driver)
+
+    if store is None:
+        baseline = _score_positive(model, X, method)
+    else:
+        baseline = store.score(model, X, method=method)
+
+    block_rows = max(1, min(n_rows, chunk_size // n_scenarios))
+    buffer = np.empty((n_scenarios * block_rows, n_features), dtype=np.promote_types(values.dtype, np.float64))
+    delta_sums = np.zeros(n_scenarios)
+    scenario_ids = np.arange(n_scenarios)
+
+    for start in range(0, n_rows, block_rows):
+        block = values[start:start + block_rows]
+        m = len(block)
+        grid = buffer[:n_scenarios * m].reshape(n_scenarios, m, n_features)
+        grid[:] = block
+        grid[scenario_ids, :, scenario_driver] = block[:, scenario_driver].T * scenario_factor[:, None]
+        frame = pd.DataFrame(buffer[:n_scenarios * m], columns=X.columns, copy=False)
+        scores = _score_positive(model, frame, method).reshape(n_scenarios, m)
+        delta_sums += (scores - baseline[start:start + m]).sum(axis=1)
+
+    shock_values = np.tile(shocks, len(top_drivers))
+    return pd.DataFrame({
+        'driver': np.repeat(list(top_drivers), len(shocks)),
+        'shock': shock_values,
+        'direction': np.where(shock_values < 0, 'down', np.where(shock_values > 0, 'up', 'none')),
+        'delta_PD': delta_sums / n_rows,
+    }, columns=columns)
@@ -0,0 +1,379 @@
+"""Portfolio-wide validation: many models x shared datasets on a process pool."""
+
+__all__ = [
+    "SharedFrame",
+    "run_portfolio_validation",
+]
+
+from .instrumentation import instrumented
+
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
+import numpy as np
+import pandas as pd
+
+from .io import load_data, load_model_cached
+from .metrics import (calculate_auc_gini, generate_calibration_curve, perform_hosmer_lemeshow_test,
+                      perform_sensitivity_grid)
+from .stability import compute_psi_matrix
+
+_SHARED_ALIGNMENT = 64
+
+class SharedFrame:
+    """A DataFrame whose columns live in one ``multiprocessing.shared_memory`` block.
+
+    Pickling a SharedFrame sends only the block name and column layout, so
+    worker processes attach to the same memory instead of receiving a copy.
+    ``to_frame()`` returns a DataFrame of read-only views (no copy for numeric
+    columns). Non-numeric columns are stored as category codes and come back
+    as ``pandas.Categorical``. The creating process owns the block: use the
+    frame as a context manager, or call ``close()`` and ``unlink()``.
+    """
+
+    def __init__(self, name, layout, n_rows, size):
+        self.name = name
+        self.layout = layout
+        self.n_rows = n_rows
+        self.size = size
+        self._shm = None
+        self._owner = False
+
+    @classmethod
+    def from_frame(cls, df):
+        """Copies ``df`` into a new shared memory block."""
+        columns = []
+        offset = 0
+        for column in df.columns:
+            series = df[column]
+            categories = ordered = None
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                values = series.cat.codes.to_numpy()
+                categories, ordered = list(series.cat.categories), series.cat.ordered
+            elif pd.api.types.is_numeric_dtype(series.dtype) or pd.api.types.is_bool_dtype(series.dtype):
+                values = series.to_numpy()
+            else:
+                codes, uniques = pd.factorize(series)
+                values, categories, ordered = codes.astype(np.int32), list(uniques), False
+            values = np.ascontiguousarray(values)
+            if values.dtype.hasobject:
+                raise TypeError(f"Column {column!r} cannot be placed in shared memory.")
+            offset = -(-offset // _SHARED_ALIGNMENT) * _SHARED_ALIGNMENT
+            columns.append((column, values, offset, categories, ordered))
+            offset += values.nbytes
+        size = max(offset, 1)
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        layout = []
+        for column, values, start, categories, ordered in columns:
+            np.ndarray(values.shape, values.dtype, buffer=shm.buf, offset=start)[:] = values
+            layout.append((column, values.dtype.str, start, categories, ordered))
+        frame = cls(shm.name, layout, len(df), size)
+        frame._shm, frame._owner = shm, True
+        return frame
+
+    def __getstate__(self):
+        return {"name": self.name, "layout": self.layout, "n_rows": self.n_rows, "size": self.size}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def _attach(self):
+        if self._shm is None:
+            if sys.version_info >= (3, 13):
+                self._shm = shared_memory.SharedMemory(name=self.name, track=False)
+            else:
+                self._shm = shared_memory.SharedMemory(name=self.name)
+                # Only the owner may unlink; stop this process's tracker from doing it at exit.
+                resource_tracker.unregister(self._shm._name, "shared_memory")
+        return self._shm
+
+    def column(self, name):
+        """Returns one column as a read-only NumPy view (category codes for categoricals)."""
+        for column, dtype, start, _, _ in self.layout:
+            if column == name:
+                view = np.ndarray(self.n_rows, np.dtype(dtype), buffer=self._attach().buf, offset=start)
+                view.flags.writeable = False
+                return view
+        raise KeyError(name)
+
+    def to_frame(self, columns=None):
+        """Returns the data as a DataFrame backed by the shared block."""
+        wanted = None if columns is None else set(columns)
+        data = {}
+        for column, _, _, categories, ordered in self.layout:
+            if wanted is not None and column not in wanted:
+                continue
+            values = self.column(column)
+            if categories is not None:
+                values = pd.Categorical.from_codes(values, categories=categories, ordered=ordered)
+            data[column] = values
+        frame = pd.DataFrame(data, copy=False)
+        return frame if columns is None else frame[list(columns)]
+
+    def close(self):
+        if self._shm is not None:
+            self._shm.close()
+            self._shm = None
+
+    def unlink(self):
+        """Frees the block; only valid in the process that created it."""
+        if not self._owner:
+            raise RuntimeError("Only the process that created a SharedFrame can unlink it.")
+        shm = self._attach()
+        self.close()
+        shm.unlink()
+        self._owner = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._owner:
+            self.unlink()
+        else:
+            self.close()
+
+class _ScoreCache:
+    """Minimal PredictionStore stand-in serving one model's precomputed scores."""
+
+    def __init__(self, model, X, scores):
+        self._key = (id(model), id(X))
+        self._scores = scores
+
+    def score(self, model, X, method="predict_proba"):
+        if (id(model), id(X)) == self._key and method == "predict_proba":
+            return self._scores
+        scores = np.asarray(getattr(model, method)(X))
+        return scores[:, 1] if method == "predict_proba" and scores.ndim == 2 else scores
+
+def _portfolio_auc_gini(ctx):
+    auc, gini = calculate_auc_gini(ctx["model"], ctx["X"], ctx["y"], store=ctx["store"])
+    return [(None, "auc", auc), (None, "gini", gini)]
+
+def _portfolio_hosmer_lemeshow(ctx):
+    options = ctx["options"]
+    statistic, p_value = perform_hosmer_lemeshow_test(ctx["y"], ctx["scores"], options.get("n_groups", 10),
+                                                      grouping=options.get("hl_grouping", "quantile"))
+    return [(None, "statistic", statistic), (None, "p_value", p_value)]
+
+def _portfolio_calibration(ctx):
+    bin_means, bin_proportions = generate_calibration_curve(ctx["y"], ctx["scores"], ctx["options"].get("n_bins", 10))
+    rows = []
+    for i, (mean_pd, default_rate) in enumerate(zip(bin_means, bin_proportions)):
+        rows += [(f"bin_{i + 1}", "mean_pd", mean_pd), (f"bin_{i + 1}", "default_rate", default_rate)]
+    return rows
+
+def _portfolio_psi(ctx):
+    baseline = ctx["baseline_scores"]
+    mapper = ctx["options"].get("grade_mapper")
+    if mapper is not None:
+        expected, actual = mapper.counts(baseline).to_numpy(), mapper.counts(ctx["scores"]).to_numpy()
+    else:
+        n_bins = ctx["options"].get("psi_bins", 10)
+        edges = np.unique(np.quantile(baseline, np.linspace(0, 1, n_bins + 1)[1:-1]))
+        expected = np.bincount(np.searchsorted(edges, baseline, side="right"), minlength=len(edges) + 1)
+        actual = np.bincount(np.searchsorted(edges, ctx["scores"], side="right"), minlength=len(edges) + 1)
+    psi = compute_psi_matrix(expected[None, :], actual[None, :], epsilon=1e-4)[0, 0]
+    return [(None, "psi", psi)]
+
+def _portfolio_sensitivity(ctx):
+    options = ctx["options"]
+    grid = perform_sensitivity_grid(ctx["model"], ctx["X"], options["top_drivers"],
+                                    shocks=options.get("shocks", (-0.05, 0.05)), store=ctx["store"])
+    return [(f"{row.driver}@{row.shock:+g}", "delta_PD", row.delta_PD) for row in grid.itertuples(index=False)]
+
+PORTFOLIO_TESTS = {
+    "auc_gini": _portfolio_auc_gini,
+    "hosmer_lemeshow": _portfolio_hosmer_lemeshow,
+    "calibration": _portfolio_calibration,
+    "psi": _portfolio_psi,
+    "sensitivity": _portfolio_sensitivity,
+}
+
+_PORTFOLIO_WORKER = {}
+
+def _init_portfolio_worker(models, datasets, options):
+    _PORTFOLIO_WORKER.clear()
+    _PORTFOLIO_WORKER.update(models=models, datasets=datasets, options=options, frames={}, scores={})
+
+def _worker_model(name):
+    model = _PORTFOLIO_WORKER["models"][name]
+    return load_model_cached(model) if isinstance(model, (str, os.PathLike)) else model
+
+def _worker_frame(name):
+    frames = _PORTFOLIO_WORKER["frames"]
+    if name not in frames:
+        dataset = _PORTFOLIO_WORKER["datasets"][name]
+        options = _PORTFOLIO_WORKER["options"]
+        frame = dataset.to_frame() if isinstance(dataset, SharedFrame) else dataset
+        frames[name] = (frame[options["feature_cols"]], frame[options["target_col"]].to_numpy())
+    return frames[name]
+
+def _worker_scores(model_name, dataset_name):
+    # Each task carries every job of one (model, dataset) pair, so a pair is scored once; PSI's
+    # baseline pair is scored again only in workers that have not handled it yet.
+    scores = _PORTFOLIO_WORKER["scores"]
+    key = (model_name, dataset_name)
+    if key not in scores:
+        X, _ = _worker_frame(dataset_name)
+        scores[key] = np.asarray(_worker_model(model_name).predict_proba(X))[:, 1]
+    return scores[key]
+
+def _run_portfolio_job(job):
+    model_name, dataset_name, test = job
+    options = _PORTFOLIO_WORKER["options"]
+    try:
+        model = _worker_model(model_name)
+        X, y = _worker_frame(dataset_name)
+        scores = _worker_scores(model_name, dataset_name)
+        ctx = {"model": model, "X": X, "y": y, "scores": scores, "store": _ScoreCache(model, X, scores),
+               "options": options}
+        if test == "psi":
+            ctx["baseline_scores"] = _worker_scores(model_name, options["baseline"])
+        rows = PORTFOLIO_TESTS[test](ctx)
+        return [(model_name, dataset_name, test, item, metric, float(value), None) for item, metric, value in rows]
+    except Exception as e:
+        return [(model_name, dataset_name, test, None, "error", np.nan, f"{type(e).__name__}: {e}")]
+
+def _run_portfolio_pair(jobs):
+    """Runs the jobs of one (model, dataset) pair and returns their rows, job by job."""
+    return [_run_portfolio_job(job) for job in jobs]
+
+# Options that change each test's result; everything else is left out of its cache key.
+_PORTFOLIO_TEST_OPTIONS = {
+    "auc_gini": (),
+    "hosmer_lemeshow": ("n_groups",),
+    "calibration": ("n_bins",),
+    "psi": ("psi_bins", "grade_mapper"),
+    "sensitivity": ("top_drivers", "shocks"),
+}
+
+def _portfolio_fingerprints(cache, objects):
+    """Digests each model or dataset once per run: name -> (digest or None, source files)."""
+    fingerprints = {}
+    for name, value in objects.items():
+        sources = set()
+        fingerprints[name] = (cache.digest("run_portfolio_validation.input", {"value": value}, sources), sources)
+    return fingerprints
+
+def _portfolio_job_key(cache, model_digests, dataset_digests, options, job):
+    model_name, dataset_name, test = job
+    inputs = {"model": model_digests[model_name], "dataset": dataset_digests[dataset_name]}
+    if test == "psi":
+        inputs["baseline"] = dataset_digests[options["baseline"]]
+    if any(digest is None for digest, _ in inputs.values()):
+        return None, set()
+    params = {"target_col": options["target_col"], "feature_cols": options["feature_cols"]}
+    params.update((option, options[option]) for option in _PORTFOLIO_TEST_OPTIONS[test])
+    sources = set().union(*(input_sources for _, input_sources in inputs.values()))
+    fingerprints = {param: digest for param, (digest, _) in inputs.items()}
+    return cache.digest(f"run_portfolio_validation.{test}", params, fingerprints=fingerprints), sources
+
+@instrumented
+def run_portfolio_validation(models, datasets, target_col, feature_cols=None, tests=None, baseline=None,
+                             n_jobs=None, top_drivers=None, shocks=(-0.05, 0.05), n_groups=10, n_bins=10,
+                             psi_bins=10, grade_mapper=None, cache=None):
+    """Runs validation tests for every model on every dataset and returns one table.
+
+    Each dataset is copied once into shared memory (``SharedFrame``) and the
+    jobs are fanned out to a process pool, one task per (model, dataset) pair,
+    whose workers attach to the blocks without copying them. Each pair is
+    scored once and its scores are reused across its tests.
+
+    Args:
+        models (dict): Model name to fitted model or ``.pkl`` path (paths are
+            loaded in each worker through the artifact cache).
+        datasets (dict): Dataset name (e.g. ``"oot"``, ``"2024Q1"``) to
+            DataFrame or CSV path.
+        target_col (str): Binary default flag column.
+        feature_cols (list): Model input columns; defaults to all but the target.
+        tests (list): Names from ``PORTFOLIO_TESTS``: ``auc_gini``,
+            ``hosmer_lemeshow``, ``calibration``, ``psi`` and ``sensitivity``.
+            Defaults to all of them, without ``sensitivity`` when no
+            ``top_drivers`` are given.
+        baseline (str): Dataset that PSI compares against; defaults to the first dataset.
+        n_jobs (int): Worker processes; ``None`` or 1 runs serially, -1 uses all CPUs.
+        top_drivers (list): Columns shocked by the sensitivity test.
+        shocks (sequence): Relative shocks for the sensitivity test.
+        n_groups (int): Hosmer-Lemeshow quantile groups.
+        n_bins (int): Calibration curve bins.
+        psi_bins (int): Baseline score quantile bins for PSI when no ``grade_mapper`` is given.
+        grade_mapper (GradeMapper): Computes PSI over rating grades instead of score bins.
+        cache (ResultCache): Serves (model, dataset, test) results whose model,
+            data and options are unchanged from disk; only the remaining
+            datasets are loaded and validated. Each model and dataset is
+            fingerprinted once per call; those given as paths are keyed by
+            their file hashes.
+    Returns:
+        pandas.DataFrame: Long table with ``model``, ``dataset``, ``test``,
+        ``item`` (bin or driver@shock, else None), ``metric``, ``value`` and
+        ``error`` (message of a failed job, else None).
+    """
+    if tests is None:
+        tests = [t for t in PORTFOLIO_TESTS if t != "sensitivity" or top_drivers is not None]
+    unknown = [t for t in tests if t not in PORTFOLIO_TESTS]
+    if unknown:
+        raise ValueError(f"Unknown portfolio tests: {unknown}")
+    if "sensitivity" in tests and not top_drivers:
+        raise ValueError("The sensitivity test requires top_drivers.")
+    if not models or not datasets:
+        raise ValueError("At least one model and one dataset are required.")
+    baseline = next(iter(datasets)) if baseline is None else baseline
+    if baseline not in datasets:
+        raise KeyError(f"Unknown baseline dataset: {baseline}")
+
+    options = {"target_col": target_col, "feature_cols": feature_cols, "baseline": baseline,
+               "top_drivers": top_drivers, "shocks": shocks, "n_groups": n_groups, "n_bins": n_bins,
+               "psi_bins": psi_bins, "grade_mapper": grade_mapper}
+    all_jobs = [(model, dataset, test) for model in models for dataset in datasets for test in tests]
+    columns = ["model", "dataset", "test", "item", "metric", "value", "error"]
+    results = dict.fromkeys(all_jobs)
+    keys = {}
+    if cache is not None:
+        model_digests, dataset_digests = _portfolio_fingerprints(cache, models), _portfolio_fingerprints(cache, datasets)
+        for job in all_jobs:
+            keys[job] = _portfolio_job_key(cache, model_digests, dataset_digests, options, job)
+            cached = cache.get(keys[job][0]) if keys[job][0] is not None else None
+            if cached is not None:
+                results[job] = [job + tuple(values) + (None,) for values in cached]
+    jobs = [job for job in all_jobs if results[job] is None]
+    needed = {dataset for _, dataset, _ in jobs} | {baseline for *_, test in jobs if test == "psi"}
+
+    if jobs:
+        frames = {name: load_data(data) if isinstance(data, (str, os.PathLike)) else data
+                  for name, data in datasets.items() if name in needed}
+        first = frames[next(name for name in datasets if name in frames)]
+        if feature_cols is None:
+            feature_cols = [c for c in first.columns if c != target_col]
+        options = dict(options, feature_cols=list(feature_cols))
+        if n_jobs is not None and n_jobs < 0:
+            n_jobs = os.cpu_count() or 1
+        pairs = {}
+        for job in jobs:
+            pairs.setdefault(job[:2], []).append(job)
+        pairs = list(pairs.values())
+        if n_jobs is None or n_jobs <= 1 or len(pairs) <= 1:
+            _init_portfolio_worker(models, frames, options)
+            try:
+                computed = [_run_portfolio_pair(pair) for pair in pairs]
+            finally:
+                _PORTFOLIO_WORKER.clear()
+        else:
+            shared = {}
+            try:
+                for name, frame in frames.items():
+                    columns_used = list(dict.fromkeys(options["feature_cols"] + [target_col]))
+                    shared[name] = SharedFrame.from_frame(frame[columns_used])
+                with ProcessPoolExecutor(max_workers=min(n_jobs, len(pairs)), initializer=_init_portfolio_worker,
+                                         initargs=(models, shared, options)) as pool:
+                    computed = list(pool.map(_run_portfolio_pair, pairs))
+            finally:
+                for frame in shared.values():
+                    frame.unlink()
+        for job, rows in zip((job for pair in pairs for job in pair), (rows for pair in computed for rows in pair)):
+            results[job] = rows
+            key, sources = keys.get(job, (None, None))
+            if key is not None and all(row[-1] is None for row in rows):
+                cache.put(key, [row[3:6] for row in rows], "run_portfolio_validation", sources)
+    return pd.DataFrame([row for job in all_jobs for row in results[job]], columns=columns)
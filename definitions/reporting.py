@@ -0,0 +1,189 @@
+"""PDF validation reports (ReportLab)."""
+
+__all__ = [
+    "generate_validation_report",
+    "generate_validation_reports",
+]
+
+from .instrumentation import instrumented
+
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import islice
+import pandas as pd
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.units import inch
+from reportlab.lib.utils import ImageReader
+from reportlab.graphics.shapes import Drawing, String
+from reportlab.graphics.charts.linecharts import HorizontalLineChart
+
+
+@lru_cache(maxsize=1)
+def _report_styles():
+    """Returns the shared ReportLab stylesheet, built once per process."""
+    return getSampleStyleSheet()
+
+@lru_cache(maxsize=8)
+def _report_logo(logo_path):
+    """Returns the logo file bytes and aspect ratio, read once per process."""
+    with open(logo_path, "rb") as f:
+        payload = f.read()
+    width, height = ImageReader(io.BytesIO(payload)).getSize()
+    return payload, height / width
+
+_TABLE_STYLE = TableStyle([
+    ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#1f3b57")),
+    ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
+    ("FONTSIZE", (0, 0), (-1, -1), 8),
+    ("GRID", (0, 0), (-1, -1), 0.25, colors.grey),
+    ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, colors.HexColor("#f2f4f7")]),
+])
+
+class _StreamingStory(list):
+    """Flowable list that ReportLab consumes from the front, refilled lazily from a generator.
+
+    Only ``lookahead`` flowables are materialized at a time, so memory does
+    not grow with the length of the report's tables.
+    """
+
+    def __init__(self, flowables, lookahead=16):
+        super().__init__()
+        self._source = iter(flowables)
+        self._lookahead = lookahead
+        self._refill()
+
+    def _refill(self):
+        while list.__len__(self) < self._lookahead:
+            try:
+                list.append(self, next(self._source))
+            except StopIteration:
+                break
+
+    def __len__(self):
+        self._refill()
+        return list.__len__(self)
+
+    def __delitem__(self, key):
+        list.__delitem__(self, key)
+        self._refill()
+
+def _format_cell(value):
+    return f"{value:.4f}" if isinstance(value, float) else str(value)
+
+def _table_flowables(title, table, styles, rows_per_table):
+    """Yields a heading and the table as row blocks of at most ``rows_per_table`` rows.
+
+    ``table`` is a DataFrame or an iterable of DataFrame chunks.
+    """
+    yield Paragraph(title, styles['h2'])
+    chunks = [table] if isinstance(table, pd.DataFrame) else table
+    for chunk in chunks:
+        frame = chunk.reset_index() if chunk.index.name is not None or isinstance(chunk.index, pd.MultiIndex) else chunk
+        header = [str(c) for c in frame.columns]
+        rows = frame.itertuples(index=False, name=None)
+        while True:
+            block = [[_format_cell(v) for v in row] for row in islice(rows, rows_per_table)]
+            if not block:
+                break
+            yield Table([header] + block, repeatRows=1, style=_TABLE_STYLE, hAlign="LEFT")
+    yield Spacer(1, 0.2 * inch)
+
+def _chart_flowable(title, series, width=6.5 * inch, height=2.5 * inch):
+    """Returns a line chart Drawing for a Series (or dict of Series sharing one index)."""
+    lines = series if isinstance(series, dict) else {title: series}
+    index = list(next(iter(lines.values())).index) if lines else []
+    drawing = Drawing(width, height)
+    chart = HorizontalLineChart()
+    chart.x, chart.y = 40, 30
+    chart.width, chart.height = width - 60, height - 60
+    chart.data = [[float(v) for v in s.to_numpy()] for s in lines.values()]
+    chart.categoryAxis.categoryNames = [str(i) for i in index]
+    chart.categoryAxis.labels.fontSize = 7
+    chart.valueAxis.labels.fontSize = 7
+    palette = [colors.HexColor("#1f77b4"), colors.HexColor("#d62728"), colors.HexColor("#2ca02c")]
+    for i in range(len(chart.data)):
+        chart.lines[i].strokeColor = palette[i % len(palette)]
+    drawing.add(chart)
+    drawing.add(String(40, height - 15, title, fontSize=10))
+    return drawing
+
+def _report_flowables(data, styles, logo_path, static_sections, rows_per_table):
+    if logo_path:
+        payload, aspect = _report_logo(logo_path)
+        yield Image(io.BytesIO(payload), width=1.5 * inch, height=1.5 * inch * aspect, hAlign="LEFT")
+    yield Paragraph(data.get("title", "Model Validation Report"), styles['h1'])
+    for key, value in data.items():
+        if key not in ("title", "tables", "charts"):
+            yield Paragraph(f"{key}: {value}", styles['Normal'])
+    for title, series in data.get("charts", {}).items():
+        yield _chart_flowable(title, series)
+    for title, table in data.get("tables", {}).items():
+        yield from _table_flowables(title, table, styles, rows_per_table)
+    for heading, text in static_sections or ():
+        yield Paragraph(heading, styles['h2'])
+        yield Paragraph(text, styles['Normal'])
+
+@instrumented
+def generate_validation_report(data, output_path, logo_path=None, static_sections=None, rows_per_table=250):
+    """Generates model validation report in .pdf format.
+
+    Besides scalar key/value entries, ``data`` may contain ``"title"``,
+    ``"tables"`` (mapping of title to a DataFrame or an iterable of DataFrame
+    chunks, e.g. per-grade or per-quarter results) and ``"charts"`` (mapping
+    of title to a Series, or a dict of Series, plotted as lines). Long tables
+    are emitted in blocks of ``rows_per_table`` rows and fed to ReportLab
+    lazily, so memory stays bounded. ``static_sections`` is a list of
+    (heading, text) pairs appended to every report.
+    """
+    try:
+        doc = SimpleDocTemplate(output_path, pagesize=letter)
+        styles = _report_styles()
+        story = _StreamingStory(_report_flowables(data, styles, logo_path, static_sections, rows_per_table))
+        doc.build(story)
+    except Exception as e:
+        raise Exception(f"Error generating PDF report: {e}")
+
+_REPORT_WORKER_OPTIONS = {}
+
+def _init_report_worker(options):
+    _REPORT_WORKER_OPTIONS.update(options)
+    # Warm the per-process caches once instead of once per report.
+    _report_styles()
+    if options.get("logo_path"):
+        _report_logo(options["logo_path"])
+
+def _render_report_job(job):
+    data, output_path = job
+    generate_validation_report(data, output_path, **_REPORT_WORKER_OPTIONS)
+    return output_path
+
+@instrumented
+def generate_validation_reports(jobs, n_jobs=None, logo_path=None, static_sections=None, rows_per_table=250):
+    """Renders many validation reports, optionally in parallel worker processes.
+
+    Args:
+        jobs (iterable): (data, output_path) pairs, one per report.
+        n_jobs (int): Worker processes; ``None`` or 1 renders serially, -1 uses all CPUs.
+        logo_path (str): Logo drawn on every report, decoded once per process.
+        static_sections (list): (heading, text) pairs shared by every report.
+        rows_per_table (int): Maximum rows per rendered table block.
+    Returns:
+        list: Output paths in the order of ``jobs``.
+    """
+    options = {"logo_path": logo_path, "static_sections": static_sections, "rows_per_table": rows_per_table}
+    jobs = list(jobs)
+    if n_jobs is not None and n_jobs < 0:
+        n_jobs = os.cpu_count() or 1
+    if n_jobs is None or n_jobs <= 1 or len(jobs) <= 1:
+        for data, path in jobs:
+            generate_validation_report(data, path, **options)
+        return [path for _, path in jobs]
+    with ProcessPoolExecutor(max_workers=min(n_jobs, len(jobs)), initializer=_init_report_worker,
+                             initargs=(options,)) as pool:
+        return list(pool.map(_render_report_job, jobs))
@@ -0,0 +1,441 @@
+"""Population and characteristic stability (PSI/CSI)."""
+
+__all__ = [
+    "compute_psi",
+    "compute_overall_psi",
+    "compute_psi_matrix",
+    "characteristic_bin_edges",
+    "characteristic_bin_counts",
+    "compute_csi_table",
+    "PopulationProfile",
+    "GradeMapper",
+    "load_grade_mapper",
+]
+
+from .instrumentation import instrumented
+
+import pandas as pd
+import numpy as np
+
+@instrumented
+def compute_psi(expected, actual, grade_names):
+    """Computes the Population Stability Index (PSI) for each rating grade.
+    Args:
+        expected (pandas.Series): The expected distribution of rating grades.
+        actual (pandas.Series): The actual distribution of rating grades.
+        grade_names (list): List of rating grade names.
+    Output:
+        pandas.DataFrame: A DataFrame containing the PSI for each grade.
+    Raises:
+        ValueError: If expected or actual contains zero values, or if the grade names are mismatched.
+    """
+
+    if any(expected <= 0):
+        raise ValueError("Expected distribution contains zero values.")
+    if any(actual <= 0):
+        raise ValueError("Actual distribution contains zero values.")
+    if len(expected) != len(actual):
+        raise ValueError("Mismatched number of grades between expected and actual.")
+    if not all(expected.index == actual.index):
+        raise ValueError("Grade names are mismatched between expected and actual distributions.")
+
+    expected_pct = expected[grade_names].to_numpy(dtype=float)
+    actual_pct = actual[grade_names].to_numpy(dtype=float)
+    psi_values = (actual_pct - expected_pct) * np.log(actual_pct / expected_pct)
+
+    result = pd.DataFrame({'Grade': grade_names, 'PSI': psi_values})
+    result = result.set_index('Grade')
+    return result
+
+import numpy as np
+
+@instrumented
+def compute_overall_psi(expected, actual):
+    """Computes the overall Population Stability Index (PSI)."""
+
+    expected = np.array(expected)
+    actual = np.array(actual)
+
+    if np.any(expected == 0) or np.any(actual == 0):
+        raise ValueError("PSI is infinite when a bin has zero expected or actual count.")
+
+    psi_summary = (actual - expected) * np.log(actual / expected)
+    psi = np.sum(psi_summary)
+
+    return psi
+
+import numpy as np
+import pandas as pd
+
+@instrumented
+def compute_psi_matrix(expected_counts, actual_counts, epsilon=None):
+    """Computes PSI for every characteristic and period in one NumPy expression.
+
+    Args:
+        expected_counts (array-like): Baseline counts of shape (characteristics, bins),
+            or (characteristics, bins, periods) for a per-period reference.
+        actual_counts (array-like): Counts of shape (characteristics, bins, periods);
+            a 2-D array is treated as a single period.
+        epsilon (float): If given, bin percentages are floored at ``epsilon``
+            instead of raising on empty bins. Bins empty in both distributions
+            then contribute zero.
+    Returns:
+        numpy.ndarray: PSI values of shape (characteristics, periods).
+    Raises:
+        ValueError: If shapes are incompatible, or a bin is empty and ``epsilon`` is not set.
+    """
+    expected = np.asarray(expected_counts, dtype=np.float64)
+    actual = np.asarray(actual_counts, dtype=np.float64)
+    if actual.ndim == 2:
+        actual = actual[:, :, None]
+    if expected.ndim == 2:
+        expected = expected[:, :, None]
+    if expected.ndim != 3 or actual.ndim != 3:
+        raise ValueError("Counts must be 2-D (characteristics, bins) or 3-D (characteristics, bins, periods).")
+    if expected.shape[:2] != actual.shape[:2] or expected.shape[2] not in (1, actual.shape[2]):
+        raise ValueError("Mismatched characteristic, bin or period dimensions between expected and actual.")
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        expected_pct = expected / expected.sum(axis=1, keepdims=True)
+        actual_pct = actual / actual.sum(axis=1, keepdims=True)
+    if epsilon is not None:
+        expected_pct = np.maximum(np.nan_to_num(expected_pct), epsilon)
+        actual_pct = np.maximum(np.nan_to_num(actual_pct), epsilon)
+    elif np.any(~(expected_pct > 0)) or np.any(~(actual_pct > 0)):
+        raise ValueError("PSI is infinite when a bin has zero expected or actual count.")
+
+    return np.sum((actual_pct - expected_pct) * np.log(actual_pct / expected_pct), axis=1)
+
+@instrumented
+def characteristic_bin_edges(baseline, columns=None, n_bins=10):
+    """Derives quantile bin edges per characteristic from the development baseline.
+
+    Returns a dict mapping each column to its interior edges. Duplicate
+    quantiles are collapsed, so low-cardinality columns get one bin per value.
+    """
+    columns = list(baseline.columns) if columns is None else list(columns)
+    quantiles = np.linspace(0, 1, n_bins + 1)[1:-1]
+    edges = {}
+    for col in columns:
+        values = baseline[col].to_numpy(dtype=np.float64)
+        values = values[~np.isnan(values)]
+        edges[col] = np.unique(np.quantile(values, quantiles)) if len(values) else np.empty(0)
+    return edges
+
+@instrumented
+def characteristic_bin_counts(data, edges):
+    """Counts observations per (characteristic, bin) using precomputed edges.
+
+    The last bin of every characteristic holds missing values; characteristics
+    with fewer edges leave their unused bins empty.
+
+    Returns:
+        numpy.ndarray: int64 counts of shape (characteristics, bins).
+    """
+    columns = list(edges)
+    n_bins = max((len(e) for e in edges.values()), default=0) + 2
+    counts = np.zeros((len(columns), n_bins), dtype=np.int64)
+    for i, col in enumerate(columns):
+        values = data[col].to_numpy(dtype=np.float64)
+        ids = np.searchsorted(edges[col], values, side="right")
+        ids[np.isnan(values)] = n_bins - 1
+        counts[i] = np.bincount(ids, minlength=n_bins)
+    return counts
+
+@instrumented
+def compute_csi_table(baseline, snapshots, time_periods, columns=None, n_bins=10, epsilon=1e-4):
+    """Computes the characteristic stability index (PSI per input) for every period.
+
+    Args:
+        baseline (pandas.DataFrame): Development sample.
+        snapshots (list): One DataFrame per period.
+        time_periods (list): Period labels, one per snapshot.
+        columns (list): Characteristics to monitor; defaults to all baseline columns.
+        n_bins (int): Number of quantile bins derived from the baseline.
+        epsilon (float): Floor for empty-bin percentages.
+    Returns:
+        pandas.DataFrame: PSI with characteristics as rows and periods as columns.
+    """
+    if len(snapshots) != len(time_periods):
+        raise ValueError("snapshots and time_periods must have the same length.")
+    edges = characteristic_bin_edges(baseline, columns, n_bins)
+    expected = characteristic_bin_counts(baseline, edges)
+    if not snapshots:
+        return pd.DataFrame(index=pd.Index(list(edges), name="characteristic"))
+    actual = np.stack([characteristic_bin_counts(snapshot, edges) for snapshot in snapshots], axis=2)
+    psi = compute_psi_matrix(expected, actual, epsilon=epsilon)
+    return pd.DataFrame(psi, index=pd.Index(list(edges), name="characteristic"), columns=list(time_periods))
+
+import json
+from datetime import date, datetime
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+def _encode_period(period):
+    """Returns a JSON-safe (type, value) pair for a period label."""
+    if isinstance(period, pd.Period):
+        return ["period", str(period), period.freqstr]
+    if isinstance(period, (pd.Timestamp, datetime, date)):
+        return ["timestamp", pd.Timestamp(period).isoformat()]
+    if isinstance(period, (bool, np.bool_)):
+        raise TypeError(f"Unsupported period label: {period!r}")
+    if isinstance(period, (int, np.integer)):
+        return ["int", int(period)]
+    if isinstance(period, str):
+        return ["str", period]
+    raise TypeError(f"Period labels must be str, int, pandas.Period or timestamps, not {type(period).__name__}.")
+
+def _decode_period(encoded):
+    kind, value = encoded[0], encoded[1]
+    if kind == "period":
+        return pd.Period(value, freq=encoded[2])
+    if kind == "timestamp":
+        return pd.Timestamp(value)
+    return int(value) if kind == "int" else str(value)
+
+class PopulationProfile:
+    """Persistent development baseline plus per-period bin counts for incremental PSI.
+
+    Only bin counts are stored. Adding a snapshot (or one chunk of it) bins
+    just the new rows, and PSI queries for any period pair or rolling window
+    work on the (characteristics x bins) counts, so they cost O(bins)
+    regardless of portfolio size. Profiles round-trip through JSON with
+    ``save``/``load``; period labels may be str, int, ``pandas.Period`` or
+    timestamps and keep their type.
+    """
+
+    def __init__(self, edges, baseline_counts, period_counts=None):
+        self.edges = OrderedDict((col, np.asarray(e, dtype=np.float64)) for col, e in edges.items())
+        self.baseline_counts = np.asarray(baseline_counts, dtype=np.int64)
+        n_bins = max((len(e) for e in self.edges.values()), default=0) + 2
+        if self.baseline_counts.shape != (len(self.edges), n_bins):
+            raise ValueError("baseline_counts shape does not match the bin edges.")
+        self.period_counts = OrderedDict()
+        for period, counts in (period_counts or {}).items():
+            self.add_period(period, counts=counts)
+
+    @classmethod
+    def from_baseline(cls, baseline, columns=None, n_bins=10):
+        """Builds a profile with quantile edges and counts from the development sample."""
+        edges = characteristic_bin_edges(baseline, columns, n_bins)
+        return cls(edges, characteristic_bin_counts(baseline, edges))
+
+    @property
+    def characteristics(self):
+        return list(self.edges)
+
+    @property
+    def periods(self):
+        return list(self.period_counts)
+
+    @instrumented
+    def add_period(self, period, data=None, counts=None):
+        """Adds a snapshot's bin counts to ``period``.
+
+        Pass either raw rows as ``data`` or precomputed ``counts``. Calling this
+        repeatedly for the same period accumulates, so a snapshot can be
+        added chunk by chunk.
+        """
+        if (data is None) == (counts is None):
+            raise ValueError("Provide exactly one of data or counts.")
+        _encode_period(period)  # reject labels that would not survive save/load
+        if data is not None:
+            counts = characteristic_bin_counts(data, self.edges)
+        counts = np.asarray(counts, dtype=np.int64)
+        if counts.shape != self.baseline_counts.shape:
+            raise ValueError("counts shape does not match the profile's characteristics and bins.")
+        if period in self.period_counts:
+            self.period_counts[period] = self.period_counts[period] + counts
+        else:
+            self.period_counts[period] = counts
+        return self
+
+    def counts(self, period=None):
+        """Returns the counts for ``period``, or the baseline counts for ``None``."""
+        if period is None:
+            return self.baseline_counts
+        if period not in self.period_counts:
+            raise KeyError(f"Unknown period: {period}")
+        return self.period_counts[period]
+
+    def psi(self, period, reference=None, epsilon=1e-4):
+        """Returns PSI per characteristic for ``period`` against ``reference`` (baseline if None)."""
+        psi = compute_psi_matrix(self.counts(reference), self.counts(period), epsilon=epsilon)
+        return pd.Series(psi[:, 0], index=pd.Index(self.characteristics, name="characteristic"), name=period)
+
+    @instrumented
+    def psi_table(self, epsilon=1e-4):
+        """Returns PSI against the baseline for every stored period (characteristics x periods)."""
+        index = pd.Index(self.characteristics, name="characteristic")
+        if not self.period_counts:
+            return pd.DataFrame(index=index)
+        actual = np.stack(list(self.period_counts.values()), axis=2)
+        psi = compute_psi_matrix(self.baseline_counts, actual, epsilon=epsilon)
+        return pd.DataFrame(psi, index=index, columns=self.periods)
+
+    def rolling_psi(self, window, epsilon=1e-4):
+        """Returns PSI of each period against the pooled counts of the preceding ``window`` periods.
+
+        Periods without a full window of history are NaN.
+        """
+        if window <= 0:
+            raise ValueError("window must be positive.")
+        index = pd.Index(self.characteristics, name="characteristic")
+        if not self.period_counts:
+            return pd.DataFrame(index=index)
+        actual = np.stack(list(self.period_counts.values()), axis=2)
+        cumulative = np.concatenate([np.zeros_like(actual[:, :, :1]), np.cumsum(actual, axis=2)], axis=2)
+        psi = np.full((actual.shape[0], actual.shape[2]), np.nan)
+        if actual.shape[2] > window:
+            reference = cumulative[:, :, window:-1] - cumulative[:, :, :-window - 1]
+            psi[:, window:] = compute_psi_matrix(reference, actual[:, :, window:], epsilon=epsilon)
+        return pd.DataFrame(psi, index=index, columns=self.periods)
+
+    def to_dict(self):
+        return {
+            "edges": {col: e.tolist() for col, e in self.edges.items()},
+            "baseline_counts": self.baseline_counts.tolist(),
+            "periods": [{"period": _encode_period(p), "counts": c.tolist()} for p, c in self.period_counts.items()],
+        }
+
+    @classmethod
+    def from_dict(cls, payload):
+        period_counts = OrderedDict((_decode_period(entry["period"]), entry["counts"])
+                                    for entry in payload.get("periods", []))
+        return cls(payload["edges"], payload["baseline_counts"], period_counts)
+
+    def save(self, path):
+        """Writes the profile to a JSON file."""
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load(cls, path):
+        """Reads a profile written by ``save``."""
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+import os
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+
+class GradeMapper:
+    """Assigns rating grades to PDs from a master-scale cutoff table.
+
+    Grades are ordered from best to worst and grade ``i`` covers PDs in
+    ``(upper_bounds[i - 1], upper_bounds[i]]`` (``[upper_bounds[i - 1],
+    upper_bounds[i])`` with ``right=False``). The first grade starts at minus
+    infinity; an upper bound of NaN or ``inf`` on the last grade leaves it
+    open-ended. PDs that are NaN or above the last bound are unmapped
+    (code ``-1``) and left out of the counts.
+
+    Grading is vectorized (``np.searchsorted`` into the cutoffs, or one
+    comparison pass per bound for short scales) and returns compact ``int8``
+    codes (``int16`` beyond 126 grades).
+    """
+
+    _COMPARE_MAX_GRADES = 16
+
+    def __init__(self, grades, upper_bounds, right=True):
+        grades = list(grades)
+        bounds = np.asarray(upper_bounds, dtype=np.float64)
+        if len(grades) == 0 or len(grades) != len(bounds):
+            raise ValueError("grades and upper_bounds must be non-empty and of the same length.")
+        if len(set(grades)) != len(grades):
+            raise ValueError("Grade names must be unique.")
+        if np.isnan(bounds[:-1]).any():
+            raise ValueError("Only the last grade may have a missing upper bound.")
+        if np.isnan(bounds[-1]):
+            bounds[-1] = np.inf
+        if np.any(np.diff(bounds) <= 0):
+            raise ValueError("Grade upper bounds must be strictly increasing.")
+        self.grades = grades
+        self.upper_bounds = bounds
+        self.right = right
+        self.code_dtype = np.int8 if len(grades) < np.iinfo(np.int8).max else np.int16
+
+    @classmethod
+    def from_frame(cls, cutoffs, grade_col="grade", cutoff_col=None, right=True):
+        """Builds a mapper from a cutoff table; ``cutoff_col`` defaults to its only numeric column."""
+        if cutoff_col is None:
+            numeric = [c for c in cutoffs.select_dtypes("number").columns if c != grade_col]
+            if len(numeric) != 1:
+                raise ValueError(f"Cannot infer the cutoff column from {list(cutoffs.columns)}; pass cutoff_col.")
+            cutoff_col = numeric[0]
+        for column in (grade_col, cutoff_col):
+            if column not in cutoffs.columns:
+                raise KeyError(f"Column not found in cutoff table: {column}")
+        ordered = cutoffs.sort_values(cutoff_col, kind="mergesort", na_position="last")
+        return cls(ordered[grade_col].astype(str), ordered[cutoff_col], right=right)
+
+    @classmethod
+    def from_csv(cls, path, grade_col="grade", cutoff_col=None, right=True):
+        """Loads a cutoff table such as ``grade_cutoffs_v1.csv``."""
+        return cls.from_frame(pd.read_csv(path), grade_col, cutoff_col, right)
+
+    def to_frame(self):
+        return pd.DataFrame({"grade": self.grades, "pd_upper": self.upper_bounds})
+
+    @property
+    def n_grades(self):
+        return len(self.grades)
+
+    @instrumented
+    def codes(self, pd_values):
+        """Returns the grade position of each PD as a compact integer array (``-1`` = unmapped)."""
+        values = np.asarray(pd_values, dtype=np.float64)
+        if self.n_grades <= self._COMPARE_MAX_GRADES:
+            # One vectorized comparison per bound beats the binary search on short master scales.
+            codes = np.zeros(values.shape, dtype=self.code_dtype)
+            above = np.greater if self.right else np.greater_equal
+            for bound in self.upper_bounds:
+                np.add(codes, above(values, bound), out=codes, casting="unsafe")
+            codes[np.isnan(values)] = self.n_grades
+        else:
+            side = "left" if self.right else "right"
+            # NaN sorts after every bound, so it lands past the last grade too.
+            codes = np.searchsorted(self.upper_bounds, values, side=side).astype(self.code_dtype)
+        codes[codes >= self.n_grades] = -1
+        return codes
+
+    def assign(self, pd_values):
+        """Returns grades as an ordered ``pandas.Categorical`` (NaN where unmapped)."""
+        return pd.Categorical.from_codes(self.codes(pd_values), categories=self.grades, ordered=True)
+
+    def counts(self, pd_values=None, codes=None):
+        """Returns the number of PDs per grade as a Series indexed by grade.
+
+        Pass raw ``pd_values`` or the ``codes`` already returned by ``codes()``.
+        """
+        if (pd_values is None) == (codes is None):
+            raise ValueError("Provide exactly one of pd_values or codes.")
+        if codes is None:
+            codes = self.codes(pd_values)
+        # Shift by one so unmapped (-1) PDs land in a bin that is dropped.
+        counts = np.bincount(np.asarray(codes) + 1, minlength=self.n_grades + 1)[1:]
+        return pd.Series(counts, index=pd.Index(self.grades, name="grade"), name="count")
+
+    def distribution(self, pd_values=None, codes=None):
+        """Returns each grade's share of the mapped PDs, as ``compute_psi`` expects."""
+        counts = self.counts(pd_values, codes)
+        total = counts.sum()
+        if total == 0:
+            raise ValueError("No PDs could be mapped to a grade.")
+        return (counts / total).rename("share")
+
+    def psi(self, expected_pd, actual_pd):
+        """Grades both samples and returns ``compute_psi`` of their grade distributions."""
+        return compute_psi(self.distribution(expected_pd), self.distribution(actual_pd), self.grades)
+
+@lru_cache(maxsize=8)
+def _cached_grade_mapper(path, mtime_ns, size, grade_col, cutoff_col, right):
+    return GradeMapper.from_csv(path, grade_col, cutoff_col, right)
+
+@instrumented
+def load_grade_mapper(cutoffs_path, grade_col="grade", cutoff_col=None, right=True):
+    """Returns a GradeMapper for ``cutoffs_path``, parsed once per file version per process."""
+    real = os.path.realpath(cutoffs_path)
+    stat = os.stat(real)
+    return _cached_grade_mapper(real, stat.st_mtime_ns, stat.st_size, grade_col, cutoff_col, right)
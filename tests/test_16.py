@@ -0,0 +1,78 @@
+import pytest
+import numpy as np
+import pandas as pd
+from definition_7b4aaa72bb8f49eb819b771158db663b import load_data_chunks
+
+@pytest.fixture
+def snapshot_file(tmp_path):
+    file_path = tmp_path / "snap_2024Q1.csv"
+    df = pd.DataFrame({
+        "LIMIT_BAL": np.arange(10, dtype=float) * 1000.0,
+        "AGE": np.arange(20, 30),
+        "SEX": ["M", "F"] * 5,
+        "default": [0, 1] * 5,
+    })
+    df.to_csv(file_path, index=False)
+    return str(file_path), df
+
+def test_load_data_chunks_reassembles_file(snapshot_file):
+    file_path, df = snapshot_file
+    chunks = list(load_data_chunks(file_path, chunksize=3))
+    assert [len(c) for c in chunks] == [3, 3, 3, 1]
+    combined = pd.concat(chunks, ignore_index=True)
+    assert np.allclose(combined["LIMIT_BAL"], df["LIMIT_BAL"])
+    assert list(combined["default"]) == list(df["default"])
+
+def test_load_data_chunks_downcasts_and_projects(snapshot_file):
+    file_path, _ = snapshot_file
+    chunk = next(load_data_chunks(file_path, chunksize=5, usecols=["LIMIT_BAL", "AGE", "SEX"], categorical=["SEX"]))
+    assert list(chunk.columns) == ["LIMIT_BAL", "AGE", "SEX"]
+    assert chunk["LIMIT_BAL"].dtype == np.float32
+    assert chunk["AGE"].dtype == np.int32
+    assert isinstance(chunk["SEX"].dtype, pd.CategoricalDtype)
+
+def test_load_data_chunks_share_one_schema(tmp_path):
+    file_path = str(tmp_path / "snap_2024Q2.csv")
+    pd.DataFrame({
+        "AGE": [20, 21, 22, 300, 301, 302, 70_000, 70_001],
+        "SEX": ["M", "M", "M", "F", "F", "F", "X", "M"],
+        "LIMIT_BAL": np.linspace(0, 1, 8),
+    }).to_csv(file_path, index=False)
+    chunks = list(load_data_chunks(file_path, chunksize=3, dtype={"LIMIT_BAL": "float64"}, categorical=["SEX"]))
+    assert len({tuple(chunk.dtypes.astype(str)) for chunk in chunks}) == 1
+    combined = pd.concat(chunks, ignore_index=True)
+    assert combined["AGE"].dtype == np.int32
+    assert combined["LIMIT_BAL"].dtype == np.float64
+    assert list(combined["SEX"].cat.categories) == ["F", "M", "X"]
+    fixed = pd.concat(load_data_chunks(file_path, chunksize=3, categorical={"SEX": ["M", "F", "X"]}))
+    assert list(fixed["SEX"].cat.categories) == ["M", "F", "X"]
+    pd.DataFrame({"ID": [1, 2, 3, 2**40]}).to_csv(file_path, index=False)
+    with pytest.raises(ValueError, match="ID"):
+        list(load_data_chunks(file_path, chunksize=3))
+    assert next(load_data_chunks(file_path, chunksize=3, dtype={"ID": "int64"}))["ID"].dtype == np.int64
+
+def test_load_data_chunks_no_downcast(snapshot_file):
+    file_path, _ = snapshot_file
+    chunk = next(load_data_chunks(file_path, chunksize=5, downcast=False))
+    assert chunk["LIMIT_BAL"].dtype == np.float64
+
+def test_load_data_chunks_declared_dtype(snapshot_file):
+    file_path, _ = snapshot_file
+    chunk = next(load_data_chunks(file_path, chunksize=5, dtype={"AGE": "float64"}, downcast=False))
+    assert chunk["AGE"].dtype == np.float64
+
+def test_load_data_chunks_pyarrow_engine(snapshot_file):
+    pytest.importorskip("pyarrow")
+    file_path, df = snapshot_file
+    combined = pd.concat(load_data_chunks(file_path, engine="pyarrow"), ignore_index=True)
+    assert len(combined) == len(df)
+    assert combined["LIMIT_BAL"].dtype == np.float32
+
+def test_load_data_chunks_file_not_found():
+    with pytest.raises(FileNotFoundError):
+        next(load_data_chunks("non_existent_file.csv"))
+
+def test_load_data_chunks_invalid_chunksize(snapshot_file):
+    file_path, _ = snapshot_file
+    with pytest.raises(ValueError):
+        next(load_data_chunks(file_path, chunksize=0))
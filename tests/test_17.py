@@ -0,0 +1,88 @@
+import pytest
+import os
+import pickle
+import numpy as np
+from definition_4d30e13e992642e08762e61a52f917ec import ArtifactCache, load_model_cached, save_model_mmap, load_model_mmap
+
+@pytest.fixture
+def model_file(tmp_path):
+    model_path = tmp_path / "rating_logreg_v1.pkl"
+    with open(model_path, "wb") as f:
+        pickle.dump({"coef": [0.1, 0.2]}, f)
+    return str(model_path)
+
+def test_load_model_cached_returns_same_object(model_file):
+    cache = ArtifactCache()
+    first = load_model_cached(model_file, cache=cache)
+    second = load_model_cached(model_file, cache=cache)
+    assert first is second
+    assert cache.info()["hits"] == 1
+    assert cache.info()["misses"] == 1
+
+def test_load_model_cached_reloads_after_change(model_file):
+    cache = ArtifactCache()
+    first = load_model_cached(model_file, cache=cache)
+    with open(model_file, "wb") as f:
+        pickle.dump({"coef": [0.3, 0.4, 0.5]}, f)
+    second = load_model_cached(model_file, cache=cache)
+    assert second == {"coef": [0.3, 0.4, 0.5]}
+    assert first is not second
+
+def test_load_model_cached_shares_identical_content(model_file, tmp_path):
+    copy_path = tmp_path / "copy.pkl"
+    with open(model_file, "rb") as src, open(copy_path, "wb") as dst:
+        dst.write(src.read())
+    cache = ArtifactCache()
+    assert load_model_cached(model_file, cache=cache) is load_model_cached(str(copy_path), cache=cache)
+    assert len(cache) == 1
+
+def test_artifact_cache_evicts_least_recently_used(tmp_path):
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"model_{i}.pkl"
+        with open(path, "wb") as f:
+            pickle.dump(np.full(100, i), f)
+        paths.append(str(path))
+    size = os.path.getsize(paths[0])
+    cache = ArtifactCache(max_bytes=2 * size)
+    for path in paths:
+        load_model_cached(path, cache=cache)
+    assert len(cache) == 2
+    assert paths[0] not in cache
+    assert paths[2] in cache
+
+def test_artifact_cache_invalidate(model_file):
+    cache = ArtifactCache()
+    load_model_cached(model_file, cache=cache)
+    cache.invalidate(model_file)
+    assert model_file not in cache
+    assert cache.info()["bytes"] == 0
+
+def test_load_model_cached_errors():
+    with pytest.raises(TypeError):
+        load_model_cached(None)
+    with pytest.raises(FileNotFoundError):
+        load_model_cached("non_existent_model.pkl", cache=ArtifactCache())
+
+def test_save_and_load_model_mmap(tmp_path):
+    model = {"thresholds": np.linspace(0, 1, 50_000), "small": np.arange(3), "name": "gbt"}
+    model_dir = save_model_mmap(model, str(tmp_path / "rating_gbt_v1"))
+    loaded = load_model_mmap(model_dir)
+    assert isinstance(loaded["thresholds"], np.memmap)
+    assert not isinstance(loaded["small"], np.memmap)
+    assert np.array_equal(loaded["thresholds"], model["thresholds"])
+    assert loaded["name"] == "gbt"
+
+def test_save_model_mmap_keeps_sklearn_trees_inline(tmp_path):
+    from sklearn.ensemble import GradientBoostingClassifier
+    X = np.random.default_rng(0).normal(size=(300, 3))
+    y = (X[:, 0] > 0).astype(int)
+    model = GradientBoostingClassifier(n_estimators=5, max_depth=2).fit(X, y)
+    with pytest.warns(UserWarning, match="5 scikit-learn trees"):
+        model_dir = save_model_mmap(model, str(tmp_path / "rating_gbt_v1"), min_array_bytes=1)
+    assert np.array_equal(load_model_mmap(model_dir).predict_proba(X), model.predict_proba(X))
+
+def test_load_model_cached_mmap_directory(tmp_path):
+    model_dir = save_model_mmap({"w": np.ones(20_000)}, str(tmp_path / "gbt"))
+    cache = ArtifactCache()
+    assert load_model_cached(model_dir, cache=cache) is load_model_cached(model_dir, cache=cache)
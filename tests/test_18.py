@@ -0,0 +1,87 @@
+import pytest
+import numpy as np
+import pandas as pd
+from unittest.mock import MagicMock
+from definition_e0a8d1bca84343a39df482c56bff4f9e import (PredictionStore, dataset_fingerprint, calculate_auc_gini,
+                                                         track_auc_gini_drift, perform_sensitivity_analysis)
+
+@pytest.fixture
+def mock_model():
+    model = MagicMock()
+    model.predict_proba.return_value = np.array([[0.1, 0.9], [0.8, 0.2], [0.3, 0.7]])
+    model.predict.return_value = np.array([0.9, 0.2, 0.7])
+    return model
+
+@pytest.fixture
+def X():
+    return pd.DataFrame({'feature1': [1, 2, 3], 'feature2': [4, 5, 6]})
+
+def test_dataset_fingerprint_is_content_based(X):
+    assert dataset_fingerprint(X) == dataset_fingerprint(X.copy())
+    changed = X.copy()
+    changed.loc[0, 'feature1'] = 10
+    assert dataset_fingerprint(X) != dataset_fingerprint(changed)
+    assert dataset_fingerprint(np.arange(3)) != dataset_fingerprint(np.arange(4))
+
+def test_prediction_store_scores_once(mock_model, X):
+    store = PredictionStore()
+    first = store.score(mock_model, X)
+    second = store.score(mock_model, X.copy())
+    assert first is second
+    assert mock_model.predict_proba.call_count == 1
+    assert first.dtype == np.float64
+    assert first.flags['C_CONTIGUOUS']
+    assert not first.flags['WRITEABLE']
+    assert np.allclose(first, [0.9, 0.2, 0.7])
+
+def test_metrics_share_one_scoring_pass(mock_model, X):
+    store = PredictionStore()
+    y = pd.Series([1, 0, 1])
+    auc, gini = calculate_auc_gini(mock_model, X, y, store=store)
+    drift = track_auc_gini_drift(mock_model, [X], [y], ['2023Q1'], store=store)
+    assert mock_model.predict_proba.call_count == 1
+    assert drift['auc'][0] == auc
+    assert gini == 2 * auc - 1
+
+def test_sensitivity_uses_store_for_baseline(mock_model, X):
+    store = PredictionStore()
+    store.score(mock_model, X, method="predict")
+    perform_sensitivity_analysis(mock_model, X, ['feature1'], 0.05, store=store)
+    assert mock_model.predict.call_count == 2
+    assert store.hits == 1
+
+def test_prediction_store_eviction(mock_model, X):
+    store = PredictionStore(max_bytes=24)
+    store.put(mock_model, X, np.array([0.1, 0.2, 0.3]), method="predict")
+    store.put(mock_model, X.iloc[:2], np.array([0.1, 0.2]), method="predict")
+    assert len(store) == 1
+    assert store.current_bytes == 16
+
+def test_prediction_store_rekeys_refit_model_and_hashes_once(X, monkeypatch):
+    from sklearn.linear_model import LogisticRegression
+    import definitions.io as io_module
+    y = pd.Series([0, 0, 1])
+    model = LogisticRegression().fit(X, y)
+    store = PredictionStore()
+    assert calculate_auc_gini(model, X, y, store=store) == (1.0, 1.0)
+    model.fit(X, 1 - y)
+    assert calculate_auc_gini(model, X, y, store=store) == (0.0, -1.0)
+    calls = []
+    monkeypatch.setattr(io_module, "dataset_fingerprint", lambda data: calls.append(1) or "fp")
+    store.score(model, X, method="predict")
+    assert len(calls) == 1
+
+def test_registered_objects_hit_without_hashing(mock_model, X, monkeypatch):
+    import definitions.io as io_module
+    store = PredictionStore()
+    store.register(mock_model)
+    store.register(X, key="snap_2024Q1")
+    first = store.score(mock_model, X)
+    fingerprints = []
+    monkeypatch.setattr(io_module, "dataset_fingerprint", lambda data: fingerprints.append(1) or "fp")
+    monkeypatch.setattr(io_module, "model_fingerprint", lambda model: fingerprints.append(1) or "fp")
+    assert store.score(mock_model, X) is first
+    assert fingerprints == [] and store.hits == 1
+    assert mock_model.predict_proba.call_count == 1
+    store.score(mock_model, X.copy())
+    assert fingerprints == [1]
@@ -0,0 +1,57 @@
+import pytest
+import numpy as np
+import pandas as pd
+from unittest.mock import MagicMock
+from sklearn.metrics import roc_auc_score
+from definition_950d23757a1f43f2ae7cb0109afc45ab import AUCAccumulator, accumulate_auc_gini
+
+@pytest.fixture
+def scored_sample():
+    rng = np.random.default_rng(42)
+    y = rng.integers(0, 2, 5000)
+    score = np.clip(0.3 * y + rng.normal(0.35, 0.2, 5000), 0, 1).round(3)
+    return y, score
+
+def test_exact_mode_matches_sklearn(scored_sample):
+    y, score = scored_sample
+    acc = AUCAccumulator(exact=True).update(y, score)
+    assert acc.auc() == pytest.approx(roc_auc_score(y, score), abs=1e-12)
+    assert acc.error_bound() == 0.0
+
+def test_binned_mode_within_error_bound(scored_sample):
+    y, score = scored_sample
+    acc = AUCAccumulator(n_bins=50).update(y, score)
+    assert abs(acc.auc() - roc_auc_score(y, score)) <= acc.error_bound() + 1e-12
+    assert acc.gini() == pytest.approx(2 * acc.auc() - 1)
+
+@pytest.mark.parametrize("exact", [True, False])
+def test_merged_chunks_equal_single_pass(scored_sample, exact):
+    y, score = scored_sample
+    whole = AUCAccumulator(exact=exact).update(y, score)
+    parts = [AUCAccumulator(exact=exact).update(y[i:i + 700], score[i:i + 700]) for i in range(0, len(y), 700)]
+    merged = parts[0]
+    for part in parts[1:]:
+        merged = merged + part
+    assert merged.auc() == pytest.approx(whole.auc(), abs=1e-12)
+    assert merged.n_pos == whole.n_pos
+
+def test_single_class_returns_nan():
+    acc = AUCAccumulator().update([0, 0, 0], [0.1, 0.2, 0.3])
+    assert np.isnan(acc.auc())
+
+def test_invalid_inputs():
+    with pytest.raises(ValueError):
+        AUCAccumulator().update([0, 1, 2], [0.1, 0.2, 0.3])
+    with pytest.raises(ValueError):
+        AUCAccumulator().update([0, 1], [0.1, 0.2, 0.3])
+    with pytest.raises(ValueError):
+        AUCAccumulator(exact=True).merge(AUCAccumulator())
+
+def test_accumulate_auc_gini_over_chunks():
+    model = MagicMock()
+    model.predict_proba.side_effect = lambda X: np.column_stack([1 - X['score'], X['score']])
+    chunks = [pd.DataFrame({'score': [0.9, 0.2], 'default': [1, 0]}),
+              pd.DataFrame({'score': [0.7, 0.4], 'default': [1, 0]})]
+    acc = accumulate_auc_gini(model, iter(chunks), 'default', exact=True)
+    assert acc.auc() == 1.0
+    assert model.predict_proba.call_count == 2
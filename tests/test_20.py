@@ -0,0 +1,50 @@
+import pytest
+import numpy as np
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from sklearn.linear_model import LogisticRegression
+from definition_25b93deb4f9e46309b591da05d295f59 import track_auc_gini_drift
+
+@pytest.fixture
+def snapshots():
+    rng = np.random.default_rng(42)
+    X_snapshots, y_snapshots = [], []
+    for _ in range(4):
+        X = pd.DataFrame({'feature1': rng.normal(size=200), 'feature2': rng.normal(size=200)})
+        y = pd.Series((X['feature1'] + rng.normal(size=200) > 0).astype(int))
+        X_snapshots.append(X)
+        y_snapshots.append(y)
+    model = LogisticRegression().fit(X_snapshots[0], y_snapshots[0])
+    return model, X_snapshots, y_snapshots, ['2023Q1', '2023Q2', '2023Q3', '2023Q4']
+
+def test_process_pool_matches_serial(snapshots):
+    model, X_snapshots, y_snapshots, periods = snapshots
+    serial = track_auc_gini_drift(model, X_snapshots, y_snapshots, periods)
+    parallel = track_auc_gini_drift(model, X_snapshots, y_snapshots, periods, n_jobs=2)
+    pd.testing.assert_frame_equal(serial, parallel)
+    assert list(parallel['time_period']) == periods
+
+def test_external_executor_matches_serial(snapshots):
+    model, X_snapshots, y_snapshots, periods = snapshots
+    serial = track_auc_gini_drift(model, X_snapshots, y_snapshots, periods)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        parallel = track_auc_gini_drift(model, X_snapshots, y_snapshots, periods, executor=executor)
+    pd.testing.assert_frame_equal(serial, parallel)
+
+def test_parallel_single_class_period(snapshots):
+    model, X_snapshots, y_snapshots, periods = snapshots
+    y_snapshots[1] = pd.Series(np.zeros(200, dtype=int))
+    result = track_auc_gini_drift(model, X_snapshots, y_snapshots, periods, n_jobs=-1)
+    assert np.isnan(result['auc'][1])
+    assert not np.isnan(result['auc'][2])
+
+def test_parallel_non_binary_target_raises(snapshots):
+    model, X_snapshots, y_snapshots, periods = snapshots
+    y_snapshots[2] = pd.Series(np.arange(200) % 3)
+    with pytest.raises(ValueError):
+        track_auc_gini_drift(model, X_snapshots, y_snapshots, periods, n_jobs=2)
+
+def test_empty_snapshots_keep_schema():
+    result = track_auc_gini_drift(None, [], [], [], n_jobs=4)
+    assert list(result.columns) == ['time_period', 'auc', 'gini']
+    assert len(result) == 0
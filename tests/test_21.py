@@ -0,0 +1,74 @@
+import pytest
+import numpy as np
+from scipy import stats
+from definition_44b6167051c647dba53290596bf66b8e import perform_hosmer_lemeshow_test, hosmer_lemeshow_batch
+
+def _reference_equal_width(y_true, y_prob, n_groups):
+    y_true, y_prob = np.array(y_true), np.array(y_prob)
+    indices = np.digitize(y_prob, np.linspace(0, 1, n_groups + 1))
+    observed = np.array([y_true[indices == i].sum() for i in range(1, n_groups + 1)])
+    expected = np.array([y_prob[indices == i].sum() for i in range(1, n_groups + 1)])
+    statistic = np.sum((observed - expected) ** 2 / (expected + 1e-8))
+    return statistic, 1 - stats.chi2.cdf(statistic, n_groups - 2)
+
+@pytest.fixture
+def sample():
+    rng = np.random.default_rng(42)
+    y_prob = np.round(rng.uniform(0, 1, 2000), 2)
+    y_true = (rng.uniform(0, 1, 2000) < y_prob).astype(int)
+    return y_true, y_prob
+
+def test_equal_width_matches_loop_implementation(sample):
+    y_true, y_prob = sample
+    statistic, p_value = perform_hosmer_lemeshow_test(y_true, y_prob, 10)
+    ref_statistic, ref_p_value = _reference_equal_width(y_true, y_prob, 10)
+    assert statistic == pytest.approx(ref_statistic)
+    assert p_value == pytest.approx(ref_p_value)
+
+def test_quantile_grouping_uses_deciles(sample):
+    y_true, y_prob = sample
+    statistic, p_value = perform_hosmer_lemeshow_test(y_true, y_prob, 10, grouping="quantile")
+    assert statistic >= 0
+    assert 0 <= p_value <= 1
+
+def test_quantile_grouping_with_ties_counts_non_empty_groups():
+    y_prob = np.repeat([0.02, 0.05, 0.10, 0.30], [700, 200, 80, 20])
+    y_true = (np.arange(1000) % 10 == 0).astype(int)
+    statistic, p_value = perform_hosmer_lemeshow_test(y_true, y_prob, 10, grouping="quantile")
+    assert p_value == pytest.approx(1 - stats.chi2.cdf(statistic, 3 - 2))
+    assert hosmer_lemeshow_batch(y_true, {'m': y_prob}).loc['m', 'n_groups'] == 3
+
+def test_grade_grouping(sample):
+    y_true, y_prob = sample
+    grades = np.where(y_prob < 0.3, 'A', np.where(y_prob < 0.7, 'B', 'C'))
+    statistic, _ = perform_hosmer_lemeshow_test(y_true, y_prob, None, grouping="grade", grades=grades)
+    observed = np.array([y_true[grades == g].sum() for g in 'ABC'])
+    expected = np.array([y_prob[grades == g].sum() for g in 'ABC'])
+    assert statistic == pytest.approx(np.sum((observed - expected) ** 2 / (expected + 1e-8)))
+
+def test_invalid_grouping(sample):
+    y_true, y_prob = sample
+    with pytest.raises(ValueError):
+        perform_hosmer_lemeshow_test(y_true, y_prob, 10, grouping="unknown")
+    with pytest.raises(ValueError):
+        perform_hosmer_lemeshow_test(y_true, y_prob, 10, grouping="grade")
+
+def test_batch_matches_individual_calls(sample):
+    y_true, y_prob = sample
+    challenger = np.clip(y_prob + 0.05, 0, 0.99)
+    result = hosmer_lemeshow_batch(y_true, {'champion': y_prob, 'challenger': challenger})
+    for key, prob in [('champion', y_prob), ('challenger', challenger)]:
+        statistic, p_value = perform_hosmer_lemeshow_test(y_true, prob, 10, grouping="quantile")
+        assert result.loc[key, 'statistic'] == pytest.approx(statistic)
+        assert result.loc[key, 'p_value'] == pytest.approx(p_value)
+
+def test_batch_per_period_labels(sample):
+    y_true, y_prob = sample
+    result = hosmer_lemeshow_batch({'2023Q1': y_true[:1000], '2023Q2': y_true[1000:]},
+                                   {'2023Q1': y_prob[:1000], '2023Q2': y_prob[1000:]}, grouping="equal_width")
+    statistic, _ = perform_hosmer_lemeshow_test(y_true[1000:], y_prob[1000:], 10)
+    assert list(result.index) == ['2023Q1', '2023Q2']
+    assert result.loc['2023Q2', 'statistic'] == pytest.approx(statistic)
+
+def test_batch_empty():
+    assert hosmer_lemeshow_batch([], {}).empty
@@ -0,0 +1,51 @@
+import pytest
+import numpy as np
+from definition_3bb4eab2856347f897381db689eb8ed6 import CalibrationAccumulator
+
+@pytest.fixture
+def sample():
+    rng = np.random.default_rng(42)
+    y_prob = rng.uniform(0, 1, 1000)
+    y_true = (rng.uniform(0, 1, 1000) < y_prob).astype(int)
+    return y_true, y_prob
+
+def test_probability_bins(sample):
+    y_true, y_prob = sample
+    bin_means, bin_proportions = CalibrationAccumulator(n_bins=5).update(y_true, y_prob).curve()
+    mask = (y_prob >= 0.4) & (y_prob < 0.6)
+    assert bin_means[2] == pytest.approx(y_prob[mask].mean())
+    assert bin_proportions[2] == pytest.approx(y_true[mask].mean())
+
+def test_chunks_merge_exactly(sample):
+    y_true, y_prob = sample
+    whole = CalibrationAccumulator(n_bins=10).update(y_true, y_prob)
+    first = CalibrationAccumulator(n_bins=10).update(y_true[:300], y_prob[:300])
+    second = CalibrationAccumulator(n_bins=10).update(y_true[300:], y_prob[300:])
+    merged = first + second
+    assert np.array_equal(merged.count, whole.count)
+    assert np.allclose(merged.curve()[0], whole.curve()[0])
+    assert np.allclose(merged.curve()[1], whole.curve()[1])
+
+def test_grade_bins():
+    acc = CalibrationAccumulator(grades=['A', 'B', 'C'])
+    acc.update([0, 1, 0, 1], [0.01, 0.05, 0.02, 0.04], grades=['A', 'B', 'A', 'B'])
+    frame = acc.to_frame()
+    assert list(frame.index) == ['A', 'B', 'C']
+    assert frame.loc['B', 'default_rate'] == 1.0
+    assert frame.loc['A', 'mean_pd'] == pytest.approx(0.015)
+    assert np.isnan(frame.loc['C', 'mean_pd'])
+    assert frame.loc['C', 'count'] == 0
+
+def test_probability_of_one_falls_in_last_bin():
+    acc = CalibrationAccumulator(n_bins=4).update([1], [1.0])
+    assert acc.count[-1] == 1
+
+def test_invalid_configuration():
+    with pytest.raises(ValueError):
+        CalibrationAccumulator(n_bins=0)
+    with pytest.raises(ValueError):
+        CalibrationAccumulator(bin_edges=[0.5, 0.2])
+    with pytest.raises(ValueError):
+        CalibrationAccumulator(grades=['A']).update([0], [0.1], grades=['Z'])
+    with pytest.raises(ValueError):
+        CalibrationAccumulator(n_bins=2).merge(CalibrationAccumulator(n_bins=3))
@@ -0,0 +1,48 @@
+import pytest
+import numpy as np
+import pandas as pd
+from definition_29f88eecba7043f78a18379807cca11d import compute_psi_matrix, compute_overall_psi, compute_csi_table, characteristic_bin_edges, characteristic_bin_counts
+
+def test_psi_matrix_matches_scalar_psi():
+    expected = np.array([[20, 30, 50], [10, 10, 80]])
+    actual = np.stack([np.array([[25, 35, 40], [10, 20, 70]]), np.array([[20, 30, 50], [30, 30, 40]])], axis=2)
+    psi = compute_psi_matrix(expected, actual)
+    assert psi.shape == (2, 2)
+    assert psi[0, 0] == pytest.approx(compute_overall_psi([0.2, 0.3, 0.5], [0.25, 0.35, 0.4]))
+    assert psi[0, 1] == pytest.approx(0.0)
+    assert psi[1, 1] == pytest.approx(compute_overall_psi([0.1, 0.1, 0.8], [0.3, 0.3, 0.4]))
+
+def test_psi_matrix_single_period():
+    psi = compute_psi_matrix([[1, 1]], [[1, 3]])
+    assert psi.shape == (1, 1)
+
+def test_psi_matrix_empty_bins():
+    expected = [[10, 0, 90]]
+    actual = [[20, 0, 80]]
+    with pytest.raises(ValueError):
+        compute_psi_matrix(expected, actual)
+    smoothed = compute_psi_matrix(expected, actual, epsilon=1e-4)
+    assert smoothed[0, 0] == pytest.approx(compute_overall_psi([0.1, 0.9], [0.2, 0.8]))
+
+def test_psi_matrix_shape_mismatch():
+    with pytest.raises(ValueError):
+        compute_psi_matrix(np.ones((2, 3)), np.ones((2, 4, 1)))
+
+def test_bin_counts_missing_bin():
+    df = pd.DataFrame({'AGE': [20.0, 30.0, np.nan, 40.0]})
+    edges = characteristic_bin_edges(df, n_bins=2)
+    counts = characteristic_bin_counts(df, edges)
+    assert counts.sum() == 4
+    assert counts[0, -1] == 1
+
+def test_csi_table():
+    rng = np.random.default_rng(42)
+    baseline = pd.DataFrame({'LIMIT_BAL': rng.normal(size=5000), 'AGE': rng.integers(21, 70, 5000)})
+    stable = pd.DataFrame({'LIMIT_BAL': rng.normal(size=5000), 'AGE': rng.integers(21, 70, 5000)})
+    shifted = pd.DataFrame({'LIMIT_BAL': rng.normal(1.0, 1.0, 5000), 'AGE': rng.integers(21, 70, 5000)})
+    table = compute_csi_table(baseline, [stable, shifted], ['2023Q1', '2023Q2'])
+    assert list(table.index) == ['LIMIT_BAL', 'AGE']
+    assert list(table.columns) == ['2023Q1', '2023Q2']
+    assert table.loc['LIMIT_BAL', '2023Q1'] < 0.1
+    assert table.loc['LIMIT_BAL', '2023Q2'] > 0.25
+    assert table.loc['AGE', '2023Q2'] < 0.1
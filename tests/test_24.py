@@ -0,0 +1,77 @@
+import pytest
+import numpy as np
+import pandas as pd
+from definition_7880d19886d84d3d81ce66350880f5b1 import PopulationProfile, compute_csi_table
+
+@pytest.fixture
+def frames():
+    rng = np.random.default_rng(42)
+    baseline = pd.DataFrame({'LIMIT_BAL': rng.normal(size=4000), 'AGE': rng.integers(21, 70, 4000).astype(float)})
+    snapshots = [pd.DataFrame({'LIMIT_BAL': rng.normal(shift, 1.0, 2000), 'AGE': rng.integers(21, 70, 2000).astype(float)})
+                 for shift in (0.0, 0.2, 0.5, 1.0)]
+    return baseline, snapshots, ['2023Q1', '2023Q2', '2023Q3', '2023Q4']
+
+def test_profile_matches_csi_table(frames):
+    baseline, snapshots, periods = frames
+    profile = PopulationProfile.from_baseline(baseline)
+    for period, snapshot in zip(periods, snapshots):
+        profile.add_period(period, snapshot)
+    pd.testing.assert_frame_equal(profile.psi_table(), compute_csi_table(baseline, snapshots, periods))
+
+def test_add_period_in_chunks(frames):
+    baseline, snapshots, _ = frames
+    whole = PopulationProfile.from_baseline(baseline).add_period('2023Q1', snapshots[0])
+    chunked = PopulationProfile.from_baseline(baseline)
+    chunked.add_period('2023Q1', snapshots[0].iloc[:500]).add_period('2023Q1', snapshots[0].iloc[500:])
+    assert np.array_equal(whole.counts('2023Q1'), chunked.counts('2023Q1'))
+
+def test_period_pair_and_rolling_psi(frames):
+    baseline, snapshots, periods = frames
+    profile = PopulationProfile.from_baseline(baseline)
+    for period, snapshot in zip(periods, snapshots):
+        profile.add_period(period, snapshot)
+    pair = profile.psi('2023Q2', reference='2023Q1')
+    assert pair.name == '2023Q2'
+    rolling = profile.rolling_psi(window=1)
+    assert np.isnan(rolling['2023Q1']).all()
+    assert rolling.loc['LIMIT_BAL', '2023Q2'] == pytest.approx(pair['LIMIT_BAL'])
+    pooled = PopulationProfile(profile.edges, profile.baseline_counts)
+    pooled.add_period('ref', counts=profile.counts('2023Q1') + profile.counts('2023Q2'))
+    pooled.add_period('2023Q3', counts=profile.counts('2023Q3'))
+    assert profile.rolling_psi(window=2).loc['LIMIT_BAL', '2023Q3'] == pytest.approx(
+        pooled.psi('2023Q3', reference='ref')['LIMIT_BAL'])
+
+def test_save_and_load_round_trip(frames, tmp_path):
+    baseline, snapshots, periods = frames
+    profile = PopulationProfile.from_baseline(baseline).add_period(periods[0], snapshots[0])
+    path = tmp_path / "profile.json"
+    profile.save(str(path))
+    loaded = PopulationProfile.load(str(path))
+    assert loaded.periods == [periods[0]]
+    pd.testing.assert_frame_equal(loaded.psi_table(), profile.psi_table())
+
+def test_typed_period_labels_round_trip(frames, tmp_path):
+    baseline, snapshots, _ = frames
+    labels = [pd.Period('2023Q1', freq='Q'), 2023, pd.Timestamp('2023-12-31'), '2024Q1']
+    profile = PopulationProfile.from_baseline(baseline)
+    for label, snapshot in zip(labels, snapshots):
+        profile.add_period(label, snapshot)
+    path = tmp_path / "profile.json"
+    profile.save(str(path))
+    loaded = PopulationProfile.load(str(path))
+    assert loaded.periods == labels
+    pd.testing.assert_series_equal(loaded.psi(2023, reference=labels[0]), profile.psi(2023, reference=labels[0]))
+    with pytest.raises(TypeError):
+        profile.add_period(('2023', 'Q1'), snapshots[0])
+
+def test_invalid_usage(frames):
+    baseline, snapshots, _ = frames
+    profile = PopulationProfile.from_baseline(baseline)
+    with pytest.raises(ValueError):
+        profile.add_period('2023Q1')
+    with pytest.raises(ValueError):
+        profile.add_period('2023Q1', counts=np.ones((1, 2)))
+    with pytest.raises(KeyError):
+        profile.psi('2030Q1')
+    with pytest.raises(ValueError):
+        profile.rolling_psi(0)
@@ -0,0 +1,60 @@
+import pytest
+import numpy as np
+import pandas as pd
+from definition_69567f4888d941b7af0facc332d271c3 import generate_override_matrix
+
+@pytest.fixture
+def overrides():
+    return pd.DataFrame({
+        'grade_before': ['A', 'B', 'C', 'B', 'A', 'Z'],
+        'grade_after': ['B', 'C', 'A', 'B', 'C', 'A'],
+        'reason_code': ['R1', 'R2', 'R1', 'R3', 'R2', 'R1'],
+        'approver': ['ann', 'bob', 'ann', 'ann', None, 'bob'],
+        'period': ['2023Q1', '2023Q1', '2023Q2', '2023Q2', '2023Q2', '2023Q1'],
+    })
+
+def _loop_matrix(overrides, grade_levels, reason_codes):
+    matrix = pd.DataFrame(0, index=grade_levels, columns=reason_codes)
+    for _, row in overrides.iterrows():
+        if row['grade_before'] in grade_levels and row['reason_code'] in reason_codes:
+            matrix.loc[row['grade_before'], row['reason_code']] += 1
+    return matrix
+
+def test_matches_row_by_row_counts(overrides):
+    result = generate_override_matrix(overrides, ['A', 'B', 'C'], ['R1', 'R2'])
+    pd.testing.assert_frame_equal(result, _loop_matrix(overrides, ['A', 'B', 'C'], ['R1', 'R2']))
+
+def test_empty_log_and_duplicate_levels_match_row_by_row(overrides):
+    pd.testing.assert_frame_equal(generate_override_matrix(pd.DataFrame(), ['A'], ['R1']),
+                                  _loop_matrix(pd.DataFrame(), ['A'], ['R1']))
+    levels, reasons = ['A', 'B', 'A', 'C'], ['R1', 'R2', 'R1']
+    pd.testing.assert_frame_equal(generate_override_matrix(overrides, levels, reasons),
+                                  _loop_matrix(overrides, levels, reasons))
+    assert generate_override_matrix(pd.DataFrame(), ['A'], ['R1'], by='approver').empty
+
+def test_notch_rows(overrides):
+    result = generate_override_matrix(overrides, ['A', 'B', 'C'], ['R1', 'R2', 'R3'], rows="notch")
+    assert list(result.index) == [-2, -1, 0, 1, 2]
+    assert result.index.name == 'notch'
+    assert result.loc[1, 'R1'] == 1
+    assert result.loc[1, 'R2'] == 1
+    assert result.loc[2, 'R2'] == 1
+    assert result.loc[-2, 'R1'] == 1
+    assert result.loc[0, 'R3'] == 1
+    assert result.values.sum() == 5
+
+def test_breakdown_by_approver_and_period(overrides):
+    result = generate_override_matrix(overrides, ['A', 'B', 'C'], ['R1', 'R2', 'R3'], by=['approver', 'period'])
+    assert result.index.names == ['approver', 'period', 'grade_before']
+    assert result.loc[('ann', '2023Q2', 'B'), 'R3'] == 1
+    assert result.loc[('bob', '2023Q1', 'B'), 'R2'] == 1
+    assert result.values.sum() == 4
+
+def test_breakdown_single_column(overrides):
+    result = generate_override_matrix(overrides, ['A', 'B', 'C'], ['R1', 'R2', 'R3'], rows="notch", by='period')
+    assert result.index.names == ['period', 'notch']
+    assert result.xs('2023Q1').values.sum() == 2
+
+def test_invalid_rows(overrides):
+    with pytest.raises(ValueError):
+        generate_override_matrix(overrides, ['A'], ['R1'], rows="reason")
@@ -0,0 +1,44 @@
+import pytest
+import numpy as np
+import pandas as pd
+from unittest.mock import MagicMock
+from sklearn.linear_model import LogisticRegression
+from definition_1c9004a56daa4edba8ab263806bfa394 import perform_sensitivity_grid
+
+@pytest.fixture
+def fitted():
+    rng = np.random.default_rng(42)
+    X = pd.DataFrame({'LIMIT_BAL': rng.normal(5, 1, 500), 'PAY_0': rng.integers(0, 5, 500), 'AGE': rng.normal(40, 5, 500)})
+    y = (X['PAY_0'] + rng.normal(size=500) > 2).astype(int)
+    return LogisticRegression(max_iter=1000).fit(X, y), X
+
+def _reference(model, X, driver, shock):
+    X_shocked = X.copy()
+    X_shocked[driver] = X_shocked[driver] * (1 + shock)
+    return np.mean(model.predict_proba(X_shocked)[:, 1] - model.predict_proba(X)[:, 1])
+
+def test_grid_matches_per_scenario_copies(fitted):
+    model, X = fitted
+    result = perform_sensitivity_grid(model, X, ['PAY_0', 'LIMIT_BAL'], shocks=(-0.05, 0.05), chunk_size=333)
+    assert list(result.columns) == ['driver', 'shock', 'direction', 'delta_PD']
+    assert list(result['direction']) == ['down', 'up', 'down', 'up']
+    for _, row in result.iterrows():
+        assert row['delta_PD'] == pytest.approx(_reference(model, X, row['driver'], row['shock']), abs=1e-12)
+
+def test_grid_uses_few_scoring_calls():
+    model = MagicMock()
+    model.predict_proba.side_effect = lambda X: np.column_stack([1 - X['a'] / 100, X['a'] / 100])
+    X = pd.DataFrame({'a': np.arange(100.0), 'b': np.ones(100)})
+    result = perform_sensitivity_grid(model, X, ['a', 'b'], shocks=(-0.1, -0.05, 0.05, 0.1), chunk_size=400)
+    assert model.predict_proba.call_count == 1 + 2
+    assert result.loc[0, 'delta_PD'] == pytest.approx(-0.1 * np.arange(100).mean() / 100)
+    assert (result.loc[result['driver'] == 'b', 'delta_PD'] == 0).all()
+
+def test_grid_empty_inputs(fitted):
+    model, X = fitted
+    assert perform_sensitivity_grid(model, X, []).empty
+
+def test_grid_unknown_driver(fitted):
+    model, X = fitted
+    with pytest.raises(KeyError):
+        perform_sensitivity_grid(model, X, ['UNKNOWN'])
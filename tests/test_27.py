@@ -0,0 +1,47 @@
+import pytest
+import numpy as np
+from sklearn.metrics import roc_auc_score
+from definition_6666a0a49d10446fac3c63ecb4f00d2c import bootstrap_auc_gini
+
+@pytest.fixture
+def sample():
+    rng = np.random.default_rng(7)
+    y = rng.integers(0, 2, 300)
+    score = np.round(0.2 * y + rng.uniform(0, 1, 300), 2)
+    return y, score
+
+def test_point_estimate_matches_sklearn(sample):
+    y, score = sample
+    result = bootstrap_auc_gini(y, score, n_boot=50)
+    assert result['auc'] == pytest.approx(roc_auc_score(y, score))
+    assert result['gini'] == pytest.approx(2 * result['auc'] - 1)
+
+def test_resampled_aucs_match_naive_loop(sample):
+    y, score = sample
+    n_boot = 40
+    idx = np.random.default_rng(42).integers(0, len(y), size=(n_boot, len(y)))
+    naive = np.array([roc_auc_score(y[i], score[i]) for i in idx])
+    result = bootstrap_auc_gini(y, score, n_boot=n_boot, seed=42)
+    lower, upper = np.percentile(naive, [2.5, 97.5])
+    assert result['auc_ci'] == pytest.approx((lower, upper))
+    assert result['auc_std'] == pytest.approx(np.std(naive, ddof=1))
+
+def test_reproducible_and_block_size_independent_width(sample):
+    y, score = sample
+    first = bootstrap_auc_gini(y, score, n_boot=200, seed=1)
+    second = bootstrap_auc_gini(y, score, n_boot=200, seed=1)
+    assert first == second
+    blocked = bootstrap_auc_gini(y, score, n_boot=200, seed=1, max_block_elements=1000)
+    assert blocked['auc_ci'][0] < blocked['auc'] < blocked['auc_ci'][1]
+    assert blocked['gini_ci'] == pytest.approx((2 * blocked['auc_ci'][0] - 1, 2 * blocked['auc_ci'][1] - 1))
+
+def test_invalid_inputs(sample):
+    y, score = sample
+    with pytest.raises(ValueError):
+        bootstrap_auc_gini([0, 1, 2], [0.1, 0.2, 0.3])
+    with pytest.raises(ValueError):
+        bootstrap_auc_gini(y, score[:-1])
+    with pytest.raises(ValueError):
+        bootstrap_auc_gini(y, score, alpha=1.5)
+    with pytest.raises(ValueError):
+        bootstrap_auc_gini(y, score, n_boot=0)
@@ -0,0 +1,70 @@
+import pytest
+import numpy as np
+from scipy import stats
+from sklearn.metrics import roc_auc_score
+from definition_a617407970f745c4a71bfc149f2b6b6b import delong_auc_covariance, compare_auc_delong
+
+def _naive_delong(y, scores):
+    pos, neg = scores[:, y == 1], scores[:, y == 0]
+    psi = (pos[:, :, None] > neg[:, None, :]) + 0.5 * (pos[:, :, None] == neg[:, None, :])
+    v10, v01 = psi.mean(axis=2), psi.mean(axis=1)
+    return psi.mean(axis=(1, 2)), np.cov(v10) / pos.shape[1] + np.cov(v01) / neg.shape[1]
+
+@pytest.fixture
+def sample():
+    rng = np.random.default_rng(42)
+    y = rng.integers(0, 2, 400)
+    champion = np.round(0.8 * y + rng.normal(size=400), 1)
+    challenger = np.round(0.1 * y + rng.normal(size=400), 1)
+    return y, champion, challenger
+
+def test_covariance_matches_quadratic_definition(sample):
+    y, champion, challenger = sample
+    aucs, cov = delong_auc_covariance(y, np.vstack([champion, challenger]))
+    ref_aucs, ref_cov = _naive_delong(y, np.vstack([champion, challenger]))
+    assert np.allclose(aucs, ref_aucs)
+    assert np.allclose(cov, ref_cov)
+    assert aucs[0] == pytest.approx(roc_auc_score(y, champion))
+
+def test_compare_against_reference(sample):
+    y, champion, challenger = sample
+    result = compare_auc_delong(y, {'rating_logreg_v1': champion, 'rating_gbt_v1': challenger},
+                                reference='rating_logreg_v1')
+    assert len(result) == 1
+    row = result.iloc[0]
+    assert row['model_a'] == 'rating_gbt_v1'
+    assert row['auc_diff'] == pytest.approx(row['auc_a'] - row['auc_b'])
+    assert row['p_value'] == pytest.approx(2 * stats.norm.sf(abs(row['auc_diff']) / np.sqrt(row['variance'])))
+    assert row['p_value'] < 0.05
+
+def test_compare_all_pairs_per_period(sample):
+    y, champion, challenger = sample
+    periods = np.repeat(['2023Q1', '2023Q2'], 200)
+    scores = {'a': champion, 'b': challenger, 'c': -challenger}
+    result = compare_auc_delong(y, scores, periods=periods)
+    assert len(result) == 6
+    assert list(result['period'].unique()) == ['2023Q1', '2023Q2']
+    q2 = result[(result['period'] == '2023Q2') & (result['model_a'] == 'a') & (result['model_b'] == 'b')].iloc[0]
+    single = compare_auc_delong(y[200:], {'a': champion[200:], 'b': challenger[200:]}).iloc[0]
+    assert q2['p_value'] == pytest.approx(single['p_value'])
+
+def test_identical_models_have_no_p_value(sample):
+    y, champion, _ = sample
+    result = compare_auc_delong(y, {'a': champion, 'b': champion.copy()})
+    assert result.loc[0, 'auc_diff'] == 0
+    assert np.isnan(result.loc[0, 'p_value'])
+
+def test_invalid_inputs(sample):
+    y, champion, challenger = sample
+    with pytest.raises(KeyError):
+        compare_auc_delong(y, {'a': champion}, reference='missing')
+    with pytest.raises(ValueError):
+        delong_auc_covariance([0, 0, 1], [[0.1, 0.2, 0.3]])
+
+def test_thin_period_gets_nan_rows(sample):
+    y, champion, challenger = sample
+    y, champion, challenger = np.r_[y, 1, 0, 0], np.r_[champion, 0.9, 0.1, 0.2], np.r_[challenger, 0.8, 0.3, 0.1]
+    periods = np.r_[np.repeat('2023Q1', 400), ['2023Q2'] * 3]
+    result = compare_auc_delong(y, {'a': champion, 'b': challenger}, periods=periods).set_index('period')
+    assert result.loc['2023Q1', 'p_value'] < 0.05
+    assert result.loc['2023Q2', ['auc_a', 'auc_b', 'p_value']].isna().all()
@@ -0,0 +1,56 @@
+import pytest
+import numpy as np
+import pandas as pd
+from unittest.mock import MagicMock
+from definition_99f20eb1f2fa454b94338003f659b515 import iter_scores, score_to_disk
+
+@pytest.fixture
+def chunks():
+    return [pd.DataFrame({'x': np.linspace(0, 1, n), 'default': 0}) for n in (5, 3, 4)]
+
+@pytest.fixture
+def pipeline():
+    pipe = MagicMock()
+    pipe.transform.side_effect = lambda X: X[['x']].to_numpy() * 0.5
+    return pipe
+
+@pytest.fixture
+def model():
+    m = MagicMock()
+    m.predict_proba.side_effect = lambda X: np.column_stack([1 - X[:, 0], X[:, 0]])
+    return m
+
+def test_iter_scores_is_lazy_and_chunked(pipeline, model, chunks):
+    generator = iter_scores(pipeline, model, iter(chunks), feature_cols=['x'])
+    assert pipeline.transform.call_count == 0
+    first = next(generator)
+    assert first.dtype == np.float32
+    assert np.allclose(first, np.linspace(0, 1, 5) * 0.5)
+    assert pipeline.transform.call_count == 1
+
+def test_score_to_disk_npy(tmp_path, pipeline, model, chunks):
+    path = str(tmp_path / "scores_2024Q1.npy")
+    stats = score_to_disk(pipeline, model, iter(chunks), path, feature_cols=['x'])
+    assert stats['rows'] == 12
+    assert stats['rows_per_second'] > 0
+    scores = np.load(path, mmap_mode="r")
+    expected = np.concatenate([np.linspace(0, 1, n) * 0.5 for n in (5, 3, 4)]).astype(np.float32)
+    assert scores.shape == (12,)
+    assert np.array_equal(scores, expected)
+
+def test_score_to_disk_empty_npy(tmp_path, pipeline, model):
+    path = str(tmp_path / "empty.npy")
+    assert score_to_disk(pipeline, model, iter([]), path)['rows'] == 0
+    assert np.load(path).shape == (0,)
+
+def test_score_to_disk_parquet(tmp_path, pipeline, model, chunks):
+    pytest.importorskip("pyarrow")
+    path = str(tmp_path / "scores.parquet")
+    score_to_disk(pipeline, model, iter(chunks), path, feature_cols=['x'])
+    result = pd.read_parquet(path)
+    assert list(result.columns) == ['score']
+    assert len(result) == 12
+
+def test_score_to_disk_unknown_format(tmp_path, pipeline, model, chunks):
+    with pytest.raises(ValueError):
+        score_to_disk(pipeline, model, iter(chunks), str(tmp_path / "scores.csv"))
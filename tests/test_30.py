@@ -0,0 +1,50 @@
+import pytest
+import os
+import json
+import pandas as pd
+from definition_b2f4a0880b39422ab761102f016642b9 import KPIStore
+
+pytest.importorskip("pyarrow")
+
+@pytest.fixture
+def store(tmp_path):
+    store = KPIStore(str(tmp_path / "rmm_data"))
+    for quarter, auc in [('2023Q3', 0.78), ('2023Q4', 0.76), ('2024Q1', 0.74)]:
+        store.append('auc_gini', {'auc': auc, 'gini': 2 * auc - 1}, 'rating_logreg_v1', quarter)
+    store.append('auc_gini', {'auc': 0.8, 'gini': 0.6}, 'rating_gbt_v1', '2024Q1')
+    store.append('psi', pd.DataFrame({'grade': ['A', 'B'], 'PSI': [0.01, 0.2]}), 'rating_logreg_v1', '2024Q1')
+    return store
+
+def test_partition_layout_and_index(store):
+    entries = store.partitions('auc_gini', 'rating_logreg_v1')
+    assert len(entries) == 3
+    assert entries[0]['path'].startswith(os.path.join('auc_gini', 'model_id=rating_logreg_v1', 'quarter=2023Q3'))
+    with open(os.path.join(store.root, KPIStore.INDEX_NAME)) as f:
+        assert len([json.loads(line) for line in f]) == 5
+
+def test_query_time_range_and_columns(store):
+    result = store.query('auc_gini', model_id='rating_logreg_v1', start='2023Q4', columns=['auc'])
+    assert list(result.columns) == ['model_id', 'quarter', 'auc']
+    assert list(result['quarter']) == ['2023Q4', '2024Q1']
+    assert list(result['auc']) == [0.76, 0.74]
+
+def test_query_multiple_models(store):
+    result = store.query('auc_gini', model_id=['rating_logreg_v1', 'rating_gbt_v1'], start='2024Q1', end='2024Q1')
+    assert sorted(result['model_id']) == ['rating_gbt_v1', 'rating_logreg_v1']
+
+def test_append_only_and_reopen(store):
+    store.append('psi', pd.DataFrame({'grade': ['A'], 'PSI': [0.3]}), 'rating_logreg_v1', '2024Q1')
+    reopened = KPIStore(store.root)
+    assert len(reopened.query('psi', 'rating_logreg_v1')) == 3
+
+def test_concurrent_stores_share_the_index(store):
+    other = KPIStore(store.root)
+    store.append('psi', pd.DataFrame({'grade': ['A'], 'PSI': [0.3]}), 'rating_logreg_v1', '2024Q2')
+    other.append('psi', pd.DataFrame({'grade': ['A'], 'PSI': [0.4]}), 'rating_logreg_v1', '2024Q2')
+    for reader in (store, other, KPIStore(store.root)):
+        assert sorted(reader.query('psi', 'rating_logreg_v1', start='2024Q2')['PSI']) == [0.3, 0.4]
+
+def test_empty_query_and_invalid_names(store):
+    assert store.query('overrides', columns=['count']).empty
+    with pytest.raises(ValueError):
+        store.append('../escape', {'a': 1}, 'm', '2024Q1')
@@ -0,0 +1,57 @@
+import pytest
+import os
+import numpy as np
+import pandas as pd
+from definition_015f7e0317a4453f87cec40f999523ef import generate_validation_report, generate_validation_reports
+
+def is_pdf_file(file_path):
+    with open(file_path, 'rb') as f:
+        return f.read(4) == b'%PDF'
+
+@pytest.fixture
+def report_data():
+    quarters = ['2023Q1', '2023Q2', '2023Q3', '2023Q4']
+    return {
+        "title": "rating_logreg_v1 Validation Report",
+        "AUC": 0.78,
+        "Gini": 0.56,
+        "tables": {
+            "Calibration by grade": pd.DataFrame({'mean_pd': [0.01, 0.03], 'default_rate': [0.012, 0.028]},
+                                                 index=pd.Index(['A', 'B'], name='grade')),
+            "Scores": pd.DataFrame({'id': np.arange(2000), 'score': np.linspace(0, 1, 2000)}),
+            "Chunked": (pd.DataFrame({'x': range(i, i + 10)}) for i in range(0, 50, 10)),
+        },
+        "charts": {
+            "Gini trend": pd.Series([0.6, 0.58, 0.57, 0.55], index=quarters),
+            "AUC and Gini": {'auc': pd.Series([0.8, 0.79, 0.78, 0.77], index=quarters),
+                             'gini': pd.Series([0.6, 0.58, 0.57, 0.55], index=quarters)},
+        },
+    }
+
+def test_report_with_tables_and_charts(tmp_path, report_data):
+    output_path = str(tmp_path / "report.pdf")
+    generate_validation_report(report_data, output_path, rows_per_table=100,
+                               static_sections=[("SR 11-7 mapping", "Outcomes analysis.")])
+    assert is_pdf_file(output_path)
+    with open(output_path, 'rb') as f:
+        assert f.read().count(b'/Type /Page\n') > 5
+
+def test_report_with_logo(tmp_path, report_data):
+    Image = pytest.importorskip("PIL.Image")
+    logo_path = str(tmp_path / "company_logo.png")
+    Image.new("RGB", (40, 20), "navy").save(logo_path)
+    output_path = str(tmp_path / "report.pdf")
+    generate_validation_report(report_data, output_path, logo_path=logo_path)
+    assert is_pdf_file(output_path)
+
+@pytest.mark.parametrize("n_jobs", [None, 2])
+def test_batch_reports(tmp_path, n_jobs):
+    jobs = [({"AUC": 0.7 + i / 100, "tables": {"t": pd.DataFrame({'a': [i]})}}, str(tmp_path / f"model_{i}.pdf"))
+            for i in range(3)]
+    paths = generate_validation_reports(jobs, n_jobs=n_jobs)
+    assert paths == [path for _, path in jobs]
+    assert all(is_pdf_file(path) for path in paths)
+
+def test_batch_reports_invalid_path():
+    with pytest.raises(Exception):
+        generate_validation_reports([({"AUC": 0.7}, "/invalid/path/report.pdf")])
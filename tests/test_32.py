@@ -0,0 +1,80 @@
+import pytest
+import os
+import yaml
+import numpy as np
+from datetime import date
+from definition_f0c9c711d9424ba1acb657d36e48389b import ModelInventoryRegistry, write_model_inventory_record
+
+@pytest.fixture
+def records():
+    return [
+        {"model_id": "CR-001", "tier": 1, "owner": "Head of Credit Risk Analytics", "next_validation_date": date(2025, 3, 31)},
+        {"model_id": "CR-002", "tier": 2, "owner": "Head of Credit Risk Analytics", "next_validation_date": "2025-06-30"},
+        {"model_id": "CR-003", "tier": 1, "owner": "Retail Analytics", "next_validation_date": date(2025, 6, 30)},
+        {"model_id": "CR-004", "tier": 3, "owner": "Retail Analytics"},
+    ]
+
+def test_indexed_lookups(records):
+    registry = ModelInventoryRegistry(records)
+    assert len(registry) == 4
+    assert registry.get("CR-003")["owner"] == "Retail Analytics"
+    assert [r["model_id"] for r in registry.find(tier=1)] == ["CR-001", "CR-003"]
+    assert [r["model_id"] for r in registry.find(tier=1, owner="Retail Analytics")] == ["CR-003"]
+    assert registry.find(tier=5) == []
+    with pytest.raises(ValueError):
+        registry.find(version="1.0")
+
+def test_find_keeps_record_order_after_remove(records):
+    registry = ModelInventoryRegistry(records)
+    registry.remove("CR-001")
+    registry.upsert({"model_id": "CR-005", "tier": 1, "owner": "Retail Analytics"})
+    registry.upsert(records[0])
+    assert [r["model_id"] for r in registry.find(tier=1)] == ["CR-003", "CR-005", "CR-001"]
+    assert [r["model_id"] for r in registry.find(owner="Retail Analytics", tier=1)] == ["CR-003", "CR-005"]
+
+def test_due_date_queries(records):
+    registry = ModelInventoryRegistry(records)
+    assert [r["model_id"] for r in registry.due_before("2025-06-30")] == ["CR-001", "CR-002", "CR-003"]
+    assert [r["model_id"] for r in registry.due_between(date(2025, 4, 1), date(2025, 6, 29))] == []
+    assert [r["model_id"] for r in registry.due_between("2025-04-01")] == ["CR-002", "CR-003"]
+
+def test_upsert_reindexes(records):
+    registry = ModelInventoryRegistry(records)
+    registry.upsert({"model_id": "CR-001", "tier": 2, "owner": "Retail Analytics", "next_validation_date": "2026-03-31"})
+    assert len(registry) == 4
+    assert [r["model_id"] for r in registry.find(tier=1)] == ["CR-003"]
+    assert [r["model_id"] for r in registry.due_before("2025-12-31")] == ["CR-002", "CR-003"]
+    registry.remove("CR-003")
+    assert "CR-003" not in registry
+    assert registry.find(tier=1) == []
+    with pytest.raises(ValueError):
+        registry.upsert({"tier": 1})
+
+def test_bulk_save_and_load(tmp_path, records):
+    path = str(tmp_path / "inventory.yaml")
+    ModelInventoryRegistry(records).save(path)
+    loaded = ModelInventoryRegistry.load(path)
+    assert len(loaded) == 4
+    assert loaded.get("CR-001")["next_validation_date"] == date(2025, 3, 31)
+
+def test_numpy_metrics_round_trip(tmp_path):
+    record = {"model_id": "CR-006", "tier": np.int64(2), "metrics": {"auc": np.float64(0.81), "gini": np.float32(0.5)},
+              "grade_bounds": (0.01, 0.05), "psi": np.array([0.02, 0.04])}
+    path = str(tmp_path / "inventory.yaml")
+    ModelInventoryRegistry([record]).save(path)
+    loaded = ModelInventoryRegistry.load(path).get("CR-006")
+    assert loaded == {"model_id": "CR-006", "tier": 2, "metrics": {"auc": 0.81, "gini": 0.5},
+                      "grade_bounds": [0.01, 0.05], "psi": [0.02, 0.04]}
+    write_model_inventory_record(record, str(tmp_path / "CR-006.yaml"))
+    assert ModelInventoryRegistry.load(str(tmp_path / "CR-006.yaml")).get("CR-006") == loaded
+
+def test_single_record_files_round_trip(tmp_path, records):
+    output_dir = str(tmp_path / "records")
+    paths = ModelInventoryRegistry(records).export_records(output_dir)
+    assert len(paths) == 4
+    with open(os.path.join(output_dir, "CR-004.yaml")) as f:
+        assert yaml.safe_load(f)["owner"] == "Retail Analytics"
+    write_model_inventory_record({"model_id": "CR-005", "tier": 2}, os.path.join(output_dir, "CR-005.yaml"))
+    loaded = ModelInventoryRegistry.load(output_dir)
+    assert len(loaded) == 5
+    assert [r["model_id"] for r in loaded.find(tier=2)] == ["CR-002", "CR-005"]
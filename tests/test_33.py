@@ -0,0 +1,82 @@
+import pytest
+import logging
+import pandas as pd
+from datetime import datetime, timedelta
+from definition_f6d97647d74a434bad61d8c78dfb2a9b import load_alert_rules, evaluate_alert_rules, AlertEngine
+
+RULES = [
+    {"name": "auc_drop", "metric": "auc", "type": "drop", "op": ">=", "threshold": 0.10, "severity": "error"},
+    {"name": "auc_qoq_drop", "metric": "auc", "type": "drop", "reference": "previous", "op": ">", "threshold": 0.05},
+    {"name": "gini_below_limit", "metric": "gini", "op": "<",
+     "bands": [{"threshold": 0.60, "severity": "warning"}, {"threshold": 0.55, "severity": "error"}]},
+    {"name": "psi_high", "metric": "psi", "op": ">", "threshold": 0.10},
+]
+
+@pytest.fixture
+def kpis():
+    return pd.DataFrame({
+        "model_id": ["logreg"] * 3 + ["gbt"] * 3,
+        "period": ["2023Q4", "2024Q1", "2024Q2"] * 2,
+        "auc": [0.80, 0.78, 0.69, 0.82, 0.81, 0.80],
+        "gini": [0.60, 0.56, 0.38, 0.64, 0.62, 0.60],
+        "psi": [0.01, 0.05, 0.30, 0.02, 0.02, 0.03],
+    })
+
+def test_evaluate_alert_rules(kpis):
+    breaches = evaluate_alert_rules(kpis, RULES)
+    logreg = breaches[breaches["model_id"] == "logreg"]
+    assert set(map(tuple, logreg[["period", "rule"]].values)) == {
+        ("2024Q1", "gini_below_limit"), ("2024Q2", "auc_drop"), ("2024Q2", "auc_qoq_drop"),
+        ("2024Q2", "gini_below_limit"), ("2024Q2", "psi_high")}
+    assert breaches[breaches["model_id"] == "gbt"].empty
+    gini = logreg[logreg["rule"] == "gini_below_limit"].set_index("period")["severity"]
+    assert gini["2024Q1"] == "warning"
+    assert gini["2024Q2"] == "error"
+    drop = logreg[logreg["rule"] == "auc_drop"].iloc[0]
+    assert drop["metric"] == "auc"
+    assert drop["value"] == pytest.approx(0.11)
+
+def test_long_format_input(kpis):
+    long = kpis.melt(id_vars=["model_id", "period"], var_name="metric", value_name="value")
+    pd.testing.assert_frame_equal(evaluate_alert_rules(long, RULES), evaluate_alert_rules(kpis, RULES))
+
+def test_engine_deduplicates_and_rate_limits(kpis, caplog):
+    engine = AlertEngine(RULES, min_interval=timedelta(hours=12))
+    start = datetime(2024, 7, 1)
+    with caplog.at_level(logging.WARNING):
+        first = engine.run(kpis, now=start)
+    assert len(first) == 4
+    assert len(caplog.records) == 4
+    assert engine.run(kpis, now=start + timedelta(days=1)) == []
+    extra = pd.concat([kpis, pd.DataFrame({"model_id": ["logreg"], "period": ["2024Q3"], "auc": [0.68],
+                                           "gini": [0.36], "psi": [0.31]})], ignore_index=True)
+    assert engine.run(extra, now=start + timedelta(hours=1)) == []
+    later = engine.run(extra.assign(period=extra["period"].replace("2024Q3", "2024Q4")), now=start + timedelta(days=1))
+    assert {a["rule"] for a in later} == {"auc_drop", "gini_below_limit", "psi_high"}
+    assert all(a["period"] == "2024Q4" for a in later)
+
+def test_rate_limited_breaches_are_not_lost():
+    rules = [{"name": "psi_high", "metric": "psi", "op": ">", "threshold": 0.10}]
+    kpis = pd.DataFrame({"model_id": ["logreg"] * 3, "period": ["2024Q1", "2024Q2", "2024Q3"],
+                         "psi": [0.20, 0.25, 0.30]})
+    engine = AlertEngine(rules, min_interval=3600)
+    start = datetime(2024, 10, 1)
+    assert [a["period"] for a in engine.run(kpis, now=start)] == ["2024Q3"]
+    q4 = pd.concat([kpis, pd.DataFrame({"model_id": ["logreg"], "period": ["2024Q4"], "psi": [0.35]})])
+    assert engine.run(q4, now=start + timedelta(minutes=30)) == []
+    assert [a["period"] for a in engine.run(q4, now=start + timedelta(hours=2))] == ["2024Q4"]
+    assert engine.run(q4, now=start + timedelta(hours=4)) == []
+
+def test_load_alert_rules_config(tmp_path, kpis):
+    path = tmp_path / "alert_rules.yaml"
+    path.write_text("rules:\n  - {name: psi_high, metric: psi, op: '>', threshold: 0.25, severity: critical}\n")
+    alerts = AlertEngine.from_config(str(path)).run(kpis)
+    assert [(a["model_id"], a["period"], a["severity"]) for a in alerts] == [("logreg", "2024Q2", "critical")]
+
+def test_invalid_rules():
+    with pytest.raises(ValueError):
+        AlertEngine([{"name": "x", "metric": "psi", "op": "!=", "threshold": 1}])
+    with pytest.raises(ValueError):
+        AlertEngine([{"name": "x", "op": ">", "threshold": 1}])
+    with pytest.raises(ValueError):
+        AlertEngine([{"name": "x", "metric": "psi", "op": ">", "threshold": 1, "severity": "loud"}])
@@ -0,0 +1,53 @@
+import json
+import pandas as pd
+import pytest
+from benchmarks import synthetic
+from benchmarks.run_benchmarks import CASES, NOT_BENCHMARKED, compare_results, main, parse_size, public_names, run_benchmarks
+
+def test_make_portfolio_is_seeded_and_shaped():
+    first = synthetic.make_portfolio(5_000, seed=42, chunk_size=2_000)
+    second = synthetic.make_portfolio(5_000, seed=42, chunk_size=2_000)
+    pd.testing.assert_frame_equal(first, second)
+    assert len(first) == 5_000
+    assert list(first.columns) == synthetic.FEATURES + ["default", "pd", "grade"]
+    assert 0.15 < first["default"].mean() < 0.30
+    assert list(first["grade"].cat.categories) == synthetic.GRADES
+    assert not first.equals(synthetic.make_portfolio(5_000, seed=7, chunk_size=2_000))
+
+def test_override_log_and_snapshots():
+    overrides = synthetic.make_override_log(1_000)
+    assert set(overrides["grade_before"]) <= set(synthetic.GRADES)
+    assert set(overrides["reason_code"]) <= set(synthetic.REASON_CODES)
+    snapshots = synthetic.make_snapshots(500, n_periods=3)
+    assert list(snapshots) == ["2023Q1", "2023Q2", "2023Q3"]
+
+@pytest.mark.parametrize("text, expected", [("30k", 30_000), ("1M", 1_000_000), ("10m", 10_000_000), ("1234", 1234)])
+def test_parse_size(text, expected):
+    assert parse_size(text) == expected
+
+def test_every_public_function_has_a_case():
+    assert set(public_names()) <= set(CASES) | NOT_BENCHMARKED
+
+def test_run_benchmarks_records_results(tmp_path):
+    document = run_benchmarks([2_000], names=["calculate_auc_gini", "compute_psi"], repeat=1, log=None, imports=False)
+    assert document["meta"]["sizes"] == [2_000]
+    assert [r["name"] for r in document["results"]] == ["calculate_auc_gini", "compute_psi"]
+    record = document["results"][0]
+    assert record["status"] == "ok"
+    assert record["rows"] == 2_000
+    assert record["seconds_min"] > 0 and record["peak_bytes"] > 0
+
+def test_compare_results_flags_regressions():
+    baseline = {"results": [{"name": "f", "size": 10, "status": "ok", "seconds_min": 1.0, "peak_bytes": 100},
+                            {"name": "g", "size": 10, "status": "ok", "seconds_min": 1.0, "peak_bytes": 100}]}
+    current = {"results": [{"name": "f", "size": 10, "status": "ok", "seconds_min": 1.5, "peak_bytes": 100},
+                           {"name": "g", "size": 10, "status": "ok", "seconds_min": 0.9, "peak_bytes": 50}]}
+    comparison = compare_results(baseline, current, threshold=1.2)
+    assert comparison.set_index("name")["regression"].to_dict() == {"f": True, "g": False}
+
+def test_main_writes_json(tmp_path):
+    output = tmp_path / "bench.json"
+    assert main(["--sizes", "1k", "--only", "compute_overall_psi", "--repeat", "1", "--skip-imports",
+                 "--output", str(output)]) == 0
+    with open(output) as f:
+        assert json.load(f)["results"][0]["name"] == "compute_overall_psi"
@@ -0,0 +1,88 @@
+import json
+import time
+import numpy as np
+import pandas as pd
+import pytest
+from definition_0de09def0fb54ef0b73f23246a75e687 import (
+    instrumented, enable_instrumentation, disable_instrumentation, get_instrumentation,
+    perform_hosmer_lemeshow_test, calculate_override_rate, load_data_chunks)
+
+@pytest.fixture
+def registry():
+    registry = get_instrumentation()
+    registry.reset()
+    yield registry
+    disable_instrumentation()
+    registry.reset()
+
+def test_disabled_records_nothing(registry):
+    calculate_override_rate(5, 100)
+    assert registry.snapshot() == {}
+
+def test_records_calls_time_and_rows(registry):
+    enable_instrumentation()
+    y_true = np.array([0, 1] * 50)
+    y_prob = np.linspace(0.01, 0.99, 100)
+    perform_hosmer_lemeshow_test(y_true, y_prob, 10)
+    perform_hosmer_lemeshow_test(y_true, y_prob, 5)
+    stats = registry.snapshot()["perform_hosmer_lemeshow_test"]
+    assert stats["calls"] == 2
+    assert stats["rows_total"] == 200
+    assert stats["seconds_total"] >= stats["seconds_max"] > 0
+    assert stats["peak_bytes_max"] is None
+
+def test_errors_are_counted(registry):
+    enable_instrumentation()
+    with pytest.raises(ZeroDivisionError):
+        calculate_override_rate(1, 0)
+    assert registry.snapshot()["calculate_override_rate"]["errors"] == 1
+
+def test_generator_timed_over_iteration(registry, tmp_path):
+    path = tmp_path / "data.csv"
+    pd.DataFrame({"a": range(10), "b": range(10)}).to_csv(path, index=False)
+    enable_instrumentation()
+    assert sum(len(chunk) for chunk in load_data_chunks(path, chunksize=3)) == 10
+    stats = registry.snapshot()["load_data_chunks"]
+    assert stats["calls"] == 1
+    assert stats["rows_total"] == 10
+
+def test_generator_not_charged_for_consumer(registry):
+    @instrumented(name="chunks")
+    def chunks():
+        for _ in range(5):
+            yield np.ones(3)
+
+    enable_instrumentation()
+    for _ in chunks():
+        time.sleep(0.05)
+    stats = registry.snapshot()["chunks"]
+    assert stats["rows_total"] == 15
+    assert stats["seconds_total"] < 0.05
+
+def test_peak_memory_and_nesting(registry):
+    @instrumented(name="inner")
+    def inner(n):
+        return np.ones(n)
+
+    @instrumented(name="outer", rows="n")
+    def outer(n):
+        inner(n).sum()
+        return None
+
+    enable_instrumentation(memory=True)
+    outer(1_000_000)
+    stats = registry.snapshot()
+    assert stats["inner"]["peak_bytes_max"] >= 8_000_000
+    assert stats["outer"]["peak_bytes_max"] >= stats["inner"]["peak_bytes_max"]
+    assert stats["outer"]["rows_total"] == 0  # an int has no shape
+
+def test_exports(registry, tmp_path):
+    enable_instrumentation()
+    calculate_override_rate(5, 100)
+    document = json.loads(registry.to_json(tmp_path / "metrics.json"))
+    assert document["functions"]["calculate_override_rate"]["calls"] == 1
+    assert json.loads((tmp_path / "metrics.json").read_text()) == document
+    text = registry.to_prometheus()
+    assert "# TYPE definitions_calls_total counter" in text
+    assert 'definitions_calls_total{function="calculate_override_rate"} 1' in text
+    assert "peak_memory_bytes" not in text
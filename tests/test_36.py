@@ -0,0 +1,35 @@
+import importlib
+import pytest
+import definitions
+from benchmarks.run_benchmarks import measure_import
+
+SUBMODULES = ["instrumentation", "io", "metrics", "stability", "governance", "reporting", "portfolio", "cache"]
+
+def test_export_map_matches_submodules():
+    for name in SUBMODULES:
+        module = importlib.import_module(f"definitions.{name}")
+        assert set(module.__all__) == set(definitions._SUBMODULE_EXPORTS[name])
+    assert len(definitions.__all__) == len(set(definitions.__all__))
+
+def test_lazy_names_resolve_to_submodule_objects():
+    from definitions import compute_psi, AlertEngine
+    from definitions.stability import compute_psi as stability_psi
+    from definitions import definitions as flat
+    assert compute_psi is stability_psi
+    assert flat.AlertEngine is AlertEngine
+    assert set(definitions.__all__) <= set(dir(flat))
+
+def test_unknown_attribute():
+    with pytest.raises(AttributeError):
+        definitions.not_a_function
+
+@pytest.mark.parametrize("statement, absent", [
+    ("import definitions", ["pandas", "scipy", "sklearn", "reportlab", "yaml"]),
+    ("from definitions import compute_psi", ["scipy", "sklearn", "reportlab", "yaml"]),
+    ("from definitions import load_alert_rules", ["scipy", "sklearn", "reportlab"]),
+    ("from definitions import calculate_auc_gini", ["scipy", "sklearn", "reportlab", "yaml"]),
+])
+def test_heavy_imports_are_deferred(statement, absent):
+    record = measure_import(statement, repeat=1)
+    assert record["seconds_min"] > 0
+    assert not set(absent) & set(record["loaded"])
@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+import pytest
+from definition_b491cf80f412400c8d2b9b198c469cd3 import GradeMapper, load_grade_mapper, compute_psi
+
+GRADES = ["A", "B", "C", "D"]
+BOUNDS = [0.01, 0.05, 0.20, 1.0]
+
+@pytest.fixture
+def cutoffs_csv(tmp_path):
+    path = tmp_path / "grade_cutoffs_v1.csv"
+    # Deliberately unsorted: the mapper orders grades by cutoff.
+    pd.DataFrame({"grade": ["C", "A", "D", "B"], "pd_upper": [0.20, 0.01, 1.0, 0.05]}).to_csv(path, index=False)
+    return path
+
+def test_codes_boundaries_and_unmapped():
+    mapper = GradeMapper(GRADES, BOUNDS)
+    codes = mapper.codes([0.0, 0.01, 0.0100001, 0.05, 0.5, 1.0, 1.5, np.nan])
+    assert codes.dtype == np.int8
+    assert codes.tolist() == [0, 0, 1, 1, 3, 3, -1, -1]
+    left_closed = GradeMapper(GRADES, BOUNDS, right=False)
+    assert left_closed.codes([0.01, 0.05]).tolist() == [1, 2]
+
+def test_open_ended_last_grade():
+    mapper = GradeMapper(GRADES, [0.01, 0.05, 0.20, np.nan])
+    assert mapper.codes([5.0]).tolist() == [3]
+
+def test_matches_searchsorted_on_long_scale():
+    bounds = np.linspace(0.01, 1.0, 30)
+    mapper = GradeMapper([f"G{i}" for i in range(30)], bounds)
+    values = np.random.default_rng(42).uniform(0, 1, 10_000)
+    np.testing.assert_array_equal(mapper.codes(values), np.searchsorted(bounds, values, side="left"))
+    short = GradeMapper(GRADES, BOUNDS)
+    np.testing.assert_array_equal(short.codes(values), np.searchsorted(BOUNDS, values, side="left"))
+
+def test_assign_counts_distribution():
+    mapper = GradeMapper(GRADES, BOUNDS)
+    pds = np.array([0.005, 0.02, 0.03, 0.1, 0.9, np.nan])
+    grades = mapper.assign(pds)
+    assert list(grades.categories) == GRADES and grades.ordered
+    assert pd.isna(grades[-1])
+    counts = mapper.counts(pds)
+    assert counts.to_dict() == {"A": 1, "B": 2, "C": 1, "D": 1}
+    pd.testing.assert_series_equal(mapper.counts(codes=mapper.codes(pds)), counts)
+    share = mapper.distribution(pds)
+    assert share.sum() == pytest.approx(1.0)
+    assert list(share.index) == GRADES
+
+def test_distribution_feeds_compute_psi():
+    mapper = GradeMapper(GRADES, BOUNDS)
+    rng = np.random.default_rng(42)
+    expected, actual = rng.beta(1, 8, 5_000), rng.beta(1, 6, 5_000)
+    result = mapper.psi(expected, actual)
+    pd.testing.assert_frame_equal(result, compute_psi(mapper.distribution(expected), mapper.distribution(actual), GRADES))
+    assert (result["PSI"] >= 0).all()
+
+def test_from_csv_and_cached_loader(cutoffs_csv):
+    mapper = GradeMapper.from_csv(cutoffs_csv)
+    assert mapper.grades == GRADES
+    assert load_grade_mapper(cutoffs_csv) is load_grade_mapper(cutoffs_csv)
+    assert load_grade_mapper(cutoffs_csv).grades == GRADES
+
+def test_invalid_tables():
+    with pytest.raises(ValueError):
+        GradeMapper(["A", "B"], [0.1, 0.05])
+    with pytest.raises(ValueError):
+        GradeMapper(["A", "A"], [0.1, 0.2])
+    with pytest.raises(ValueError):
+        GradeMapper.from_frame(pd.DataFrame({"grade": ["A"], "lo": [0.0], "hi": [1.0]}))
+    with pytest.raises(ValueError):
+        GradeMapper(GRADES, BOUNDS).distribution([np.nan])
@@ -0,0 +1,96 @@
+import pickle
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LogisticRegression
+from definition_cee50995624143e2ba5205aae2b947e7 import (
+    ResultCache, SharedFrame, run_portfolio_validation, calculate_auc_gini)
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(42)
+    n = 2_000
+    X = pd.DataFrame({"x1": rng.normal(size=n), "x2": rng.normal(size=n).astype(np.float32),
+                      "segment": rng.choice(["retail", "sme"], n)})
+    X["default"] = (rng.random(n) < 1 / (1 + np.exp(-(X["x1"] - 1)))).astype(int)
+    return X
+
+@pytest.fixture
+def models(data, tmp_path):
+    features = data[["x1", "x2"]]
+    strong = LogisticRegression().fit(features, data["default"])
+    weak = LogisticRegression().fit(features[["x2"]].assign(x1=0.0)[["x1", "x2"]], data["default"])
+    path = tmp_path / "weak.pkl"
+    with open(path, "wb") as f:
+        pickle.dump(weak, f)
+    return {"strong": strong, "weak": str(path)}
+
+def test_shared_frame_roundtrip(data):
+    with SharedFrame.from_frame(data) as shared:
+        attached = pickle.loads(pickle.dumps(shared))
+        frame = attached.to_frame()
+        pd.testing.assert_frame_equal(frame[["x1", "x2", "default"]], data[["x1", "x2", "default"]])
+        assert list(frame["segment"].astype(str)) == list(data["segment"])
+        view = attached.column("x1")
+        assert not view.flags.writeable
+        assert np.shares_memory(frame["x1"].to_numpy(), view)
+        attached.close()
+        with pytest.raises(RuntimeError):
+            attached.unlink()
+
+@pytest.mark.parametrize("n_jobs", [None, 2])
+def test_run_portfolio_validation(data, models, n_jobs):
+    datasets = {"oot": data, "2024Q1": data.iloc[:1_000]}
+    result = run_portfolio_validation(models, datasets, "default", feature_cols=["x1", "x2"], n_jobs=n_jobs,
+                                      top_drivers=["x1"])
+    assert list(result.columns) == ["model", "dataset", "test", "item", "metric", "value", "error"]
+    assert result["error"].isna().all()
+    assert set(result["test"]) == {"auc_gini", "hosmer_lemeshow", "calibration", "psi", "sensitivity"}
+    scalars = result[result["item"].isna()].set_index(["model", "dataset", "metric"])["value"]
+    auc, _ = calculate_auc_gini(LogisticRegression().fit(data[["x1", "x2"]], data["default"]),
+                                data[["x1", "x2"]], data["default"])
+    assert scalars[("strong", "oot", "auc")] == pytest.approx(auc)
+    assert scalars[("strong", "oot", "auc")] > scalars[("weak", "oot", "auc")]
+    assert scalars[("strong", "oot", "psi")] == pytest.approx(0.0)
+    assert len(result[(result["test"] == "calibration") & (result["model"] == "strong")
+                      & (result["dataset"] == "oot")]) == 20
+    assert set(result.loc[result["test"] == "sensitivity", "item"]) == {"x1@-0.05", "x1@+0.05"}
+
+class ScoringLog(LogisticRegression):
+    """Appends one line to ``log_path`` per scoring call, across worker processes."""
+
+    def __init__(self, log_path=None, **kwargs):
+        super().__init__(**kwargs)
+        self.log_path = log_path
+
+    def predict_proba(self, X):
+        with open(self.log_path, "a") as f:
+            f.write(f"{len(X)}\n")
+        return super().predict_proba(X)
+
+def test_each_remaining_pair_scored_once(data, tmp_path):
+    log_path = tmp_path / "scored.log"
+    model = ScoringLog(str(log_path)).fit(data[["x1", "x2"]], data["default"])
+    datasets = {f"q{i}": data.iloc[i * 500:(i + 1) * 500] for i in range(3)}
+    cache = ResultCache(tmp_path / "results")
+    run_portfolio_validation({"m": model}, datasets, "default", feature_cols=["x1", "x2"], tests=["auc_gini"],
+                             cache=cache)
+    log_path.unlink()
+    result = run_portfolio_validation({"m": model}, datasets, "default", feature_cols=["x1", "x2"], n_jobs=2,
+                                      tests=["auc_gini", "hosmer_lemeshow", "calibration"], cache=cache)
+    assert result["error"].isna().all()
+    assert log_path.read_text().split() == ["500"] * 3
+
+def test_failed_jobs_are_reported(data, models):
+    result = run_portfolio_validation({"broken": object()}, {"oot": data}, "default", feature_cols=["x1", "x2"],
+                                      tests=["auc_gini"])
+    assert result["metric"].tolist() == ["error"]
+    assert "AttributeError" in result["error"].iloc[0]
+
+def test_invalid_arguments(data, models):
+    with pytest.raises(ValueError):
+        run_portfolio_validation(models, {"oot": data}, "default", tests=["sensitivity"])
+    with pytest.raises(ValueError):
+        run_portfolio_validation(models, {"oot": data}, "default", tests=["unknown"])
+    with pytest.raises(KeyError):
+        run_portfolio_validation(models, {"oot": data}, "default", baseline="missing")
@@ -0,0 +1,167 @@
+import os
+import pickle
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LogisticRegression
+from definition_130f9e1a695e4356b8dff12ed70adf14 import (
+    ResultCache, calculate_auc_gini, perform_hosmer_lemeshow_test, perform_sensitivity_grid, run_portfolio_validation)
+
+@pytest.fixture
+def files(tmp_path):
+    rng = np.random.default_rng(0)
+    paths = {}
+    for period in ["2024Q1", "2024Q2"]:
+        df = pd.DataFrame({"x1": rng.normal(size=500), "x2": rng.normal(size=500)})
+        df["default"] = (rng.random(500) < 1 / (1 + np.exp(-df["x1"]))).astype(int)
+        paths[period] = str(tmp_path / f"snap_{period}.csv")
+        df.to_csv(paths[period], index=False)
+    first = pd.read_csv(paths["2024Q1"])
+    model = LogisticRegression().fit(first[["x1", "x2"]], first["default"])
+    paths["model"] = str(tmp_path / "model.pkl")
+    with open(paths["model"], "wb") as f:
+        pickle.dump(model, f)
+    return paths
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResultCache(tmp_path / "results")
+
+def test_wrapped_function_hits_on_same_inputs(cache, files):
+    calls = []
+    def auc_gini(model, X, y, store=None):
+        calls.append(1)
+        return calculate_auc_gini(model, X, y, store=store)
+    cached = cache.wrap(auc_gini)
+    model = cache.load_model(files["model"])
+    df = cache.load_data(files["2024Q1"])
+    first = cached(model, df[["x1", "x2"]], df["default"])
+    assert cached(model, df[["x1", "x2"]], y=df["default"].copy(), store=None) == first
+    assert len(calls) == 1 and cache.info()["hits"] == 1
+    assert first == calculate_auc_gini(model, df[["x1", "x2"]], df["default"])
+    cached(model, df[["x1", "x2"]], df["default"].iloc[::-1])
+    assert len(calls) == 2
+
+def test_in_place_refit_is_a_miss(cache, files):
+    df = pd.read_csv(files["2024Q1"])
+    X, y = df[["x1", "x2"]], df["default"]
+    model = LogisticRegression().fit(X, y)
+    auc_gini = cache.wrap(calculate_auc_gini)
+    assert auc_gini(model, X, y)[0] > 0.5
+    model.fit(X, 1 - y)
+    assert auc_gini(model, X, y) == calculate_auc_gini(model, X, y)
+    assert auc_gini(model, X, y)[0] < 0.5
+
+def test_unpicklable_arguments_are_not_cached(cache):
+    class Model:
+        def __init__(self, scores):
+            self.scores = scores
+            self.lock = __import__("threading").Lock()
+        def predict_proba(self, X):
+            return np.column_stack([1 - self.scores, self.scores])
+    X, y = np.zeros((4, 1)), np.array([0, 0, 1, 1])
+    auc_gini = cache.wrap(calculate_auc_gini)
+    assert auc_gini(Model(np.array([0.1, 0.2, 0.8, 0.9])), X, y)[0] == 1.0
+    assert auc_gini(Model(np.array([0.9, 0.8, 0.2, 0.1])), X, y)[0] == 0.0
+    assert len(cache) == 0
+
+def test_lazy_file_arguments_are_parsed_only_on_a_miss(cache, files, monkeypatch):
+    import definitions.cache as cache_module
+    reads = []
+    read_frame = cache_module._read_frame
+    monkeypatch.setattr(cache_module, "_read_frame", lambda path: reads.append(path) or read_frame(path))
+    auc_gini = cache.wrap(calculate_auc_gini)
+    args = (cache.model(files["model"]), cache.data(files["2024Q1"], ["x1", "x2"]),
+            cache.data(files["2024Q1"], "default"))
+    first = auc_gini(*args)
+    assert len(reads) == 1
+    assert auc_gini(*args) == first and len(reads) == 1
+    X, y = cache.load_data(files["2024Q1"], "default")
+    assert auc_gini(cache.load_model(files["model"]), X, y) == first
+    assert cache.info()["hits"] == 2
+    assert cache.invalidate(source=files["2024Q1"]) == 1
+
+def test_parameters_and_file_contents_change_the_key(cache, files):
+    y = np.array([0, 1] * 50)
+    y_prob = np.linspace(0.01, 0.99, 100)
+    hl = cache.wrap(perform_hosmer_lemeshow_test)
+    assert hl(y, y_prob, 10) == perform_hosmer_lemeshow_test(y, y_prob, 10)
+    hl(y, y_prob, 5)
+    assert cache.info()["misses"] == 2
+    key = cache.key(perform_hosmer_lemeshow_test, (files["2024Q1"], y_prob, 10))
+    with open(files["2024Q1"], "a") as f:
+        f.write("0.0,0.0,0\n")
+    assert cache.key(perform_hosmer_lemeshow_test, (files["2024Q1"], y_prob, 10)) != key
+
+def test_sensitivity_results_roundtrip(cache, files):
+    model = cache.load_model(files["model"])
+    X, _ = cache.load_data(files["2024Q1"], "default", ["x1", "x2"])
+    grid = cache.wrap(perform_sensitivity_grid)
+    first = grid(model, X, ["x1", "x2"], chunk_size=100)
+    pd.testing.assert_frame_equal(grid(model, X, ["x1", "x2"], chunk_size=50_000), first)
+    assert cache.info()["hits"] == 1
+
+def test_invalidate_by_source_and_function(cache, files):
+    model = cache.load_model(files["model"])
+    auc_gini = cache.wrap(calculate_auc_gini)
+    for period in ["2024Q1", "2024Q2"]:
+        X, y = cache.load_data(files[period], "default")
+        assert list(X.columns) == ["x1", "x2"]
+        auc_gini(model, X, y)
+    assert auc_gini(model, *cache.load_data(files["2024Q1"], "default")) is not None
+    assert cache.info()["hits"] == 1
+    cache.wrap(perform_hosmer_lemeshow_test)(np.array([0, 1]), np.array([0.2, 0.8]), 2)
+    assert len(cache) == 3
+    assert cache.invalidate(source=files["2024Q2"]) == 1
+    assert cache.invalidate(function="perform_hosmer_lemeshow_test") == 1
+    assert cache.invalidate() == 1
+    assert len(cache) == 0
+
+def test_size_cap_evicts_least_recently_used(tmp_path):
+    cache = ResultCache(tmp_path / "results", max_bytes=3_000)
+    for i in range(5):
+        cache.put(f"k{i}", np.zeros(100) + i)
+        os.utime(os.path.join(cache.directory, f"k{i}.pkl"), ns=(i * 10**9, i * 10**9))
+    assert len(cache) == 3
+    assert "k0" not in cache and "k4" in cache
+    assert cache.info()["bytes"] <= 3_000
+    with pytest.raises(ValueError):
+        ResultCache(tmp_path / "other", max_bytes=0)
+
+def test_corrupt_entry_is_a_miss(cache):
+    cache.put("key", {"auc": 0.7})
+    with open(os.path.join(cache.directory, "key.pkl"), "wb") as f:
+        f.write(b"not a pickle")
+    assert cache.get("key") is None
+    assert "key" not in cache
+
+def test_portfolio_runner_reuses_unchanged_quarters(cache, files):
+    datasets = {"2024Q1": files["2024Q1"], "2024Q2": files["2024Q2"]}
+    models = {"logreg": files["model"]}
+    first = run_portfolio_validation(models, datasets, "default", tests=["auc_gini", "psi"], cache=cache)
+    assert len(cache) == 4
+    pd.testing.assert_frame_equal(
+        run_portfolio_validation(models, datasets, "default", tests=["auc_gini", "psi"], cache=cache), first)
+    assert len(cache) == 4
+
+    with open(files["2024Q2"], "a") as f:
+        f.write("3.0,3.0,1\n")
+    third = run_portfolio_validation(models, datasets, "default", tests=["auc_gini", "psi"], cache=cache)
+    assert len(cache) == 6
+    unchanged = third["dataset"] == "2024Q1"
+    pd.testing.assert_frame_equal(third[unchanged], first[unchanged])
+    assert not third[~unchanged]["value"].equals(first[~unchanged]["value"])
+
+def test_portfolio_fingerprints_each_input_once(cache, files, monkeypatch):
+    import definitions.cache as cache_module
+    hashed = []
+    dataset_fingerprint = cache_module.dataset_fingerprint
+    monkeypatch.setattr(cache_module, "dataset_fingerprint", lambda X: hashed.append(1) or dataset_fingerprint(X))
+    datasets = {period: pd.read_csv(files[period]) for period in ["2024Q1", "2024Q2"]}
+    models = {"a": cache.load_model(files["model"]), "b": pickle.load(open(files["model"], "rb"))}
+    tests = ["auc_gini", "psi", "hosmer_lemeshow"]
+    first = run_portfolio_validation(models, datasets, "default", tests=tests, cache=cache)
+    assert len(hashed) == 2
+    pd.testing.assert_frame_equal(run_portfolio_validation(models, datasets, "default", tests=tests, cache=cache),
+                                  first)
+    assert len(hashed) == 4 and len(cache) == 12